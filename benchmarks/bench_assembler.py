@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+''' Find the function size at which writing textual IR and linking it in
+    overtakes building the same function with the IRBuilder.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+from llpy.assembler import IRWriter
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000, 100000]
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    fty = llpy.core.FunctionType(i32, [i32, i32])
+    builder = llpy.core.IRBuilder(ctx)
+    ops = ['add', 'mul', 'xor', 'sub']
+
+    for n in sizes:
+        def build():
+            fn = mod.AddFunction(fty, 'f')
+            builder.PositionBuilderAtEnd(fn.AppendBasicBlock('entry'))
+            values = [fn.GetParam(0), fn.GetParam(1)]
+            build_ops = [builder.BuildAdd, builder.BuildMul, builder.BuildXor, builder.BuildSub]
+            for i in range(n):
+                values.append(build_ops[i % 4](values[i], values[i + 1]))
+            builder.BuildRet(values[-1])
+            fn.DeleteFunction()
+        def write():
+            w = IRWriter(ctx)
+            body = ['entry:']
+            body.extend(['  %%v%d = %s i32 %%v%d, %%v%d' % (i + 2, ops[i % 4], i, i + 1) for i in range(n)])
+            body.append('  ret i32 %%v%d' % (n + 1))
+            w.define('f', fty, body, ['v0', 'v1'])
+            w.link_into(mod)
+            mod.GetNamedFunction('f').DeleteFunction()
+        print('%d instructions' % n)
+        number = max(1, 10000 // n)
+        common.report('  IRBuilder', common.best_of(build, 3, number), n)
+        common.report('  IRWriter + link', common.best_of(write, 3, number), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+''' Compare getting a module's bitcode as bytes through a temporary file
+    with WriteBitcodeToBytes, using a memfd and using a pipe.
+'''
+
+import os
+import sys
+import tempfile
+
+import common
+
+import llpy.core
+import llpy.io
+
+from bench_use_def import build
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ctx, mod = build(n)
+    def temp_file():
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            llpy.io.WriteBitcodeToFile(mod, path)
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.unlink(path)
+    data = temp_file()
+    print('%d bytes of bitcode' % len(data))
+    common.report('  temporary file', common.best_of(temp_file))
+    if hasattr(os, 'memfd_create'):
+        common.report('  WriteBitcodeToBytes (memfd)', common.best_of(lambda: llpy.io.WriteBitcodeToBytes(mod)))
+    common.report('  WriteBitcodeToBytes (pipe)', common.best_of(lambda: llpy.io._bitcode_pipe(mod)))
+    if (3, 3) <= llpy.core._version:
+        common.report('  WriteBitcodeToMemoryBuffer', common.best_of(lambda: llpy.io.WriteBitcodeToMemoryBuffer(mod)))
+
+if __name__ == '__main__':
+    main()
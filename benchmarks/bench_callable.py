@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+''' Compare the per-call overhead of calling a JIT-compiled function
+    through ExecutionEngine.RunFunction (a GenericValue per argument and
+    for the result) with calling the ctypes prototype from GetCallable.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+import llpy.execution_engine
+import llpy.target
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    llpy.target.InitializeNativeTarget()
+    llpy.execution_engine.LinkInJIT()
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i64 = llpy.core.IntegerType(ctx, 64)
+    func = mod.AddFunction(llpy.core.FunctionType(i64, [i64, i64]), 'muladd')
+    builder = llpy.core.IRBuilder(ctx)
+    builder.PositionBuilderAtEnd(func.AppendBasicBlock('entry'))
+    builder.Emit([
+            ('Mul', 0, 0),
+            ('Add', 2, 1),
+            ('Ret', 3),
+    ], [func.GetParam(0), func.GetParam(1)])
+    ee = llpy.execution_engine.ExecutionEngine(mod)
+    GenericValue = llpy.execution_engine.GenericValue
+    fn = ee.GetCallable(func)
+    assert fn(6, 1) == ee.RunFunction(func, [GenericValue(i64, 6), GenericValue(i64, 1)]).ToInt(True) == 37
+
+    def run_function():
+        for i in range(n):
+            ee.RunFunction(func, [GenericValue(i64, i), GenericValue(i64, 1)]).ToInt(True)
+    def native():
+        for i in range(n):
+            fn(i, 1)
+    print('%d calls' % n)
+    common.report('  RunFunction', common.best_of(run_function, 3), n)
+    common.report('  GetCallable', common.best_of(native, 3), n)
+
+if __name__ == '__main__':
+    main()
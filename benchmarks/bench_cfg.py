@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+''' Time building the CFG, dominator tree, frontiers and loop forest of a
+    function with many blocks, and a cached lookup of it.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+from llpy.analysis import CFG, get_cfg
+
+
+def build(n):
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i1 = llpy.core.IntegerType(ctx, 1)
+    void = llpy.core.VoidType(ctx)
+    fn = mod.AddFunction(llpy.core.FunctionType(void, [i1]), 'f')
+    cond = fn.GetParam(0)
+    blocks = [fn.AppendBasicBlock('') for i in range(n)]
+    builder = llpy.core.IRBuilder(ctx)
+    for i, bb in enumerate(blocks[:-1]):
+        builder.PositionBuilderAtEnd(bb)
+        if i % 7 == 6:
+            # a loop back to a few blocks earlier
+            builder.BuildCondBr(cond, blocks[i - 5], blocks[i + 1])
+        else:
+            builder.BuildBr(blocks[i + 1])
+    builder.PositionBuilderAtEnd(blocks[-1])
+    builder.BuildRetVoid()
+    return ctx, mod, fn
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ctx, mod, fn = build(n)
+    def cfg():
+        return CFG(fn)
+    def everything():
+        cfg = CFG(fn)
+        cfg.loops
+        cfg.frontier(0)
+        return cfg
+    def cached():
+        return get_cfg(fn)
+    assert len(everything().loops) == n // 7
+    common.report('CFG + dominators', common.best_of(cfg, 3), n)
+    common.report('  + loops, frontiers', common.best_of(everything, 3), n)
+    common.report('get_cfg, cached', common.best_of(cached, 3, 1000))
+
+if __name__ == '__main__':
+    main()
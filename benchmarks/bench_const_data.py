@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+''' Compare ways of creating a large constant array: wrapping every
+    element with ConstInt/ConstReal and calling ConstArray, versus
+    ArrayType.ConstData straight from a buffer.
+'''
+
+import array
+import sys
+
+import common
+
+import llpy.core
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ctx = llpy.core.Context()
+    cases = [
+            (llpy.core.IntegerType(ctx, 8), array.array('B', [i % 251 for i in range(n)])),
+            (llpy.core.IntegerType(ctx, 32), array.array('i', [i % 1000 for i in range(n)])),
+            (llpy.core.DoubleType(ctx), array.array('d', [i * 0.5 for i in range(n)])),
+    ]
+    for elem, data in cases:
+        arr = llpy.core.ArrayType(elem, n)
+        print('%s, %d elements' % (elem, n))
+        if isinstance(elem, llpy.core.IntegerType):
+            const = elem.ConstInt
+        else:
+            const = elem.ConstReal
+        def per_element():
+            return elem.ConstArray([const(v) for v in data])
+        def from_buffer():
+            return arr.ConstData(data)
+        assert per_element() is from_buffer()
+        common.report('  ConstArray', common.best_of(per_element, 3), n)
+        common.report('  ConstData', common.best_of(from_buffer, 3), n)
+
+if __name__ == '__main__':
+    main()
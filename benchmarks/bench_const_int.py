@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+''' Compare ways of creating many integer constants: the old decimal
+    string path, ConstInt one at a time, and the bulk ConstInts.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ctx = llpy.core.Context()
+    for bits in [32, 64, 128]:
+        ty = llpy.core.IntegerType(ctx, bits)
+        values = [(i * 2654435761) % (1 << (bits - 1)) for i in range(n)]
+        print('i%d, %d values' % (bits, n))
+        def by_string():
+            # what ConstInt used to do
+            return [ty.ConstIntOfString('%d' % v) for v in values]
+        def one_at_a_time():
+            return [ty.ConstInt(v) for v in values]
+        def bulk():
+            return ty.ConstInts(values)
+        assert by_string() == one_at_a_time() == bulk()
+        common.report('  ConstIntOfString', common.best_of(by_string, 3), n)
+        common.report('  ConstInt', common.best_of(one_at_a_time, 3), n)
+        common.report('  ConstInts', common.best_of(bulk, 3), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+''' Compare building a large function one IRBuilder.Build* call at a time
+    with emitting the same instructions through IRBuilder.Emit.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    func_type = llpy.core.FunctionType(i32, [i32, i32])
+    builder = llpy.core.IRBuilder(ctx)
+    # a chain of n - 1 arithmetic instructions, each using the previous
+    # two results, and a return
+    ops = ['Add', 'Mul', 'Xor', 'Sub']
+    program = [(ops[i % 4], i, i + 1) for i in range(n - 1)]
+    program.append(('Ret', n))
+
+    def setup():
+        fn = mod.AddFunction(func_type, 'f')
+        builder.PositionBuilderAtEnd(fn.AppendBasicBlock('entry'))
+        return fn
+    def per_call():
+        fn = setup()
+        values = [fn.GetParam(0), fn.GetParam(1)]
+        build = [builder.BuildAdd, builder.BuildMul, builder.BuildXor, builder.BuildSub]
+        for i in range(n - 1):
+            values.append(build[i % 4](values[i], values[i + 1]))
+        builder.BuildRet(values[n])
+        fn.DeleteFunction()
+    def batched():
+        fn = setup()
+        builder.Emit(program, [fn.GetParam(0), fn.GetParam(1)])
+        fn.DeleteFunction()
+    print('%d instructions' % n)
+    common.report('  Build*', common.best_of(per_call, 3), n)
+    common.report('  Emit', common.best_of(batched, 3), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+''' Compare the int-backed enums with the old ctypes.Structure ones, for
+    returning an enum from a foreign function and then dispatching on it
+    the way Value._figure_out does.
+'''
+
+import ctypes
+import ctypes.util
+
+import common
+
+from llpy.c import _c
+
+
+NAMES = ['Ret', 'Br', 'Switch', 'Add', 'Sub', 'Load', 'Store', 'Call', 'PHI']
+
+def legacy_enum(name, **kwargs):
+    # what _c.enum used to be
+    class Enum(ctypes.Structure):
+        __slots__ = ()
+        _fields_ = [('value', ctypes.c_int)]
+
+        def __hash__(self):
+            return hash(self.value)
+
+        def __eq__(self, other):
+            return self.value == other.value
+
+        def __ne__(self, other):
+            return self.value != other.value
+    Enum.__name__ = name
+    for k, v in kwargs.items():
+        setattr(Enum, k, Enum(v))
+    return Enum
+
+def main():
+    libc = _c.Library(ctypes.util.find_library('c'))
+    kwargs = {name: i + 1 for i, name in enumerate(NAMES)}
+    n = 100000
+    for label, Opcode in [
+            ('Structure', legacy_enum('Opcode', **kwargs)),
+            ('int', _c.enum('Opcode', **kwargs)),
+    ]:
+        # abs() stands in for GetInstructionOpcode
+        get_opcode = libc.function(Opcode, 'abs', [ctypes.c_int], lazy=False)
+        table = {getattr(Opcode, name): name for name in NAMES}
+        values = [i % len(NAMES) + 1 for i in range(n)]
+        call = Opcode.Call
+        def returns():
+            for v in values:
+                get_opcode(v)
+        def dispatch():
+            count = 0
+            for v in values:
+                op = get_opcode(v)
+                if op == call:
+                    count += 1
+                table.get(op)
+            return count
+        print(label)
+        common.report('  return', common.best_of(returns, 3), n)
+        common.report('  return + dispatch', common.best_of(dispatch, 3), n)
+
+if __name__ == '__main__':
+    main()
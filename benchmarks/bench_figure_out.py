@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+''' Measure how many C calls it takes to pick the wrapper class of a
+    raw value, comparing the dispatch tables in Value._figure_out with
+    the exhaustive IsA search in Value._figure_out_slow.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+class CountingModule(object):
+    ''' Stand-in for llpy.c.core that counts every function call.
+    '''
+    def __init__(self, real):
+        self._real = real
+        self.calls = 0
+
+    def __getattr__(self, name):
+        fun = getattr(self._real, name)
+        if not callable(fun):
+            return fun
+        def counted(*args):
+            self.calls += 1
+            return fun(*args)
+        return counted
+
+
+def build_module(ctx, blocks):
+    i1 = llpy.core.IntegerType(ctx, 1)
+    i32 = llpy.core.IntegerType(ctx, 32)
+    i64 = llpy.core.IntegerType(ctx, 64)
+    dbl = llpy.core.DoubleType(ctx)
+    i32p = llpy.core.PointerType(i32)
+    mod = llpy.core.Module(ctx, 'bench')
+    func = mod.AddFunction(llpy.core.FunctionType(i32, [i32, dbl, i32p]), 'func')
+    a, d, p = func.GetParams()
+    builder = llpy.core.IRBuilder(ctx)
+    bb = func.AppendBasicBlock()
+    for _ in range(blocks):
+        builder.PositionBuilderAtEnd(bb)
+        x = builder.BuildAdd(a, a)
+        x = builder.BuildMul(x, a)
+        y = builder.BuildLoad(p)
+        builder.BuildStore(x, p)
+        z = builder.BuildZExt(y, i64)
+        z = builder.BuildTrunc(z, i32)
+        f = builder.BuildSIToFP(z, dbl)
+        f = builder.BuildFAdd(f, d)
+        c = builder.BuildICmp(llpy.core.IntPredicate.SLT, x, y)
+        builder.BuildSelect(c, x, y)
+        builder.BuildGEP(p, [i64.ConstInt(1)])
+        builder.BuildCall(func, [a, f, p])
+        nbb = func.AppendBasicBlock()
+        builder.BuildCondBr(c, nbb, nbb)
+        bb = nbb
+    builder.PositionBuilderAtEnd(bb)
+    builder.BuildRet(a)
+    return mod, func
+
+def raw_instructions(func):
+    _core = llpy.c.core
+    rv = []
+    bb = _core.GetFirstBasicBlock(func._raw)
+    while bb:
+        i = _core.GetFirstInstruction(bb)
+        while i:
+            rv.append(i)
+            i = _core.GetNextInstruction(i)
+        bb = _core.GetNextBasicBlock(bb)
+    return rv
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ctx = llpy.core.Context()
+    mod, func = build_module(ctx, blocks)
+    raws = raw_instructions(func)
+    n = len(raws)
+    print('%d instructions' % n)
+
+    for label, fn in [
+            ('table dispatch', llpy.core.Value._figure_out),
+            ('exhaustive IsA search', llpy.core.Value._figure_out_slow),
+    ]:
+        def run():
+            for r in raws:
+                fn(r)
+        t = common.best_of(run, repeat=3)
+        counter = CountingModule(llpy.c.core)
+        llpy.core._core = counter
+        try:
+            run()
+        finally:
+            llpy.core._core = counter._real
+        common.report(label, t, n)
+        print('%-40s %10.2f C calls/wrap' % ('', counter.calls / n))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+''' Measure wrapper overhead with ctypes-pointer handles (the default)
+    and with integer handles (llpy.int_handles(True)).
+
+    Each mode runs in its own interpreter, since the choice must be made
+    before llpy.c is imported.
+'''
+
+import os
+import subprocess
+import sys
+
+import common
+
+
+def workload(blocks):
+    import llpy.core
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    func = mod.AddFunction(llpy.core.FunctionType(i32, [i32, i32]), 'func')
+    a, b = func.GetParams()
+    builder = llpy.core.IRBuilder(ctx)
+    builder.PositionBuilderAtEnd(func.AppendBasicBlock())
+    def build():
+        x = a
+        for _ in range(blocks):
+            x = builder.BuildAdd(x, b)
+            x = builder.BuildMul(x, a)
+            x = builder.BuildSub(x, b)
+            x.TypeOf()
+            x.GetFirstUse()
+    return common.best_of(build, repeat=3), blocks * 5
+
+def child(mode, blocks):
+    import llpy
+    llpy.int_handles(mode == 'int')
+    t, n = workload(blocks)
+    print('%r %r' % (t, n))
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+        return
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [common.ROOT, env.get('PYTHONPATH')]))
+    for mode in ['pointer', 'int']:
+        out = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', mode, str(blocks)], env=env)
+        t, n = out.split()
+        common.report('%s handles' % mode, float(t), int(n))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+''' Measure the cost of `import llpy.core` with eager and lazy binding.
+
+    Eager binding resolves every LLVM symbol (and sets its signature) at
+    import; lazy binding defers that until each function's first call.
+'''
+
+import common
+
+
+EAGER = 'import llpy.core'
+LAZY = 'import llpy; llpy.lazy_binding(True); import llpy.core'
+BASELINE = 'import llpy.c._c'
+
+
+def main():
+    base = common.run_python(BASELINE)
+    common.report('interpreter + llpy.c._c', base)
+    eager = common.run_python(EAGER)
+    common.report('import llpy.core (eager)', eager - base)
+    lazy = common.run_python(LAZY)
+    common.report('import llpy.core (lazy)', lazy - base)
+    if lazy > base:
+        print('speedup: %.2fx' % ((eager - base) / (lazy - base)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+''' Compare walking all the instructions of a large module by hand-written
+    GetFirst*/GetNext* loops, GetBasicBlocks lists, and the lazy IRList
+    views (with and without bulk fetching).
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+def build(n):
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    ft = llpy.core.FunctionType(i32, [i32, i32])
+    builder = llpy.core.IRBuilder(ctx)
+    for i in range(n):
+        fn = mod.AddFunction(ft, 'f%d' % i)
+        a, b = fn.GetParams()
+        builder.PositionBuilderAtEnd(fn.AppendBasicBlock())
+        builder.BuildRet(builder.BuildAdd(a, b, ''))
+    return ctx, mod
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ctx, mod = build(n)
+    def by_hand():
+        count = 0
+        fn = mod.GetFirstFunction()
+        while fn is not None:
+            bb = fn.GetFirstBasicBlock()
+            while bb is not None:
+                inst = bb.GetFirstInstruction()
+                while inst is not None:
+                    count += 1
+                    inst = inst.GetNextInstruction()
+                bb = bb.GetNextBasicBlock()
+            fn = fn.GetNextFunction()
+        return count
+    def by_list():
+        count = 0
+        fn = mod.GetFirstFunction()
+        while fn is not None:
+            for bb in fn.GetBasicBlocks():
+                inst = bb.GetFirstInstruction()
+                while inst is not None:
+                    count += 1
+                    inst = inst.GetNextInstruction()
+            fn = fn.GetNextFunction()
+        return count
+    def lazy(bulk):
+        def lazy():
+            count = 0
+            for fn in mod.Functions(bulk):
+                for bb in fn.BasicBlocks(bulk):
+                    for inst in bb.Instructions(bulk):
+                        count += 1
+            return count
+        return lazy
+    assert by_hand() == by_list() == lazy(False)() == lazy(True)() == 2 * n
+    common.report('GetFirst/GetNext', common.best_of(by_hand, 3), 2 * n)
+    common.report('GetBasicBlocks', common.best_of(by_list, 3), 2 * n)
+    common.report('IRList', common.best_of(lazy(False), 3), 2 * n)
+    common.report('IRList, bulk', common.best_of(lazy(True), 3), 2 * n)
+
+if __name__ == '__main__':
+    main()
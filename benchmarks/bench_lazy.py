@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+''' Compare loading a large bitcode file fully with loading it lazily and
+    materializing only a few functions, each in a fresh interpreter.
+'''
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import common
+
+import llpy.io
+
+from bench_use_def import build
+
+
+CHILD = '''
+import resource, sys, time
+start = time.perf_counter()
+import llpy.core, llpy.io
+ctx = llpy.core.Context()
+mb = llpy.io.MemoryBuffer(sys.argv[2])
+if sys.argv[1] == 'lazy':
+    mod = llpy.io.GetBitcodeModule(ctx, mb)
+else:
+    mod = llpy.io.ParseBitcode(ctx, mb)
+for i in range(5):
+    mod.GetNamedFunction('f%d' % i).CountBasicBlocks()
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ctx, mod = build(n)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [common.ROOT, env.get('PYTHONPATH')]))
+    fd, path = tempfile.mkstemp(suffix='.bc')
+    os.close(fd)
+    try:
+        llpy.io.WriteBitcodeToFile(mod, path)
+        print('%d functions, %d bytes of bitcode, 5 used' % (n, os.path.getsize(path)))
+        for mode in ['full', 'lazy']:
+            runs = []
+            for _ in range(3):
+                out = subprocess.check_output([sys.executable, '-c', CHILD, mode, path], env=env)
+                seconds, rss = out.split()
+                runs.append((float(seconds), int(rss)))
+            seconds, rss = min(runs)
+            common.report('  %s' % mode, seconds)
+            print('  %-38s %10d KiB' % ('%s max RSS' % mode, rss))
+    finally:
+        os.unlink(path)
+
+if __name__ == '__main__':
+    main()
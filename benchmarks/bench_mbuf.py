@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+''' Compare copying and non-copying MemoryBuffers over a large blob,
+    and reading them back as bytes or as a memoryview.
+'''
+
+import sys
+
+import common
+
+import llpy.io
+
+
+def main():
+    mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    blob = bytes(mb << 20)
+    print('%d MiB' % mb)
+    common.report('  MemoryBuffer(copy=True)', common.best_of(lambda: llpy.io.MemoryBuffer('blob', blob)))
+    common.report('  MemoryBuffer(copy=False)', common.best_of(lambda: llpy.io.MemoryBuffer('blob', blob, copy=False)))
+    buf = llpy.io.MemoryBuffer('blob', blob, copy=False)
+    common.report('  Get()', common.best_of(buf.Get))
+    common.report('  Get(view=True)', common.best_of(lambda: buf.Get(view=True)))
+
+if __name__ == '__main__':
+    main()
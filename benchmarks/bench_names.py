@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+''' Compare encoding value names with u2b on every call against the
+    interning name2b, alone and inside a builder-heavy loop.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+from llpy import utils
+
+
+NAMES = ['tmp', 'addr', 'cond', 'idx', 'val', '']
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    names = [NAMES[i % len(NAMES)] for i in range(n)]
+    def encode(fn):
+        def run():
+            for name in names:
+                fn(name)
+        return run
+    print('encoding %d names' % n)
+    common.report('  u2b', common.best_of(encode(utils.u2b)), n)
+    common.report('  name2b', common.best_of(encode(utils.name2b)), n)
+    bnames = [utils.u2b(name) for name in names]
+    def encoded():
+        for name in bnames:
+            utils.name2b(name)
+    common.report('  name2b (bytes)', common.best_of(encoded), n)
+
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    fn = mod.AddFunction(llpy.core.FunctionType(i32, [i32]), 'f')
+    builder = llpy.core.IRBuilder(ctx)
+    x = fn.GetParam(0)
+    def build():
+        bb = fn.AppendBasicBlock('')
+        builder.PositionBuilderAtEnd(bb)
+        for name in names:
+            builder.BuildAdd(x, x, name)
+        builder.BuildRet(x)
+        bb.DeleteBasicBlock()
+    print('building %d instructions' % n)
+    saved = llpy.core.name2b
+    try:
+        llpy.core.name2b = utils.u2b
+        common.report('  BuildAdd, u2b', common.best_of(build), n)
+    finally:
+        llpy.core.name2b = saved
+    common.report('  BuildAdd, name2b', common.best_of(build), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+''' Compare per-index operand access with the bulk accessors, on a
+    function with one large switch feeding many PHI nodes.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    phis = 50
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    fn = mod.AddFunction(llpy.core.FunctionType(i32, [i32]), 'f')
+    builder = llpy.core.IRBuilder(ctx)
+    entry = fn.AppendBasicBlock('entry')
+    cases = [fn.AppendBasicBlock('') for i in range(n)]
+    exit = fn.AppendBasicBlock('exit')
+    values = i32.ConstInts(range(n))
+    for bb in cases:
+        builder.PositionBuilderAtEnd(bb)
+        builder.BuildBr(exit)
+    builder.PositionBuilderAtEnd(exit)
+    nodes = [builder.BuildPhi(i32, '') for i in range(phis)]
+    builder.BuildRet(nodes[0])
+    builder.PositionBuilderAtEnd(entry)
+    pairs = list(zip(range(n), cases))
+
+    print('switch with %d cases' % n)
+    def add_case():
+        switch = builder.BuildSwitch(fn.GetParam(0), exit, n)
+        for v, bb in pairs:
+            switch.AddCase(i32.ConstInt(v), bb)
+        switch.InstructionEraseFromParent()
+    def add_cases():
+        switch = builder.BuildSwitch(fn.GetParam(0), exit, n)
+        switch.AddCases(pairs)
+        switch.InstructionEraseFromParent()
+    common.report('  AddCase', common.best_of(add_case, 3), n)
+    common.report('  AddCases', common.best_of(add_cases, 3), n)
+
+    for phi in nodes:
+        phi.AddIncomingPairs(zip(values, cases))
+    print('%d PHIs with %d incoming' % (phis, n))
+    def by_index():
+        rv = []
+        for phi in nodes:
+            rv.append([(phi.GetIncomingValue(i), phi.GetIncomingBlock(i)) for i in range(phi.CountIncoming())])
+        return rv
+    def bulk():
+        return [phi.GetIncoming() for phi in nodes]
+    def operands_by_index():
+        return [[phi.GetOperand(i) for i in range(phi.GetNumOperands())] for phi in nodes]
+    def operands():
+        return [phi.GetOperands() for phi in nodes]
+    assert by_index() == bulk()
+    assert operands_by_index() == operands()
+    common.report('  GetIncomingValue/Block', common.best_of(by_index, 3), phis * n)
+    common.report('  GetIncoming', common.best_of(bulk, 3), phis * n)
+    common.report('  GetOperand', common.best_of(operands_by_index, 3), phis * n)
+    common.report('  GetOperands', common.best_of(operands, 3), phis * n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+''' Compare an opcode histogram gathered through Value wrappers with
+    llpy.analysis.profile.
+'''
+
+import collections
+import sys
+
+import common
+
+import llpy.core
+from llpy.analysis import profile
+
+from bench_use_def import build
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ctx, mod = build(n)
+    def wrappers():
+        histogram = collections.Counter()
+        for fn in mod.Functions():
+            for bb in fn.BasicBlocks():
+                for inst in bb.Instructions():
+                    histogram[inst.GetInstructionOpcode()] += 1
+        return sum(histogram.values())
+    def single_pass():
+        return profile(mod).instructions()
+    assert wrappers() == single_pass()
+    common.report('wrappers', common.best_of(wrappers, 3), n)
+    common.report('profile', common.best_of(single_pass, 3), n)
+
+if __name__ == '__main__':
+    main()
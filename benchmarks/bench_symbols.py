@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+''' Compare GetNamedFunction/GetNamedGlobal lookups with and without the
+    symbol index, on a module with many symbols.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    ft = llpy.core.FunctionType(i32, [])
+    fnames = ['f%d' % i for i in range(n // 2)]
+    gnames = ['g%d' % i for i in range(n // 2)]
+    # keep the wrappers alive, as a frontend would
+    symbols = [mod.AddFunction(ft, name) for name in fnames]
+    symbols += [mod.AddGlobal(i32, name) for name in gnames]
+    print('%d symbols' % n)
+    def lookup():
+        for name in fnames:
+            mod.GetNamedFunction(name)
+        for name in gnames:
+            mod.GetNamedGlobal(name)
+    common.report('  no index', common.best_of(lookup, 3), n)
+    common.report('  EnableSymbolIndex', common.best_of(mod.EnableSymbolIndex, 1))
+    common.report('  indexed', common.best_of(lookup, 3), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+''' Compare finding all users of every value through Value wrappers and
+    Use iteration with building a UseDefTable.
+'''
+
+import sys
+
+import common
+
+import llpy.core
+from llpy.analysis import UseDefTable
+
+
+def build(n):
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    ft = llpy.core.FunctionType(i32, [i32, i32])
+    builder = llpy.core.IRBuilder(ctx)
+    for i in range(n):
+        fn = mod.AddFunction(ft, 'f%d' % i)
+        a, b = fn.GetParams()
+        builder.PositionBuilderAtEnd(fn.AppendBasicBlock())
+        c = builder.BuildAdd(a, b, '')
+        d = builder.BuildMul(c, a, '')
+        builder.BuildRet(builder.BuildSub(d, c, ''))
+    return ctx, mod
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ctx, mod = build(n)
+    def wrappers():
+        users = {}
+        for fn in mod.Functions():
+            for bb in fn.BasicBlocks():
+                for inst in bb.Instructions():
+                    for op in inst.GetOperands():
+                        users.setdefault(op, []).append(inst)
+        return sum(len(v) for v in users.values())
+    def table():
+        return len(UseDefTable(mod).users)
+    assert wrappers() == table()
+    common.report('wrappers', common.best_of(wrappers, 3), n)
+    common.report('UseDefTable', common.best_of(table, 3), n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+''' Measure IR construction under each llpy.validation_level().
+
+    Each level runs in its own interpreter, since the choice must be made
+    before llpy.core is imported.
+'''
+
+import os
+import subprocess
+import sys
+
+import common
+
+
+def workload(blocks):
+    import llpy.core
+    ctx = llpy.core.Context()
+    mod = llpy.core.Module(ctx, 'bench')
+    i32 = llpy.core.IntegerType(ctx, 32)
+    i32p = llpy.core.PointerType(i32)
+    func = mod.AddFunction(llpy.core.FunctionType(i32, [i32, i32p]), 'func')
+    a, p = func.GetParams()
+    builder = llpy.core.IRBuilder(ctx)
+    builder.PositionBuilderAtEnd(func.AppendBasicBlock())
+    def build():
+        x = a
+        for i in range(blocks):
+            c = i32.ConstInt(i)
+            x = builder.BuildAdd(x, c)
+            y = builder.BuildLoad(p)
+            x = builder.BuildMul(x, y)
+            builder.BuildStore(x, p)
+    return common.best_of(build, repeat=3), blocks * 5
+
+def child(level, blocks):
+    import llpy
+    llpy.validation_level(level)
+    t, n = workload(blocks)
+    print('%r %r' % (t, n))
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+        return
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [common.ROOT, env.get('PYTHONPATH')]))
+    for level in ['full', 'cheap', 'none']:
+        out = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', level, str(blocks)], env=env)
+        t, n = out.split()
+        common.report('validation_level(%r)' % level, float(t), int(n))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2013-2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Shared helpers for the benchmark scripts.
+
+    Each benchmark is a standalone script; run it from anywhere, e.g.
+    `python3 benchmarks/bench_import.py`.
+'''
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def best_of(fn, repeat=5, number=1):
+    ''' Return the best time per call of fn(), in seconds.
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        t = (time.perf_counter() - start) / number
+        if best is None or t < best:
+            best = t
+    return best
+
+def run_python(code, repeat=5):
+    ''' Return the best wall time of running `code` in a fresh interpreter.
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    def run():
+        subprocess.check_call([sys.executable, '-c', code], env=env)
+    return best_of(run, repeat)
+
+def report(label, seconds, count=None):
+    if count is None:
+        print('%-40s %10.3f ms' % (label, seconds * 1e3))
+    else:
+        print('%-40s %10.3f ms  (%8.1f ns/item)' % (label, seconds * 1e3, seconds / count * 1e9))
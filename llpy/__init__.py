@@ -55,6 +55,50 @@ def allow_unknown_machines(value):
     global __allow_unknown_machines
     __allow_unknown_machines = bool(value)
 
+def validation_level(value):
+    ''' How much checking the high-level wrappers do.
+
+        'full' (the default) asserts everything, including consistency
+        checks that cost extra C calls whenever a Value is wrapped.
+        'cheap' keeps the isinstance assertions but skips those C calls.
+        'none' replaces the wrapper methods with copies compiled without
+        any assertions, as if running under `python -O`.
+    '''
+    global __validation_level
+    if value not in ('full', 'cheap', 'none'):
+        raise ValueError('validation level must be one of full, cheap, none')
+    __validation_level = value
+
+def int_handles(value):
+    ''' Use plain integer addresses for all LLVM handles.
+
+        Foreign functions then take and return ints instead of allocating
+        a ctypes pointer object for every result, and the wrapper caches
+        are keyed on those ints directly.
+    '''
+    global __int_handles
+    __int_handles = bool(value)
+
+def cache_detection(value):
+    ''' Whether to cache the output of `llvm-config` (on by default).
+
+        The cache lives in $XDG_CACHE_HOME/llpy and invalidates itself
+        when $PATH, $LLPY_LLVM_VERSION or the LLVM installation change.
+    '''
+    global __cache_detection
+    __cache_detection = bool(value)
+
+# this one may also be changed between imports of the low-level modules;
+# it only affects functions declared after the call
+def lazy_binding(value):
+    ''' Look up foreign functions on first call instead of at import.
+
+        This makes importing llpy.core much cheaper, at the cost of
+        reporting missing symbols late.
+    '''
+    global __lazy_binding
+    __lazy_binding = bool(value)
+
 __deprecate = False
 __untested = False
 __cuntested = False
@@ -63,3 +107,7 @@ __unknown_values = False
 
 __native_fallback_all = True
 __allow_unknown_machines = False
+__cache_detection = True
+__int_handles = False
+__validation_level = 'full'
+__lazy_binding = False
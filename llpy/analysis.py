@@ -0,0 +1,721 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Whole-module analyses, done in bulk on raw handles.
+
+    Nothing here creates Value wrappers except on request, so these are
+    suitable for modules far too large to wrap every value of.
+'''
+
+import array
+import collections
+
+from llpy.c import (
+        _c,
+        core as _core,
+        target as _target,
+)
+from llpy.core import (
+        BasicBlock,
+        Function,
+        Module,
+        Opcode,
+        Value,
+)
+from llpy.target import TargetData
+from llpy.utils import b2u
+
+
+class ValueKind(object):
+    ''' The values of UseDefTable.kind.
+    '''
+    Other = 0
+    GlobalVariable = 1
+    Function = 2
+    GlobalAlias = 3
+    Argument = 4
+    BasicBlock = 5
+    Instruction = 6
+    Constant = 7
+    ConstantExpr = 8
+
+_user_kinds = frozenset([
+    ValueKind.GlobalVariable,
+    ValueKind.Function,
+    ValueKind.GlobalAlias,
+    ValueKind.Instruction,
+    ValueKind.Constant,
+    ValueKind.ConstantExpr,
+])
+
+
+class UseDefTable(object):
+    ''' A columnar snapshot of the use-def graph of a module.
+
+        Every value in the module gets an integer id: first the global
+        variables, then each function followed by its arguments and, for
+        each basic block, the block and its instructions. After those
+        come all other values (constants, aliases, metadata ...) in the
+        order they are first seen as operands.
+
+        The columns are array.arrays indexed by id:
+
+            kind        a ValueKind
+            opcode      the Opcode of an instruction or ConstantExpr, or 0
+            type_kind   the TypeKind of the value's type
+            block       the id of an instruction's block, or -1
+            function    the id of the function an argument, block or
+                        instruction belongs to, or -1
+
+        Operands and users are stored in compressed rows: the operands
+        of id i are operands[operand_start[i]:operand_start[i + 1]]
+        (-1 for a null operand), its users are
+        users[user_start[i]:user_start[i + 1]], and user_operand_index
+        says which operand of each user it is.
+
+        The table is not updated if the module changes.
+    '''
+    __slots__ = (
+            '_context', '_raws', '_ids',
+            'kind', 'opcode', 'type_kind', 'block', 'function',
+            'operand_start', 'operands',
+            'user_start', 'users', 'user_operand_index',
+    )
+    _columns = __slots__[3:]
+
+    def __init__(self, module):
+        assert isinstance(module, Module)
+        self._context = module._context
+        self._raws = raws = []
+        self._ids = ids = {}
+        self.kind = kind = array.array('B')
+        self.opcode = opcode = array.array('H')
+        self.type_kind = type_kind = array.array('B')
+        self.block = block = array.array('i')
+        self.function = function = array.array('i')
+
+        pointer_value = _c.pointer_value
+        type_of = _core.TypeOf
+        get_type_kind = _core.GetTypeKind
+        def add(raw, k, op, bb, fn):
+            i = len(raws)
+            ids[pointer_value(raw)] = i
+            raws.append(raw)
+            kind.append(k)
+            opcode.append(op)
+            type_kind.append(get_type_kind(type_of(raw)))
+            block.append(bb)
+            function.append(fn)
+            return i
+
+        mod = module._raw
+        step = _core.GetNextGlobal
+        raw = _core.GetFirstGlobal(mod)
+        while raw:
+            add(raw, ValueKind.GlobalVariable, 0, -1, -1)
+            raw = step(raw)
+
+        next_function = _core.GetNextFunction
+        next_param = _core.GetNextParam
+        next_block = _core.GetNextBasicBlock
+        next_instruction = _core.GetNextInstruction
+        as_value = _core.BasicBlockAsValue
+        get_opcode = _core.GetInstructionOpcode
+        raw_fn = _core.GetFirstFunction(mod)
+        while raw_fn:
+            fn = add(raw_fn, ValueKind.Function, 0, -1, -1)
+            raw = _core.GetFirstParam(raw_fn)
+            while raw:
+                add(raw, ValueKind.Argument, 0, -1, fn)
+                raw = next_param(raw)
+            raw_bb = _core.GetFirstBasicBlock(raw_fn)
+            while raw_bb:
+                bb = add(as_value(raw_bb), ValueKind.BasicBlock, 0, -1, fn)
+                raw = _core.GetFirstInstruction(raw_bb)
+                while raw:
+                    add(raw, ValueKind.Instruction, get_opcode(raw), bb, fn)
+                    raw = next_instruction(raw)
+                raw_bb = next_block(raw_bb)
+            raw_fn = next_function(raw_fn)
+
+        self.operand_start = operand_start = array.array('i')
+        self.operands = operands = array.array('i')
+        get_num_operands = _core.GetNumOperands
+        get_operand = _core.GetOperand
+        is_a_user = _core.IsAUser
+        is_a_constant_expr = _core.IsAConstantExpr
+        is_a_global_alias = _core.IsAGlobalAlias
+        is_a_constant = _core.IsAConstant
+        get_const_opcode = _core.GetConstOpcode
+        user_kinds = _user_kinds
+        # raws grows as new operands are found
+        i = 0
+        while i < len(raws):
+            operand_start.append(len(operands))
+            raw = raws[i]
+            if kind[i] in user_kinds:
+                for j in range(get_num_operands(raw)):
+                    raw_op = get_operand(raw, j)
+                    if not raw_op:
+                        operands.append(-1)
+                        continue
+                    op = ids.get(pointer_value(raw_op))
+                    if op is None:
+                        if is_a_constant_expr(raw_op):
+                            op = add(raw_op, ValueKind.ConstantExpr, get_const_opcode(raw_op), -1, -1)
+                        elif is_a_global_alias(raw_op):
+                            op = add(raw_op, ValueKind.GlobalAlias, 0, -1, -1)
+                        elif is_a_constant(raw_op):
+                            op = add(raw_op, ValueKind.Constant, 0, -1, -1)
+                        else:
+                            # metadata and inline asm are not users
+                            assert not is_a_user(raw_op)
+                            op = add(raw_op, ValueKind.Other, 0, -1, -1)
+                    operands.append(op)
+            i += 1
+        operand_start.append(len(operands))
+
+        # invert by counting sort
+        n = len(raws)
+        counts = [0] * (n + 1)
+        for op in operands:
+            if op >= 0:
+                counts[op + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.user_start = array.array('i', counts)
+        fill = counts[:-1]
+        users = [0] * counts[-1]
+        user_operand_index = [0] * counts[-1]
+        for user in range(n):
+            start = operand_start[user]
+            for pos in range(start, operand_start[user + 1]):
+                op = operands[pos]
+                if op >= 0:
+                    slot = fill[op]
+                    fill[op] = slot + 1
+                    users[slot] = user
+                    user_operand_index[slot] = pos - start
+        self.users = array.array('i', users)
+        self.user_operand_index = array.array('i', user_operand_index)
+
+    def __len__(self):
+        return len(self._raws)
+
+    def value(self, i):
+        ''' Obtain the Value with id i.
+        '''
+        return Value(self._raws[i], self._context)
+
+    def id_of(self, value):
+        ''' Obtain the id of a Value, or raise KeyError.
+        '''
+        assert isinstance(value, Value)
+        return self._ids[_c.pointer_value(value._raw)]
+
+    def operands_of(self, i):
+        ''' Obtain the operand ids of id i.
+        '''
+        return self.operands[self.operand_start[i]:self.operand_start[i + 1]]
+
+    def users_of(self, i):
+        ''' Obtain the ids of the users of id i, once per use.
+        '''
+        return self.users[self.user_start[i]:self.user_start[i + 1]]
+
+    def as_numpy(self):
+        ''' Return a dict of numpy arrays sharing memory with the columns.
+
+            For example, all loads whose address is a GEP on global x:
+
+                t = UseDefTable(module)
+                c = t.as_numpy()
+                x = t.id_of(x)
+                loads = numpy.flatnonzero((c['kind'] == ValueKind.Instruction)
+                                          & (c['opcode'] == Opcode.Load))
+                addr = c['operands'][c['operand_start'][loads]]
+                gep = c['opcode'][addr] == Opcode.GetElementPtr
+                base = c['operands'][c['operand_start'][addr]]
+                loads[gep & (base == x)]
+        '''
+        import numpy
+        rv = {}
+        for name in self._columns:
+            column = getattr(self, name)
+            if column:
+                rv[name] = numpy.frombuffer(column, dtype=column.typecode)
+            else:
+                rv[name] = numpy.zeros(0, dtype=column.typecode)
+        return rv
+
+
+def _csr(n, edges):
+    ''' Turn a list of (source, target) pairs into compressed rows,
+        keeping the order of the edges of each source.
+    '''
+    counts = [0] * (n + 1)
+    for src, dst in edges:
+        counts[src + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    fill = counts[:-1]
+    targets = [0] * counts[-1]
+    for src, dst in edges:
+        targets[fill[src]] = dst
+        fill[src] += 1
+    return array.array('i', counts), array.array('i', targets)
+
+def get_cfg(function):
+    ''' Obtain the CFG of a function, computing it only if it might have
+        changed since the last call.
+
+        The cache is cleared by every wrapper that can change the CFG of
+        any function in the context (including running passes), but not
+        by changes made directly through llpy.c.
+    '''
+    assert isinstance(function, Function)
+    function.Materialize()
+    cache = function._context.cfg_cache
+    key = _c.pointer_value(function._raw)
+    cfg = cache.get(key)
+    if cfg is None:
+        cfg = cache[key] = CFG(function)
+    return cfg
+
+
+class Loop(object):
+    ''' A natural loop in a CFG, identified by block ids.
+    '''
+    __slots__ = ('header', 'blocks', 'parent', 'children', 'depth')
+
+    def __init__(self, header, blocks):
+        self.header = header
+        self.blocks = blocks
+        self.parent = None
+        self.children = []
+        self.depth = 1
+
+    def __repr__(self):
+        return '<Loop header=%d blocks=%d depth=%d>' % (self.header, len(self.blocks), self.depth)
+
+
+class CFG(object):
+    ''' The control flow graph of a function, with dominators and loops.
+
+        Blocks are identified by their index in the function, so the
+        entry block is 0. All the arrays are array.arrays of block ids,
+        with -1 meaning "none":
+
+            succ_start, succs   successors of b are
+                                succs[succ_start[b]:succ_start[b + 1]]
+            pred_start, preds   likewise for predecessors
+            rpo                 the reachable blocks, in reverse postorder
+            rpo_number          the index of each block in rpo, or -1 if
+                                it is unreachable
+            idom                the immediate dominator of each block
+                                (the entry block is its own), or -1 if
+                                it is unreachable
+
+        Each edge appears once, however many times the terminator names
+        the same successor.
+
+        Dominance frontiers and loops are computed on first use.
+        Use get_cfg() rather than creating these directly.
+    '''
+    __slots__ = (
+            '_context', '_raws', '_ids',
+            'succ_start', 'succs', 'pred_start', 'preds',
+            'rpo', 'rpo_number', 'idom',
+            '_dom_start', '_dom_children', '_dom_pre', '_dom_post',
+            '_df_start', '_df', '_loops', '_loop_of',
+    )
+
+    def __init__(self, function):
+        assert isinstance(function, Function)
+        self._context = function._context
+        raw_fn = function._raw
+        n = _core.CountBasicBlocks(raw_fn)
+        raw_bbs = (_core.BasicBlock * n)()
+        if n:
+            _core.GetBasicBlocks(raw_fn, raw_bbs)
+        as_value = _core.BasicBlockAsValue
+        pointer_value = _c.pointer_value
+        self._raws = raws = [as_value(raw_bb) for raw_bb in raw_bbs]
+        self._ids = ids = {}
+        for i, raw in enumerate(raws):
+            ids[pointer_value(raw)] = i
+
+        get_terminator = _core.GetBasicBlockTerminator
+        get_opcode = _core.GetInstructionOpcode
+        get_num_operands = _core.GetNumOperands
+        get_operand = _core.GetOperand
+        br = Opcode.Br
+        edges = []
+        for b, raw_bb in enumerate(raw_bbs):
+            term = get_terminator(raw_bb)
+            if not term:
+                continue
+            # Every block operand of a terminator is a successor, but
+            # BranchInst stores them in reverse order.
+            succs = []
+            seen = set()
+            for j in range(get_num_operands(term)):
+                raw_op = get_operand(term, j)
+                s = ids.get(pointer_value(raw_op)) if raw_op else None
+                if s is not None and s not in seen:
+                    seen.add(s)
+                    succs.append(s)
+            if get_opcode(term) == br:
+                succs.reverse()
+            for s in succs:
+                edges.append((b, s))
+        self.succ_start, self.succs = _csr(n, edges)
+        self.pred_start, self.preds = _csr(n, [(d, s) for s, d in edges])
+
+        self._compute_rpo(n)
+        self._compute_idom(n)
+        self._df_start = None
+        self._loops = None
+
+    def _compute_rpo(self, n):
+        succ_start = self.succ_start
+        succs = self.succs
+        rpo_number = array.array('i', [-1]) * n
+        order = []
+        if n:
+            # iterative DFS; rpo_number doubles as the visited set
+            rpo_number[0] = 0
+            stack = [(0, succ_start[0])]
+            while stack:
+                b, i = stack[-1]
+                if i < succ_start[b + 1]:
+                    stack[-1] = (b, i + 1)
+                    s = succs[i]
+                    if rpo_number[s] < 0:
+                        rpo_number[s] = 0
+                        stack.append((s, succ_start[s]))
+                else:
+                    stack.pop()
+                    order.append(b)
+        order.reverse()
+        for i, b in enumerate(order):
+            rpo_number[b] = i
+        self.rpo = array.array('i', order)
+        self.rpo_number = rpo_number
+
+    def _compute_idom(self, n):
+        ''' Cooper, Harvey and Kennedy, "A Simple, Fast Dominance Algorithm".
+        '''
+        rpo = self.rpo
+        rpo_number = self.rpo_number
+        pred_start = self.pred_start
+        preds = self.preds
+        m = len(rpo)
+        # everything in rpo numbers, until the end
+        rpo_preds = []
+        for b in rpo:
+            rpo_preds.append([rpo_number[p] for p in preds[pred_start[b]:pred_start[b + 1]] if rpo_number[p] >= 0])
+        doms = [-1] * m
+        if m:
+            doms[0] = 0
+        changed = True
+        while changed:
+            changed = False
+            for b in range(1, m):
+                new_idom = -1
+                for p in rpo_preds[b]:
+                    if doms[p] < 0:
+                        continue
+                    if new_idom < 0:
+                        new_idom = p
+                        continue
+                    a = p
+                    while a != new_idom:
+                        while a > new_idom:
+                            a = doms[a]
+                        while new_idom > a:
+                            new_idom = doms[new_idom]
+                if doms[b] != new_idom:
+                    doms[b] = new_idom
+                    changed = True
+        idom = array.array('i', [-1]) * n
+        for i in range(m):
+            idom[rpo[i]] = rpo[doms[i]]
+        self.idom = idom
+
+        # Number the dominator tree for O(1) dominates().
+        children = [(idom[b], b) for b in rpo[1:]]
+        self._dom_start, self._dom_children = _csr(n, children)
+        dom_pre = array.array('i', [-1]) * n
+        dom_post = array.array('i', [-1]) * n
+        if m:
+            dom_start = self._dom_start
+            dom_children = self._dom_children
+            counter = 0
+            dom_pre[0] = counter
+            stack = [(0, dom_start[0])]
+            while stack:
+                b, i = stack[-1]
+                if i < dom_start[b + 1]:
+                    stack[-1] = (b, i + 1)
+                    c = dom_children[i]
+                    counter += 1
+                    dom_pre[c] = counter
+                    stack.append((c, dom_start[c]))
+                else:
+                    stack.pop()
+                    dom_post[b] = counter
+        self._dom_pre = dom_pre
+        self._dom_post = dom_post
+
+    def __len__(self):
+        return len(self._raws)
+
+    def block(self, b):
+        ''' Obtain the BasicBlock with id b.
+        '''
+        return Value(self._raws[b], self._context)
+
+    def id_of(self, bb):
+        ''' Obtain the id of a BasicBlock, or raise KeyError.
+        '''
+        assert isinstance(bb, BasicBlock)
+        return self._ids[_c.pointer_value(bb._raw)]
+
+    def successors(self, b):
+        return self.succs[self.succ_start[b]:self.succ_start[b + 1]]
+
+    def predecessors(self, b):
+        return self.preds[self.pred_start[b]:self.pred_start[b + 1]]
+
+    def dom_children(self, b):
+        ''' Obtain the children of b in the dominator tree.
+        '''
+        return self._dom_children[self._dom_start[b]:self._dom_start[b + 1]]
+
+    def dominates(self, a, b):
+        ''' Whether block a dominates block b (including a == b).
+
+            Unreachable blocks dominate, and are dominated by, nothing.
+        '''
+        pre = self._dom_pre[a]
+        return pre >= 0 and pre <= self._dom_pre[b] <= self._dom_post[a]
+
+    def frontier(self, b):
+        ''' Obtain the dominance frontier of b.
+        '''
+        if self._df_start is None:
+            self._compute_frontiers()
+        return self._df[self._df_start[b]:self._df_start[b + 1]]
+
+    def _compute_frontiers(self):
+        idom = self.idom
+        rpo_number = self.rpo_number
+        pred_start = self.pred_start
+        preds = self.preds
+        edges = set()
+        for b in self.rpo:
+            start = pred_start[b]
+            end = pred_start[b + 1]
+            if end - start < 2:
+                continue
+            for p in preds[start:end]:
+                if rpo_number[p] < 0:
+                    continue
+                runner = p
+                while runner != idom[b]:
+                    edges.add((runner, b))
+                    runner = idom[runner]
+        self._df_start, self._df = _csr(len(self), sorted(edges))
+
+    @property
+    def loops(self):
+        ''' The outermost loops, in reverse postorder of their headers.
+        '''
+        if self._loops is None:
+            self._compute_loops()
+        return self._loops
+
+    def loop_of(self, b):
+        ''' Obtain the innermost Loop containing b, or None.
+        '''
+        if self._loops is None:
+            self._compute_loops()
+        return self._loop_of[b]
+
+    def _compute_loops(self):
+        rpo_number = self.rpo_number
+        pred_start = self.pred_start
+        preds = self.preds
+        all_loops = []
+        for h in self.rpo:
+            latches = [p for p in preds[pred_start[h]:pred_start[h + 1]]
+                       if rpo_number[p] >= 0 and self.dominates(h, p)]
+            if not latches:
+                continue
+            # everything that reaches a latch without going through h
+            body = set([h])
+            stack = [p for p in latches if p != h]
+            body.update(stack)
+            while stack:
+                b = stack.pop()
+                for p in preds[pred_start[b]:pred_start[b + 1]]:
+                    if rpo_number[p] >= 0 and p not in body:
+                        body.add(p)
+                        stack.append(p)
+            blocks = array.array('i', sorted(body, key=rpo_number.__getitem__))
+            all_loops.append(Loop(h, blocks))
+
+        # Natural loops either nest or are disjoint, so the smallest loop
+        # containing a block is its innermost one.
+        loop_of = [None] * len(self)
+        all_loops.sort(key=lambda l: -len(l.blocks))
+        top = []
+        for loop in all_loops:
+            parent = loop_of[loop.header]
+            if parent is None:
+                top.append(loop)
+            else:
+                loop.parent = parent
+                loop.depth = parent.depth + 1
+                parent.children.append(loop)
+            for b in loop.blocks:
+                loop_of[b] = loop
+        key = lambda l: rpo_number[l.header]
+        top.sort(key=key)
+        for loop in all_loops:
+            loop.children.sort(key=key)
+        self._loops = top
+        self._loop_of = loop_of
+
+
+class FunctionProfile(collections.namedtuple('FunctionProfile',
+        'name blocks instructions calls call_sites')):
+    ''' Sizes of one function, as gathered by profile().
+
+        calls is the number of calls and invokes in the function;
+        call_sites is the number of direct calls and invokes of it
+        anywhere in the module. Declarations have no blocks.
+    '''
+    __slots__ = ()
+
+class GlobalProfile(collections.namedtuple('GlobalProfile', 'name size')):
+    ''' The ABI size in bytes of a global variable, or None if it is
+        unsized or no TargetData was given.
+    '''
+    __slots__ = ()
+
+class ModuleProfile(collections.namedtuple('ModuleProfile', 'functions globals opcodes')):
+    ''' The result of profile().
+
+        functions and globals are tuples of FunctionProfile and
+        GlobalProfile, in module order. opcodes is the module-wide
+        histogram, as a sorted tuple of (opcode name, count) pairs
+        so that it compares equal across LLVM versions.
+    '''
+    __slots__ = ()
+
+    def instructions(self):
+        return sum(f.instructions for f in self.functions)
+
+    def global_size(self):
+        return sum(g.size for g in self.globals if g.size is not None)
+
+
+def profile(module, target_data=None):
+    ''' Gather instruction, block, call and opcode counts and global sizes
+        of a module in a single pass, without creating wrappers.
+    '''
+    assert isinstance(module, Module)
+    mod = module._raw
+    get_name = _core.GetValueName
+    type_of = _core.TypeOf
+
+    globals_ = []
+    if target_data is not None:
+        assert isinstance(target_data, TargetData)
+        raw_td = target_data._raw
+        abi_size = _target.ABISizeOfType
+        is_sized = _core.TypeIsSized
+        get_element_type = _core.GetElementType
+    step = _core.GetNextGlobal
+    raw = _core.GetFirstGlobal(mod)
+    while raw:
+        size = None
+        if target_data is not None:
+            raw_ty = get_element_type(type_of(raw))
+            if is_sized(raw_ty):
+                size = abi_size(raw_td, raw_ty)
+        globals_.append(GlobalProfile(b2u(get_name(raw)), size))
+        raw = step(raw)
+
+    pointer_value = _c.pointer_value
+    next_function = _core.GetNextFunction
+    next_block = _core.GetNextBasicBlock
+    next_instruction = _core.GetNextInstruction
+    get_opcode = _core.GetInstructionOpcode
+    get_num_operands = _core.GetNumOperands
+    get_operand = _core.GetOperand
+    call = Opcode.Call
+    invoke = Opcode.Invoke
+    histogram = collections.defaultdict(int)
+    function_ids = {}
+    call_sites = []
+    functions = []
+    callees = []
+    raw_fn = _core.GetFirstFunction(mod)
+    while raw_fn:
+        function_ids[pointer_value(raw_fn)] = len(functions)
+        blocks = 0
+        instructions = 0
+        calls = 0
+        raw_bb = _core.GetFirstBasicBlock(raw_fn)
+        while raw_bb:
+            blocks += 1
+            raw = _core.GetFirstInstruction(raw_bb)
+            while raw:
+                instructions += 1
+                op = get_opcode(raw)
+                histogram[op] += 1
+                if op == call or op == invoke:
+                    calls += 1
+                    # the callee is the last operand of a call, but an
+                    # invoke has its normal and unwind destinations after it
+                    if op == call:
+                        callee = get_operand(raw, get_num_operands(raw) - 1)
+                    else:
+                        callee = get_operand(raw, get_num_operands(raw) - 3)
+                    if callee:
+                        callees.append(pointer_value(callee))
+                raw = next_instruction(raw)
+            raw_bb = next_block(raw_bb)
+        functions.append([b2u(get_name(raw_fn)), blocks, instructions, calls])
+        call_sites.append(0)
+        raw_fn = next_function(raw_fn)
+
+    for callee in callees:
+        i = function_ids.get(callee)
+        if i is not None:
+            call_sites[i] += 1
+    names = Opcode._enum_names
+    opcodes = sorted((names.get(op, '%d' % op), n) for op, n in histogram.items())
+    return ModuleProfile(
+            tuple(FunctionProfile(*(f + [c])) for f, c in zip(functions, call_sites)),
+            tuple(globals_),
+            tuple(opcodes),
+    )
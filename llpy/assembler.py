@@ -0,0 +1,217 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Build large modules as textual IR, and parse them in one call.
+
+    Going through the IRBuilder costs several ctypes calls per instruction;
+    beyond a certain size it is cheaper to write the assembly and let
+    the IR parser do all the work at once.
+'''
+
+from __future__ import unicode_literals
+
+import re
+
+from llpy import (
+        io as _io,
+        linker as _linker,
+)
+from llpy.compat import unicode
+from llpy.utils import u2b
+from llpy.core import (
+        Constant,
+        Function,
+        FunctionType,
+        GlobalValue,
+        GlobalVariable,
+        SequentialType,
+        StructType,
+        Type,
+        Value,
+        _version,
+)
+
+
+_plain_name = re.compile(r'^[-a-zA-Z$._][-a-zA-Z$._0-9]*$')
+
+def ident(prefix, name):
+    ''' Spell a name as an IR identifier, quoting it if needed.
+
+        prefix is '@' for globals, '%' for locals and types.
+    '''
+    if _plain_name.match(name):
+        return prefix + name
+    def escape(m):
+        return ''.join('\\%02X' % b for b in bytearray(u2b(m.group())))
+    return '%s"%s"' % (prefix, re.sub(r'["\\\x00-\x1f\x7f\udc80-\udcff]', escape, name))
+
+
+if (3, 4) <= _version:
+    class IRWriter(object):
+        ''' Accumulate textual IR that uses the Types and global Values
+            of one Context.
+
+            Named struct types and globals from other modules are
+            declared automatically when they are referred to, so the
+            result can be linked into the modules they came from.
+        '''
+        __slots__ = ('_context', '_header', '_body', '_types', '_declared')
+
+        def __init__(self, context):
+            self._context = context
+            self._header = []
+            self._body = []
+            self._types = {}
+            self._declared = set()
+
+        def type(self, ty):
+            ''' Return the IR spelling of a Type.
+            '''
+            rv = self._types.get(ty)
+            if rv is None:
+                assert isinstance(ty, Type)
+                assert ty._context is self._context
+                if isinstance(ty, StructType) and ty.GetStructName() is not None:
+                    # PrintToString gives the whole definition for these
+                    rv = ident('%', ty.GetStructName())
+                else:
+                    rv = ty.PrintToString()
+                self._types[ty] = rv
+                self._define_structs(ty)
+            return rv
+
+        def _define_structs(self, ty):
+            if isinstance(ty, StructType):
+                name = ty.GetStructName()
+                if name is not None:
+                    if ty.IsOpaqueStruct():
+                        self._header.append('%s = type opaque\n' % ident('%', name))
+                        return
+                    elems = [self.type(e) for e in ty.GetStructElementTypes()]
+                    body = '{ %s }' % ', '.join(elems) if elems else '{}'
+                    if ty.IsPackedStruct():
+                        body = '<%s>' % body
+                    self._header.append('%s = type %s\n' % (ident('%', name), body))
+                    return
+                for e in ty.GetStructElementTypes():
+                    self.type(e)
+            elif isinstance(ty, SequentialType):
+                self.type(ty.GetElementType())
+            elif isinstance(ty, FunctionType):
+                self.type(ty.GetReturnType())
+                for p in ty.GetParamTypes():
+                    self.type(p)
+
+        def ref(self, value):
+            ''' Return the typed IR spelling of a Constant, e.g. 'i32 1'
+                or 'i32* @g'.
+
+                Globals are declared the first time they are referred to.
+            '''
+            assert isinstance(value, Constant)
+            if isinstance(value, GlobalValue):
+                return '%s %s' % (self.type(value.TypeOf()), self.declare(value))
+            self.type(value.TypeOf())
+            # aggregates and constant expressions may refer to globals
+            for op in value.GetOperands():
+                self.ref(op)
+            return value.PrintToString()
+
+        def declare(self, value):
+            ''' Declare a global from another module, and return its name.
+            '''
+            name = value.GetValueName()
+            assert name, 'unnamed globals cannot be referred to'
+            rv = ident('@', name)
+            if name in self._declared:
+                return rv
+            self._declared.add(name)
+            if isinstance(value, Function):
+                fty = value.TypeOf().GetElementType()
+                params = [self.type(p) for p in fty.GetParamTypes()]
+                if fty.IsVarArg():
+                    params.append('...')
+                self._header.append('declare %s %s(%s)\n' % (self.type(fty.GetReturnType()), rv, ', '.join(params)))
+            else:
+                assert isinstance(value, GlobalVariable)
+                ptr = value.TypeOf()
+                space = ptr.GetPointerAddressSpace()
+                kind = 'constant' if value.IsConstant() else 'global'
+                if space:
+                    kind = 'addrspace(%d) %s' % (space, kind)
+                self._header.append('%s = external %s %s\n' % (rv, kind, self.type(ptr.GetElementType())))
+            return rv
+
+        def write(self, text):
+            ''' Append raw IR text.
+            '''
+            self._body.append(text)
+
+        def define(self, name, fty, body, params=None, linkage=''):
+            ''' Append a function definition.
+
+                body is the text between the braces, as a string or a
+                sequence of lines; the parameters are named by params,
+                or else %p0, %p1, ...
+            '''
+            assert isinstance(fty, FunctionType)
+            types = [self.type(p) for p in fty.GetParamTypes()]
+            if params is None:
+                params = ['p%d' % i for i in range(len(types))]
+            assert len(params) == len(types)
+            args = ['%s %s' % (t, ident('%', p)) for t, p in zip(types, params)]
+            if fty.IsVarArg():
+                args.append('...')
+            if not isinstance(body, unicode):
+                body = '\n'.join(body)
+            self._body.append('define %s%s %s(%s) {\n%s\n}\n' % (
+                    linkage + ' ' if linkage else '', self.type(fty.GetReturnType()),
+                    ident('@', name), ', '.join(args), body))
+
+        def define_global(self, name, ty, init=None, constant=False, linkage=''):
+            ''' Append a global variable definition.
+
+                init is a Constant, the untyped IR spelling of one,
+                or None for zeroinitializer.
+            '''
+            if init is None:
+                init = '%s zeroinitializer' % self.type(ty)
+            elif isinstance(init, Value):
+                assert init.TypeOf() is ty
+                init = self.ref(init)
+            else:
+                init = '%s %s' % (self.type(ty), init)
+            self._body.append('%s = %s%s %s\n' % (ident('@', name),
+                    linkage + ' ' if linkage else '',
+                    'constant' if constant else 'global', init))
+
+        def getvalue(self):
+            ''' Return all the IR written so far.
+            '''
+            return ''.join(self._header + self._body)
+
+        def parse(self, name=''):
+            ''' Parse everything written so far into a new Module.
+            '''
+            mbuf = _io.MemoryBuffer(name, u2b(self.getvalue()))
+            return _io.ParseIR(self._context, mbuf)
+
+        def link_into(self, module):
+            ''' Parse everything written so far and link it into module.
+            '''
+            _linker.LinkModules(module, self.parse())
@@ -20,12 +20,18 @@
 '''
 
 import ctypes
-import traceback
+import platform
+import sys
+
+import llpy
+from ..compat import long
 
 
 def c_type_name(ty):
     if ty is None:
         return 'void'
+    # enum restypes are bound methods of _Instances
+    ty = getattr(ty, '__self__', ty)
     rv = ty.__name__
     while rv.startswith('LP_'):
         rv = rv[3:]
@@ -34,11 +40,64 @@ def c_type_name(ty):
 def c_func_repr(self):
     return '<%s %s(%s)>' % (c_type_name(self.restype), self.__name__, ', '.join(c_type_name(a) for a in self.argtypes))
 
+def lazy_binding_enabled():
+    return llpy.__lazy_binding
+
+class LazyFunction(object):
+    ''' Placeholder for a foreign function that has not been looked up yet.
+
+        On the first call, the symbol is resolved and every global in the
+        defining module that still refers to the placeholder is replaced
+        with the real ctypes function, so later calls bypass this class.
+    '''
+    __slots__ = ('_library', '_restype', '_name', '_argtypes', '_namespace', '_filename', '_lineno', '_fun')
+
+    def __init__(self, library, rt, name, args, namespace, filename, lineno):
+        self._library = library
+        self._restype = rt
+        self._name = name
+        self._argtypes = args
+        self._namespace = namespace
+        self._filename = filename
+        self._lineno = lineno
+        self._fun = None
+
+    @property
+    def __name__(self):
+        return self._name
+
+    @property
+    def restype(self):
+        return self._restype
+
+    @property
+    def argtypes(self):
+        return self._argtypes
+
+    def __repr__(self):
+        return c_func_repr(self)
+
+    def materialize(self):
+        fun = self._fun
+        if fun is None:
+            fun = self._library._bind(self._restype, self._name, self._argtypes,
+                    self._namespace, self._filename, self._lineno)
+            self._fun = fun
+            namespace = self._namespace
+            for k, v in namespace.items():
+                if v is self:
+                    namespace[k] = fun
+        return fun
+
+    def __call__(self, *args):
+        return (self._fun or self.materialize())(*args)
+
 class Library(object):
     __slots__ = ('_cdll',)
 
     def __init__(self, name):
         self._cdll = ctypes.cdll.LoadLibrary(name)
+        self._cdll._FuncPtr.__repr__ = c_func_repr
 
     def __repr__(self):
         return 'Library(%r)' % self._cdll._name
@@ -46,99 +105,157 @@ class Library(object):
     def variable(self, typ, name):
         return typ.in_dll(self._cdll, name)
 
-    def function(self, rt, name, args):
-        fun = getattr(self._cdll, name)
-        fun.restype = rt
-        fun.argtypes = args
-        type(fun).__repr__ = c_func_repr
-        fun._filename, fun._lineno, _, _ = traceback.extract_stack(limit=2)[0]
-        mod_name = 'llpy' + fun._filename.split('llpy')[-1]
-        mod_name = mod_name.split('.')[0]
-        mod_name = mod_name.replace('/', '.')
-        fun.__module__ = mod_name
-        fun.__qualname__ = fun.__name__
+    def function(self, rt, name, args, lazy=None):
+        ''' Declare a foreign function.
+
+            If lazy binding is enabled (see llpy.lazy_binding) and not
+            overridden by the `lazy` argument, the symbol is not looked up
+            until the first call, so a missing symbol is only reported then.
+        '''
+        frame = sys._getframe(1)
+        namespace = frame.f_globals
+        filename = frame.f_code.co_filename
+        lineno = frame.f_lineno
+        del frame
+        if lazy is None:
+            lazy = lazy_binding_enabled()
+        if lazy:
+            return LazyFunction(self, rt, name, args, namespace, filename, lineno)
+        return self._bind(rt, name, args, namespace, filename, lineno)
+
+    def _bind(self, rt, name, args, namespace, filename, lineno):
+        fun = self._cdll[name]
+        # enums are ints, which ctypes only understands as their C type
+        fun.restype = getattr(rt, '_from_c', rt)
+        fun.argtypes = [getattr(a, '_ctype', a) for a in args]
+        fun._filename = filename
+        fun._lineno = lineno
+        fun.__module__ = namespace['__name__']
+        fun.__qualname__ = name
         return fun
 
-def opaque(name):
-    ''' Create an opaque pointer typedef.
+int_handles = llpy.__int_handles
+del llpy.int_handles
+
+if not int_handles:
+    def opaque(name):
+        ''' Create an opaque pointer typedef.
+        '''
+        class Foo(ctypes.Structure):
+            __slots__ = ()
+        Foo.__name__ = name
+        return ctypes.POINTER(Foo)
+
+    def is_handle(obj, ty):
+        return isinstance(obj, ty)
+else:
+    def opaque(name):
+        ''' Create an opaque pointer typedef.
+
+            In integer-handle mode, these are all exactly c_void_p, so
+            ctypes returns plain ints (or None) from foreign functions.
+        '''
+        return ctypes.c_void_p
+
+    def is_handle(obj, ty):
+        # c_void_p instances still show up for out-parameters
+        return obj is None or isinstance(obj, (int, long, ctypes.c_void_p))
+
+class _Instances(dict):
+    ''' Cache of the instances of an enum, indexed by value.
+
+        Its __getitem__ is used as the restype of foreign functions, since
+        ctypes calls a restype that is not a ctypes type with the C int it
+        returned.
     '''
-    class Foo(ctypes.Structure):
-        __slots__ = ()
-    Foo.__name__ = name
-    return ctypes.POINTER(Foo)
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.__name__ = cls.__name__
+
+    def __missing__(self, value):
+        rv = self.cls(value)
+        # key by the canonical value, so c_uint enums share instances
+        self[value] = self[int(rv)] = rv
+        return rv
+
+def _finish_enum(Enum, name, kwargs):
+    Enum.__name__ = name
+    for k,v in kwargs.items():
+        setattr(Enum, k, Enum(v))
+    Enum._from_c = _Instances(Enum).__getitem__
+    return Enum
 
 def enum(name, **kwargs):
     ety = ctypes.c_int # currently don't have a reason to use c_uint
-    class Enum(ctypes.Structure):
+    class Enum(int):
+        ''' An int, so it can be passed to and returned from foreign
+            functions without conversion (see Library._bind).
+        '''
         __slots__ = ()
-        _fields_ = [('value', ety)]
+        _ctype = ety
         _enum_names = {v: k for k, v in kwargs.items()}
 
-        def __hash__(self):
-            return hash(self.value)
-
-        def __eq__(self, other):
-            return self.value == other.value
+        def __new__(cls, value=0):
+            # wrap around like the C type would
+            return int.__new__(cls, ety(value).value)
 
-        def __ne__(self, other):
-            return self.value != other.value
-
-        def __bool__(self):
-            return bool(self.value)
-        __nonzero__ = __bool__
+        @property
+        def value(self):
+            return int(self)
 
         def __repr__(self):
+            value = int(self)
             try:
-                name = Enum._enum_names[self.value]
+                name = Enum._enum_names[value]
             except KeyError:
-                if self.value:
-                    return '%s(%d)' % (Enum.__name__, self.value)
+                if value:
+                    return '%s(%d)' % (Enum.__name__, value)
                 else:
                     return '%s()' % (Enum.__name__)
             else:
                 return '%s.%s' % (Enum.__name__, name)
+        __str__ = __repr__
 
-    Enum.__name__ = name
-    for k,v in kwargs.items():
-        setattr(Enum, k, Enum(v))
-    return Enum
+    return _finish_enum(Enum, name, kwargs)
 
 def bit_enum(name, **kwargs):
     ety = ctypes.c_int
     if 1 << 31 in kwargs.values():
         ety = ctypes.c_uint
-    class Enum(ctypes.Structure):
+    class Enum(int):
+        ''' An int, so it can be passed to and returned from foreign
+            functions without conversion (see Library._bind).
+        '''
         __slots__ = ()
-        _fields_ = [('value', ety)]
+        _ctype = ety
         _enum_names = {v: k for k, v in kwargs.items()}
 
-        def __hash__(self):
-            return hash(self.value)
+        def __new__(cls, value=0):
+            # wrap around like the C type would
+            return int.__new__(cls, ety(value).value)
 
-        def __eq__(self, other):
-            return self.value == other.value
-
-        def __ne__(self, other):
-            return self.value != other.value
-
-        def __bool__(self):
-            return bool(self.value)
-        __nonzero__ = __bool__
+        @property
+        def value(self):
+            return int(self)
 
         def __or__(self, other):
-            return Enum(self.value | other.value)
+            return Enum(int(self) | int(other))
+        __ror__ = __or__
 
         def __and__(self, other):
-            return Enum(self.value & other.value)
+            return Enum(int(self) & int(other))
+        __rand__ = __and__
 
         def __xor__(self, other):
-            return Enum(self.value ^ other.value)
+            return Enum(int(self) ^ int(other))
+        __rxor__ = __xor__
 
         def __invert__(self):
-            return Enum(~self.value)
+            return Enum(~int(self))
 
         def __repr__(self):
-            value = self.value
+            value = int(self)
             if not value:
                 return '%s()' % (Enum.__name__)
             if value < 0:
@@ -162,22 +279,113 @@ def bit_enum(name, **kwargs):
             if fail:
                 names.append('%s(0x%X)' % (Enum.__name__, fail))
             return ' | '.join(names)
+        __str__ = __repr__
 
-    Enum.__name__ = name
-    for k,v in kwargs.items():
-        setattr(Enum, k, Enum(v))
-
-    return Enum
+    return _finish_enum(Enum, name, kwargs)
 
 string_buffer = ctypes.POINTER(ctypes.c_char)
 
 def buffer_as_bytes(sb, n):
     return ctypes.cast(sb, ctypes.POINTER(ctypes.c_char * n)).contents.raw
 
-def pointer_value(ptr):
-    return ctypes.cast(ctypes.pointer(ptr),
-            ctypes.POINTER(ctypes.c_size_t)
-            ).contents.value
+if not int_handles:
+    _void_p_from_buffer = ctypes.c_void_p.from_buffer
+
+    def pointer_value(ptr):
+        return _void_p_from_buffer(ptr).value
+else:
+    def pointer_value(ptr):
+        if isinstance(ptr, ctypes.c_void_p):
+            return ptr.value
+        return ptr
 
 def pointer_same(a, b):
     return pointer_value(a) == pointer_value(b)
+
+class _Py_buffer(ctypes.Structure):
+    _fields_ = [
+            ('buf', ctypes.c_void_p),
+            ('obj', ctypes.c_void_p),
+            ('len', ctypes.c_ssize_t),
+            ('itemsize', ctypes.c_ssize_t),
+            ('readonly', ctypes.c_int),
+            ('ndim', ctypes.c_int),
+            ('format', ctypes.c_char_p),
+            ('shape', ctypes.c_void_p),
+            ('strides', ctypes.c_void_p),
+            ('suboffsets', ctypes.c_void_p),
+    ]
+    if sys.version_info < (3, 3):
+        _fields_ += [
+                ('smalltable', ctypes.c_ssize_t * 2),
+        ]
+    _fields_ += [
+            ('internal', ctypes.c_void_p),
+    ]
+
+_buffer_api = []
+
+def buffer_pinning():
+    ''' Whether BufferPin can lock memory in place.
+
+        This needs the CPython C API; elsewhere (e.g. PyPy) BufferPin
+        falls back to holding a private copy.
+    '''
+    if not _buffer_api:
+        api = None
+        if platform.python_implementation() == 'CPython':
+            try:
+                get = ctypes.pythonapi.PyObject_GetBuffer
+                release = ctypes.pythonapi.PyBuffer_Release
+            except AttributeError:
+                pass
+            else:
+                get.restype = ctypes.c_int
+                get.argtypes = [ctypes.py_object, ctypes.POINTER(_Py_buffer), ctypes.c_int]
+                release.restype = None
+                release.argtypes = [ctypes.POINTER(_Py_buffer)]
+                api = (get, release)
+        _buffer_api.append(api)
+    return _buffer_api[0] is not None
+
+class BufferPin(object):
+    ''' Hold the contiguous memory of a buffer-protocol object (bytes,
+        bytearray, mmap, array, memoryview, ...) in place, so that C code
+        can use it without a copy.
+
+        Until release() is called, or the pin is collected, the object is
+        kept alive and cannot be resized.
+
+        If buffer_pinning() is False, the contents are copied instead and
+        the object is not locked.
+    '''
+    __slots__ = ('_view', 'address', 'size')
+
+    def __init__(self, obj):
+        self._view = None
+        if buffer_pinning():
+            view = _Py_buffer()
+            # PyBUF_SIMPLE; raises if obj is not contiguous
+            _buffer_api[0][0](obj, ctypes.byref(view), 0)
+            self._view = view
+            self.address = view.buf or 0
+            self.size = view.len
+            return
+        m = memoryview(obj)
+        if not getattr(m, 'contiguous', True):
+            raise BufferError('buffer is not contiguous')
+        data = m.tobytes()
+        copy = (ctypes.c_char * len(data)).from_buffer_copy(data)
+        self._view = copy
+        self.address = ctypes.addressof(copy)
+        self.size = len(data)
+
+    def release(self):
+        view = self._view
+        if view is not None:
+            self._view = None
+            if isinstance(view, _Py_buffer):
+                _buffer_api[0][1](ctypes.byref(view))
+
+    def __del__(self):
+        self.release()
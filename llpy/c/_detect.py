@@ -30,7 +30,10 @@ import warnings
 import llpy
 from ..compat import unicode
 from ..utils import b2u
-from . import _c, _hardcoded
+from . import _c, _detect_cache, _hardcoded
+
+cache_detection = llpy.__cache_detection
+del llpy.cache_detection
 
 for var in _hardcoded.VARIABLES:
     val = os.getenv(var)
@@ -117,17 +120,28 @@ def which(exe):
             return tmp
     return None
 
-def detect_llvm():
-    llvm = LLVM()
+def probe_config():
+    ''' Ask `llvm-config` everything we need to know.
+
+        This is the slow part of detection, since it spawns subprocesses.
+    '''
+    info = {
+            'version': None,
+            'config': None,
+            'bindir': None,
+            'libdir': None,
+            'host': None,
+            'targets': [],
+    }
     if LLPY_LLVM_VERSION:
-        llvm.version = Version(LLPY_LLVM_VERSION)
-        config = 'llvm-config-%d.%d' % llvm.version.tuple2
+        info['version'] = LLPY_LLVM_VERSION
+        config = 'llvm-config-%d.%d' % Version(LLPY_LLVM_VERSION).tuple2
         try:
             check([config, '--version'])
         except OSError:
-            llvm.config = None
+            pass
         else:
-            llvm.config = config
+            info['config'] = config
     else:
         try:
             v = check(['llvm-config', '--version'])
@@ -138,30 +152,57 @@ def detect_llvm():
                 except OSError:
                     continue
                 else:
-                    llvm.version = Version(v)
-                    llvm.config = 'llvm-config-%d.%d' % llvm.version.tuple2
+                    info['version'] = v
+                    info['config'] = 'llvm-config-%d.%d' % Version(v).tuple2
                     break
-            else:
-                llvm.version = None
-                llvm.config = None
         else:
-            llvm.version = Version(v)
-            llvm.config = 'llvm-config'
-
-    if llvm.config is not None:
-        llvm.bindir = check([llvm.config, '--bindir'])
-        llvm.libdir = check([llvm.config, '--libdir'])
-        llvm.host = check([llvm.config, '--host-target'])
-
-        targets = set(check([llvm.config, '--targets-built']).split())
-        targets -= set(_hardcoded.TARGETS)
-        targets = sorted(targets)
-        if targets:
-            warnings.warn('Unknown targets: %s' % ', '.join(targets))
-    else:
-        llvm.bindir = None
-        llvm.libdir = None
-        llvm.host = None
+            info['version'] = v
+            info['config'] = 'llvm-config'
+
+    config = info['config']
+    if config is not None:
+        info['bindir'] = check([config, '--bindir'])
+        info['libdir'] = check([config, '--libdir'])
+        info['host'] = check([config, '--host-target'])
+        info['targets'] = check([config, '--targets-built']).split()
+    return info
+
+def detect_config():
+    ''' Like probe_config(), but use the on-disk cache if possible.
+    '''
+    env = {'PATH': PATH, 'LLPY_LLVM_VERSION': LLPY_LLVM_VERSION}
+    directory = None
+    if cache_detection:
+        directory = _detect_cache.cache_dir(XDG_CACHE_HOME, HOME)
+    if directory is not None:
+        info = _detect_cache.load(directory, env)
+        if info is not None:
+            return info
+    info = probe_config()
+    if directory is not None:
+        # Anything installed or removed on $PATH changes a directory mtime.
+        paths = PATH.split(os.path.pathsep) if PATH else []
+        if info['config'] is not None:
+            exe = which(info['config'])
+            if exe is not None:
+                paths.append(exe)
+            paths.append(info['libdir'])
+        _detect_cache.store(directory, env, paths, info)
+    return info
+
+def detect_llvm():
+    llvm = LLVM()
+    info = detect_config()
+    llvm.version = Version(info['version']) if info['version'] is not None else None
+    llvm.config = info['config']
+    llvm.bindir = info['bindir']
+    llvm.libdir = info['libdir']
+    llvm.host = info['host']
+    targets = set(info['targets'])
+    targets -= set(_hardcoded.TARGETS)
+    targets = sorted(targets)
+    if targets:
+        warnings.warn('Unknown targets: %s' % ', '.join(targets))
 
     if llvm.libdir is not None:
         # Arguably this *should* be relative to llvm.libdir, but it doesn't
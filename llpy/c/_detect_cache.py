@@ -0,0 +1,102 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+''' On-disk cache of what `llvm-config` said, so that importing llpy
+    does not have to spawn it every time.
+
+    An entry records the relevant environment variables and the mtimes of
+    every file or directory whose change could alter the answer (the
+    directories on $PATH, the `llvm-config` executable, the libdir).
+    It is only used if all of those still match.
+'''
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+SCHEMA = 1
+
+
+def cache_dir(xdg_cache_home, home):
+    if xdg_cache_home:
+        return os.path.join(xdg_cache_home, 'llpy')
+    if home:
+        return os.path.join(home, '.cache', 'llpy')
+    return None
+
+def entry_path(directory, env):
+    key = json.dumps(sorted(env.items())).encode('utf-8')
+    return os.path.join(directory, 'detect-%s.json' % hashlib.sha1(key).hexdigest()[:16])
+
+def mtime(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    try:
+        return st.st_mtime_ns
+    except AttributeError:
+        return st.st_mtime
+
+def load(directory, env):
+    ''' Return the cached result for env, or None if missing or stale.
+    '''
+    try:
+        with open(entry_path(directory, env), 'r') as f:
+            entry = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get('schema') != SCHEMA:
+        return None
+    if entry.get('env') != env:
+        return None
+    for path, stamp in entry['stats']:
+        if mtime(path) != stamp:
+            return None
+    return entry['result']
+
+def store(directory, env, paths, result):
+    ''' Atomically write a cache entry. Failure is silently ignored.
+    '''
+    entry = {
+            'schema': SCHEMA,
+            'env': env,
+            'stats': [[p, mtime(p)] for p in paths],
+            'result': result,
+    }
+    tmp = None
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(prefix='.detect-', suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.rename(tmp, entry_path(directory, env))
+        tmp = None
+    except (IOError, OSError):
+        pass
+    finally:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
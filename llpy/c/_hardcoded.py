@@ -25,6 +25,8 @@ from __future__ import unicode_literals
 VARIABLES = [
         'LLPY_LLVM_VERSION',
         'PATH',
+        'HOME',
+        'XDG_CACHE_HOME',
 ]
 
 TARGETS = [
@@ -37,7 +37,6 @@ ParseBitcode = _library.function(Bool, 'LLVMParseBitcode', [MemoryBuffer, ctypes
 ParseBitcode = untested(ParseBitcode)
 ParseBitcodeInContext = _library.function(Bool, 'LLVMParseBitcodeInContext', [Context, MemoryBuffer, ctypes.POINTER(Module), ctypes.POINTER(_c.string_buffer)])
 GetBitcodeModuleInContext = _library.function(Bool, 'LLVMGetBitcodeModuleInContext', [Context, MemoryBuffer, ctypes.POINTER(Module), ctypes.POINTER(_c.string_buffer)])
-GetBitcodeModuleInContext = untested(GetBitcodeModuleInContext)
 GetBitcodeModule = _library.function(Bool, 'LLVMGetBitcodeModule', [MemoryBuffer, ctypes.POINTER(Module), ctypes.POINTER(_c.string_buffer)])
 GetBitcodeModule = untested(GetBitcodeModule)
 
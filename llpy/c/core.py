@@ -679,9 +679,7 @@ IsNull = _library.function(Bool, 'LLVMIsNull', [Value])
 ConstPointerNull = _library.function(Value, 'LLVMConstPointerNull', [Type])
 
 ConstInt = _library.function(Value, 'LLVMConstInt', [Type, ctypes.c_ulonglong, Bool])
-ConstInt = untested(ConstInt)
 ConstIntOfArbitraryPrecision = _library.function(Value, 'LLVMConstIntOfArbitraryPrecision', [Type, ctypes.c_uint, ctypes.POINTER(ctypes.c_uint64)])
-ConstIntOfArbitraryPrecision = untested(ConstIntOfArbitraryPrecision)
 ConstIntOfString = _library.function(Value, 'LLVMConstIntOfString', [Type, ctypes.c_char_p, ctypes.c_uint8])
 ConstIntOfString = untested(ConstIntOfString)
 ConstIntOfStringAndSize = _library.function(Value, 'LLVMConstIntOfStringAndSize', [Type, ctypes.c_char_p, ctypes.c_uint, ctypes.c_uint8])
@@ -775,7 +773,6 @@ ConstInlineAsm = _library.function(Value, 'LLVMConstInlineAsm', [Type, ctypes.c_
 BlockAddress = _library.function(Value, 'LLVMBlockAddress', [Value, BasicBlock])
 
 GetGlobalParent = _library.function(Module, 'LLVMGetGlobalParent', [Value])
-GetGlobalParent = untested(GetGlobalParent)
 IsDeclaration = _library.function(Bool, 'LLVMIsDeclaration', [Value])
 GetLinkage = _library.function(Linkage, 'LLVMGetLinkage', [Value])
 SetLinkage = _library.function(None, 'LLVMSetLinkage', [Value, Linkage])
@@ -801,7 +798,6 @@ GetLastGlobal = _library.function(Value, 'LLVMGetLastGlobal', [Module])
 GetNextGlobal = _library.function(Value, 'LLVMGetNextGlobal', [Value])
 GetPreviousGlobal = _library.function(Value, 'LLVMGetPreviousGlobal', [Value])
 DeleteGlobal = _library.function(None, 'LLVMDeleteGlobal', [Value])
-DeleteGlobal = untested(DeleteGlobal)
 GetInitializer = _library.function(Value, 'LLVMGetInitializer', [Value])
 SetInitializer = _library.function(None, 'LLVMSetInitializer', [Value, Value])
 IsThreadLocal = _library.function(Bool, 'LLVMIsThreadLocal', [Value])
@@ -817,7 +813,6 @@ if (3, 3) <= _version:
 AddAlias = _library.function(Value, 'LLVMAddAlias', [Module, Type, Value, ctypes.c_char_p])
 
 DeleteFunction = _library.function(None, 'LLVMDeleteFunction', [Value])
-DeleteFunction = untested(DeleteFunction)
 GetIntrinsicID = _library.function(ctypes.c_uint, 'LLVMGetIntrinsicID', [Value])
 GetIntrinsicID = untested(GetIntrinsicID)
 GetFunctionCallConv = _library.function(CallConv, 'LLVMGetFunctionCallConv', [Value])
@@ -884,7 +879,6 @@ InsertBasicBlockInContext = _library.function(BasicBlock, 'LLVMInsertBasicBlockI
 InsertBasicBlock = _library.function(BasicBlock, 'LLVMInsertBasicBlock', [BasicBlock, ctypes.c_char_p])
 InsertBasicBlock = untested(InsertBasicBlock)
 DeleteBasicBlock = _library.function(None, 'LLVMDeleteBasicBlock', [BasicBlock])
-DeleteBasicBlock = untested(DeleteBasicBlock)
 RemoveBasicBlockFromParent = _library.function(None, 'LLVMRemoveBasicBlockFromParent', [BasicBlock])
 RemoveBasicBlockFromParent = untested(RemoveBasicBlockFromParent)
 MoveBasicBlockBefore = _library.function(None, 'LLVMMoveBasicBlockBefore', [BasicBlock, BasicBlock])
@@ -902,7 +896,6 @@ GetInstructionParent = _library.function(BasicBlock, 'LLVMGetInstructionParent',
 GetNextInstruction = _library.function(Value, 'LLVMGetNextInstruction', [Value])
 GetPreviousInstruction = _library.function(Value, 'LLVMGetPreviousInstruction', [Value])
 InstructionEraseFromParent = _library.function(None, 'LLVMInstructionEraseFromParent', [Value])
-InstructionEraseFromParent = untested(InstructionEraseFromParent)
 GetInstructionOpcode = _library.function(Opcode, 'LLVMGetInstructionOpcode', [Value])
 GetICmpPredicate = _library.function(IntPredicate, 'LLVMGetICmpPredicate', [Value])
 
@@ -1109,18 +1102,11 @@ GetGlobalPassRegistry = _library.function(PassRegistry, 'LLVMGetGlobalPassRegist
 GetGlobalPassRegistry = untested(GetGlobalPassRegistry)
 
 CreatePassManager = _library.function(PassManager, 'LLVMCreatePassManager', [])
-CreatePassManager = untested(CreatePassManager)
 CreateFunctionPassManagerForModule = _library.function(PassManager, 'LLVMCreateFunctionPassManagerForModule', [Module])
-CreateFunctionPassManagerForModule = untested(CreateFunctionPassManagerForModule)
 CreateFunctionPassManager = _library.function(PassManager, 'LLVMCreateFunctionPassManager', [ModuleProvider])
 CreateFunctionPassManager = untested(CreateFunctionPassManager)
 RunPassManager = _library.function(Bool, 'LLVMRunPassManager', [PassManager, Module])
-RunPassManager = untested(RunPassManager)
 InitializeFunctionPassManager = _library.function(Bool, 'LLVMInitializeFunctionPassManager', [PassManager])
-InitializeFunctionPassManager = untested(InitializeFunctionPassManager)
 RunFunctionPassManager = _library.function(Bool, 'LLVMRunFunctionPassManager', [PassManager, Value])
-RunFunctionPassManager = untested(RunFunctionPassManager)
 FinalizeFunctionPassManager = _library.function(Bool, 'LLVMFinalizeFunctionPassManager', [PassManager])
-FinalizeFunctionPassManager = untested(FinalizeFunctionPassManager)
 DisposePassManager = _library.function(None, 'LLVMDisposePassManager', [PassManager])
-DisposePassManager = untested(DisposePassManager)
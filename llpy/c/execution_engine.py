@@ -47,7 +47,7 @@ if (3, 3) <= _version:
     class MCJITCompilerOptions(ctypes.Structure):
         _fields_ = [
             ('OptLevel', ctypes.c_uint),
-            ('CodeModel', CodeModel),
+            ('CodeModel', CodeModel._ctype),
             ('NoFramePointerElim', Bool),
             ('EnableFastISel', Bool),
         ]
@@ -70,15 +70,12 @@ if (3, 4) <= _version:
 
 
 LinkInJIT = _library.function(None, 'LLVMLinkInJIT', [])
-LinkInJIT = untested(LinkInJIT)
 # not in the header until 3.3, but in the library in 3.0
 LinkInMCJIT = _library.function(None, 'LLVMLinkInMCJIT', [])
-LinkInMCJIT = untested(LinkInMCJIT)
 LinkInInterpreter = _library.function(None, 'LLVMLinkInInterpreter', [])
 LinkInInterpreter = untested(LinkInInterpreter)
 
 CreateGenericValueOfInt = _library.function(GenericValue, 'LLVMCreateGenericValueOfInt', [Type, ctypes.c_ulonglong, Bool])
-CreateGenericValueOfInt = untested(CreateGenericValueOfInt)
 CreateGenericValueOfPointer = _library.function(GenericValue, 'LLVMCreateGenericValueOfPointer', [ctypes.c_void_p])
 CreateGenericValueOfPointer = untested(CreateGenericValueOfPointer)
 CreateGenericValueOfFloat = _library.function(GenericValue, 'LLVMCreateGenericValueOfFloat', [Type, ctypes.c_double])
@@ -86,16 +83,13 @@ CreateGenericValueOfFloat = untested(CreateGenericValueOfFloat)
 GenericValueIntWidth = _library.function(ctypes.c_uint, 'LLVMGenericValueIntWidth', [GenericValue])
 GenericValueIntWidth = untested(GenericValueIntWidth)
 GenericValueToInt = _library.function(ctypes.c_ulonglong, 'LLVMGenericValueToInt', [GenericValue, Bool])
-GenericValueToInt = untested(GenericValueToInt)
 GenericValueToPointer = _library.function(ctypes.c_void_p, 'LLVMGenericValueToPointer', [GenericValue])
 GenericValueToPointer = untested(GenericValueToPointer)
 GenericValueToFloat = _library.function(ctypes.c_double, 'LLVMGenericValueToFloat', [Type, GenericValue])
 GenericValueToFloat = untested(GenericValueToFloat)
 DisposeGenericValue = _library.function(None, 'LLVMDisposeGenericValue', [GenericValue])
-DisposeGenericValue = untested(DisposeGenericValue)
 
 CreateExecutionEngineForModule = _library.function(Bool, 'LLVMCreateExecutionEngineForModule', [ctypes.POINTER(ExecutionEngine), Module, ctypes.POINTER(_c.string_buffer)])
-CreateExecutionEngineForModule = untested(CreateExecutionEngineForModule)
 CreateInterpreterForModule = _library.function(Bool, 'LLVMCreateInterpreterForModule', [ctypes.POINTER(ExecutionEngine), Module, ctypes.POINTER(_c.string_buffer)])
 CreateInterpreterForModule = untested(CreateInterpreterForModule)
 CreateJITCompilerForModule = _library.function(Bool, 'LLVMCreateJITCompilerForModule', [ctypes.POINTER(ExecutionEngine), Module, ctypes.c_uint, ctypes.POINTER(_c.string_buffer)])
@@ -114,7 +108,6 @@ CreateInterpreter = untested(CreateInterpreter)
 CreateJITCompiler = _library.function(Bool, 'LLVMCreateJITCompiler', [ctypes.POINTER(ExecutionEngine), ModuleProvider, ctypes.c_uint, ctypes.POINTER(_c.string_buffer)])
 CreateJITCompiler = untested(CreateJITCompiler)
 DisposeExecutionEngine = _library.function(None, 'LLVMDisposeExecutionEngine', [ExecutionEngine])
-DisposeExecutionEngine = untested(DisposeExecutionEngine)
 RunStaticConstructors = _library.function(None, 'LLVMRunStaticConstructors', [ExecutionEngine])
 RunStaticConstructors = untested(RunStaticConstructors)
 RunStaticDestructors = _library.function(None, 'LLVMRunStaticDestructors', [ExecutionEngine])
@@ -123,7 +116,6 @@ RunFunctionAsMain = _library.function(ctypes.c_int, 'LLVMRunFunctionAsMain', [Ex
 RunFunctionAsMain = untested(RunFunctionAsMain)
 
 RunFunction = _library.function(GenericValue, 'LLVMRunFunction', [ExecutionEngine, Value, ctypes.c_uint, ctypes.POINTER(GenericValue)])
-RunFunction = untested(RunFunction)
 FreeMachineCodeForFunction = _library.function(None, 'LLVMFreeMachineCodeForFunction', [ExecutionEngine, Value])
 FreeMachineCodeForFunction = untested(FreeMachineCodeForFunction)
 AddModule = _library.function(None, 'LLVMAddModule', [ExecutionEngine, Module])
@@ -139,14 +131,12 @@ FindFunction = untested(FindFunction)
 RecompileAndRelinkFunction = _library.function(ctypes.c_void_p, 'LLVMRecompileAndRelinkFunction', [ExecutionEngine, Value])
 RecompileAndRelinkFunction = untested(RecompileAndRelinkFunction)
 GetExecutionEngineTargetData = _library.function(TargetData, 'LLVMGetExecutionEngineTargetData', [ExecutionEngine])
-GetExecutionEngineTargetData = untested(GetExecutionEngineTargetData)
 if (3, 5) <= _version:
     GetExecutionEngineTargetMachine = _library.function(TargetMachine, 'LLVMGetExecutionEngineTargetMachine', [ExecutionEngine])
     GetExecutionEngineTargetMachine = untested(GetExecutionEngineTargetMachine)
 AddGlobalMapping = _library.function(None, 'LLVMAddGlobalMapping', [ExecutionEngine, Value, ctypes.c_void_p])
 AddGlobalMapping = untested(AddGlobalMapping)
 GetPointerToGlobal = _library.function(ctypes.c_void_p, 'LLVMGetPointerToGlobal', [ExecutionEngine, Value])
-GetPointerToGlobal = untested(GetPointerToGlobal)
 
 if (3, 4) <= _version:
     CreateSimpleMCJITMemoryManager = _library.function(MCJITMemoryManager, 'LLVMCreateSimpleMCJITMemoryManager', [ctypes.c_void_p, MemoryManagerAllocateCodeSectionCallback, MemoryManagerAllocateDataSectionCallback, MemoryManagerFinalizeMemoryCallback, MemoryManagerDestroyCallback])
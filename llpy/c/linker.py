@@ -39,4 +39,3 @@ if (3, 2) <= _version:
 
 if (3, 2) <= _version:
     LinkModules = _library.function(Bool, 'LLVMLinkModules', [Module, Module, LinkerMode, ctypes.POINTER(_c.string_buffer)])
-    LinkModules = untested(LinkModules)
@@ -94,7 +94,7 @@ lto_codegen_diagnostic_severity = _c.enum('lto_codegen_diagnostic_severity',
     LTO_DS_NOTE     = 2,
 )
 if (3, 5) <= _version:
-    lto_diagnostic_handler = ctypes.CFUNCTYPE(None, *[lto_codegen_diagnostic_severity, ctypes.c_char_p, ctypes.c_void_p])
+    lto_diagnostic_handler = ctypes.CFUNCTYPE(None, *[lto_codegen_diagnostic_severity._ctype, ctypes.c_char_p, ctypes.c_void_p])
 
 
 lto_get_version = _library.function(ctypes.c_char_p, 'lto_get_version', [])
@@ -64,11 +64,11 @@ def add_target(target):
         return
     try:
         name = 'Initialize%sTargetInfo' % target
-        globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+        globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
         name = 'Initialize%sTarget' % target
-        globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+        globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
         name = 'Initialize%sTargetMC' % target
-        globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+        globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
         ALL_TARGETS.add(target)
     except AttributeError:
         return
@@ -76,21 +76,21 @@ def add_target(target):
     if (3, 1) <= _version:
         try:
             name = 'Initialize%sAsmPrinter' % target
-            globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+            globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
             ALL_ASM_PRINTERS.add(target)
         except AttributeError:
             pass
 
         try:
             name = 'Initialize%sAsmParser' % target
-            globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+            globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
             ALL_ASM_PARSERS.add(target)
         except AttributeError:
             pass
 
         try:
             name = 'Initialize%sDisassembler' % target
-            globals()[name] = _library.function(None, 'LLVM%s' % name, [])
+            globals()[name] = _library.function(None, 'LLVM%s' % name, [], lazy=False)
             ALL_DISASSEMBLERS.add(target)
         except AttributeError:
             pass
@@ -169,9 +169,9 @@ else:
 def InitializeNativeTarget():
     if _native is not None:
         if _native in ALL_TARGETS:
-            globals()['Initialize%sTargetInfo' % native]()
-            globals()['Initialize%sTarget' % native]()
-            globals()['Initialize%sMC' % native]()
+            globals()['Initialize%sTargetInfo' % _native]()
+            globals()['Initialize%sTarget' % _native]()
+            globals()['Initialize%sTargetMC' % _native]()
             return 0
         else:
             warnings.warn('Native target known but not found (???)')
@@ -247,7 +247,6 @@ if (3, 4) <= _version:
 
 CreateTargetData = _library.function(TargetData, 'LLVMCreateTargetData', [ctypes.c_char_p])
 AddTargetData = _library.function(None, 'LLVMAddTargetData', [TargetData, PassManager])
-AddTargetData = untested(AddTargetData)
 AddTargetLibraryInfo = _library.function(None, 'LLVMAddTargetLibraryInfo', [TargetLibraryInfo, PassManager])
 AddTargetLibraryInfo = untested(AddTargetLibraryInfo)
 CopyStringRepOfTargetData = _library.function(_c.string_buffer, 'LLVMCopyStringRepOfTargetData', [TargetData])
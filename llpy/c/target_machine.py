@@ -84,7 +84,6 @@ if (3, 4) <= _version:
     GetTargetFromName = _library.function(Target, 'LLVMGetTargetFromName', [ctypes.c_char_p])
     GetTargetFromName = untested(GetTargetFromName)
     GetTargetFromTriple = _library.function(Bool, 'LLVMGetTargetFromTriple', [ctypes.c_char_p, ctypes.POINTER(Target), ctypes.POINTER(_c.string_buffer)])
-    GetTargetFromTriple = untested(GetTargetFromTriple)
 
 if (3, 1) <= _version:
     GetTargetName = _library.function(ctypes.c_char_p, 'LLVMGetTargetName', [Target])
@@ -99,9 +98,7 @@ if (3, 1) <= _version:
     TargetHasAsmBackend = untested(TargetHasAsmBackend)
 
     CreateTargetMachine = _library.function(TargetMachine, 'LLVMCreateTargetMachine', [Target, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, CodeGenOptLevel, RelocMode, CodeModel])
-    CreateTargetMachine = untested(CreateTargetMachine)
     DisposeTargetMachine = _library.function(None, 'LLVMDisposeTargetMachine', [TargetMachine])
-    DisposeTargetMachine = untested(DisposeTargetMachine)
     GetTargetMachineTarget = _library.function(Target, 'LLVMGetTargetMachineTarget', [TargetMachine])
     GetTargetMachineTarget = untested(GetTargetMachineTarget)
     GetTargetMachineTriple = _library.function(_c.string_buffer, 'LLVMGetTargetMachineTriple', [TargetMachine])
@@ -120,11 +117,9 @@ if (3, 1) <= _version:
     TargetMachineEmitToFile = untested(TargetMachineEmitToFile)
 if (3, 3) <= _version:
     TargetMachineEmitToMemoryBuffer = _library.function(Bool, 'LLVMTargetMachineEmitToMemoryBuffer', [TargetMachine, Module, CodeGenFileType, ctypes.POINTER(_c.string_buffer), ctypes.POINTER(MemoryBuffer)])
-    TargetMachineEmitToMemoryBuffer = untested(TargetMachineEmitToMemoryBuffer)
 
 if (3, 4) <= _version:
     GetDefaultTargetTriple = _library.function(_c.string_buffer, 'LLVMGetDefaultTargetTriple', [])
-    GetDefaultTargetTriple = untested(GetDefaultTargetTriple)
 if (3, 5) <= _version:
     AddAnalysisPasses = _library.function(None, 'LLVMAddAnalysisPasses', [TargetMachine, PassManager])
     AddAnalysisPasses = untested(AddAnalysisPasses)
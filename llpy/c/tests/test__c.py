@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import ctypes
+import ctypes.util
 import unittest
 
 from llpy.c import _c
@@ -87,6 +89,123 @@ class TestEnum(unittest.TestCase):
         assert Signed(2 ** 31).value < 0
         assert Unsigned(2 ** 31).value > 0
 
+    def test_int(self):
+        Seq = _c.enum('Seq', FOO=1, BAR=2)
+        Bit = _c.bit_enum('Bit', FOO=1, BAR=2)
+        assert isinstance(Seq.FOO, int)
+        assert Seq.FOO == 1
+        assert Seq.FOO.value == 1
+        assert {Seq.BAR: 'bar'}[2] == 'bar'
+        assert repr(Bit.FOO | 2) == 'Bit.FOO | Bit.BAR'
+        assert repr(2 | Bit.FOO) == 'Bit.FOO | Bit.BAR'
+        assert isinstance(Bit.FOO & 3, Bit)
+
+    def test_foreign(self):
+        Seq = _c.enum('Seq', FOO=1, BAR=2)
+        Unsigned = _c.bit_enum('Unsigned', MAX=2**31)
+        abs_seq = libc.function(Seq, 'abs', [Seq], lazy=False)
+        assert repr(abs_seq) == '<Seq abs(c_int)>'
+        assert abs_seq(Seq(-2)) == Seq.BAR
+        assert isinstance(abs_seq(-1), Seq)
+        # instances are cached
+        assert abs_seq(-1) is abs_seq(1)
+        abs_unsigned = libc.function(Unsigned, 'abs', [Unsigned], lazy=False)
+        assert abs_unsigned(Unsigned.MAX) == Unsigned.MAX
+        assert isinstance(abs_unsigned(Unsigned.MAX), Unsigned)
+
+
+class TestHandle(unittest.TestCase):
+
+    def test_pointer_value(self):
+        Foo = _c.opaque('Foo')
+        a = ctypes.cast(0x1234, Foo)
+        b = ctypes.cast(0x1234, Foo)
+        assert _c.pointer_value(a) == 0x1234
+        assert _c.pointer_same(a, b)
+        assert _c.is_handle(a, Foo)
+        assert not _c.is_handle(object(), Foo)
+
+class TestBufferPin(unittest.TestCase):
+
+    @unittest.skipUnless(_c.buffer_pinning(), 'needs the CPython C API')
+    def test_pin(self):
+        data = bytearray(b'abc')
+        arr = (ctypes.c_char * 3).from_buffer(data)
+        address = ctypes.addressof(arr)
+        del arr
+        pin = _c.BufferPin(data)
+        assert pin.size == 3
+        assert pin.address == address
+        assert ctypes.string_at(pin.address, pin.size) == b'abc'
+        # the struct filled in by the C API must be the right size
+        assert pin._view.len == 3
+        assert pin._view.buf == address
+        with self.assertRaises(BufferError):
+            data.append(0)
+        pin.release()
+        pin.release()
+        data.append(0)
+
+    def test_bad(self):
+        with self.assertRaises(TypeError):
+            _c.BufferPin(1)
+        with self.assertRaises(BufferError):
+            _c.BufferPin(memoryview(b'abcd')[::2])
+
+    def test_copy(self):
+        saved = _c._buffer_api[:]
+        _c._buffer_api[:] = [None]
+        try:
+            assert not _c.buffer_pinning()
+            data = bytearray(b'abc')
+            pin = _c.BufferPin(data)
+            assert pin.size == 3
+            assert ctypes.string_at(pin.address, pin.size) == b'abc'
+            data.append(0)
+            assert ctypes.string_at(pin.address, pin.size) == b'abc'
+            pin.release()
+            with self.assertRaises(TypeError):
+                _c.BufferPin(1)
+        finally:
+            _c._buffer_api[:] = saved
+
+
+
+libc = _c.Library(ctypes.util.find_library('c'))
+
+class TestLibrary(unittest.TestCase):
+
+    def test_eager(self):
+        labs = libc.function(ctypes.c_long, 'labs', [ctypes.c_long], lazy=False)
+        assert labs(-3) == 3
+        assert labs.__name__ == 'labs'
+        assert labs.__module__ == __name__
+        assert labs._filename == __file__
+        assert repr(labs) == '<c_long labs(c_long)>'
+        with self.assertRaises(AttributeError):
+            libc.function(None, 'llpy_no_such_function', [], lazy=False)
+
+    def test_lazy(self):
+        ns = dict(globals(), __name__='lazy_test')
+        exec('labs = libc.function(ctypes.c_long, "labs", [ctypes.c_long], lazy=True)\n'
+                'alias = labs', ns)
+        stub = ns['labs']
+        assert isinstance(stub, _c.LazyFunction)
+        assert stub.__name__ == 'labs'
+        assert repr(stub) == '<c_long labs(c_long)>'
+        assert stub(-4) == 4
+        assert not isinstance(ns['labs'], _c.LazyFunction)
+        assert not isinstance(ns['alias'], _c.LazyFunction)
+        assert ns['labs'].__module__ == 'lazy_test'
+        assert ns['labs'](-5) == 5
+        # old references keep working
+        assert stub(-6) == 6
+
+    def test_lazy_missing(self):
+        stub = libc.function(None, 'llpy_no_such_function', [], lazy=True)
+        with self.assertRaises(AttributeError):
+            stub()
+
 
 if __name__ == '__main__':
     unittest.main()
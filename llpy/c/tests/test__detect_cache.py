@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import tempfile
+import unittest
+
+from llpy.c import _detect_cache
+
+
+class TestDetectCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.tool = os.path.join(self.dir, 'llvm-config')
+        with open(self.tool, 'w') as f:
+            f.write('#!/bin/sh\n')
+        self.env = {'PATH': self.dir, 'LLPY_LLVM_VERSION': None}
+        self.cache_root = tempfile.mkdtemp()
+        self.cache = os.path.join(self.cache_root, 'llpy')
+        self.result = {'version': '3.4', 'config': 'llvm-config', 'targets': ['X86']}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        shutil.rmtree(self.cache_root)
+
+    def test_cache_dir(self):
+        assert _detect_cache.cache_dir('/xdg', '/home/me') == '/xdg/llpy'
+        assert _detect_cache.cache_dir(None, '/home/me') == '/home/me/.cache/llpy'
+        assert _detect_cache.cache_dir(None, None) is None
+
+    def test_roundtrip(self):
+        assert _detect_cache.load(self.cache, self.env) is None
+        _detect_cache.store(self.cache, self.env, [self.dir, self.tool], self.result)
+        assert _detect_cache.load(self.cache, self.env) == self.result
+        assert [f for f in os.listdir(self.cache) if f.endswith('.tmp')] == []
+
+    def test_env_change(self):
+        _detect_cache.store(self.cache, self.env, [self.tool], self.result)
+        env = dict(self.env, LLPY_LLVM_VERSION='3.3')
+        assert _detect_cache.load(self.cache, env) is None
+        env = dict(self.env, PATH='/nonexistent')
+        assert _detect_cache.load(self.cache, env) is None
+
+    def test_mtime_change(self):
+        _detect_cache.store(self.cache, self.env, [self.tool], self.result)
+        st = os.stat(self.tool)
+        os.utime(self.tool, (st.st_atime, st.st_mtime + 10))
+        assert _detect_cache.load(self.cache, self.env) is None
+
+    def test_removed(self):
+        _detect_cache.store(self.cache, self.env, [self.tool], self.result)
+        os.unlink(self.tool)
+        assert _detect_cache.load(self.cache, self.env) is None
+
+    def test_corrupt(self):
+        _detect_cache.store(self.cache, self.env, [self.tool], self.result)
+        with open(_detect_cache.entry_path(self.cache, self.env), 'w') as f:
+            f.write('{')
+        assert _detect_cache.load(self.cache, self.env) is None
+
+    def test_unwritable(self):
+        # must not raise
+        _detect_cache.store(os.path.join(self.tool, 'sub'), self.env, [], self.result)
+
+
+if __name__ == '__main__':
+    unittest.main()
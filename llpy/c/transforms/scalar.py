@@ -32,7 +32,6 @@ from ...utils import cuntested as untested
 AddAggressiveDCEPass = _library.function(None, 'LLVMAddAggressiveDCEPass', [PassManager])
 AddAggressiveDCEPass = untested(AddAggressiveDCEPass)
 AddCFGSimplificationPass = _library.function(None, 'LLVMAddCFGSimplificationPass', [PassManager])
-AddCFGSimplificationPass = untested(AddCFGSimplificationPass)
 AddDeadStoreEliminationPass = _library.function(None, 'LLVMAddDeadStoreEliminationPass', [PassManager])
 AddDeadStoreEliminationPass = untested(AddDeadStoreEliminationPass)
 if (3, 5) <= _version:
@@ -0,0 +1,192 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' A content-addressed, size-bounded, on-disk cache of compiler output.
+
+    Entries are keyed by a hash of the input bitcode, together with
+    everything else that affects the output (the pass pipeline, the
+    TargetMachine, and the LLVM version), so a hit is always safe to use.
+
+    Every write is the atomic rename of a complete temporary file, so any
+    number of processes may share a directory. Eviction is least recently
+    used, going by file mtimes, which reads refresh.
+'''
+
+import hashlib
+import os
+import tempfile
+
+from llpy import io as _io
+from llpy.core import (
+        Module,
+        _version,
+)
+from llpy.utils import u2b
+
+
+class CompileCache(object):
+    ''' Optimized bitcode and object code, stored below directory, which
+        is kept to at most about max_size bytes.
+
+        Needs LLVM 3.3, for MemoryBuffers over bytes.
+    '''
+    __slots__ = ('directory', 'max_size', '_size')
+
+    def __init__(self, directory, max_size=1 << 30):
+        assert (3, 3) <= _version
+        self.directory = directory
+        self.max_size = max_size
+        self._size = None
+
+    def key(self, *parts):
+        ''' Hash parts (bytes or text) into a key.
+        '''
+        h = hashlib.sha256(u2b(repr(_version)))
+        for part in parts:
+            if not isinstance(part, bytes):
+                part = u2b(part)
+            h.update(u2b('%d:' % len(part)))
+            h.update(part)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        ''' Return the data stored under key, or None.
+        '''
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        ''' Atomically store data under key, evicting old entries if the
+            cache grows too big. Failure is silently ignored.
+        '''
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        tmp = None
+        try:
+            if not os.path.isdir(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:
+                    # maybe another process got there first
+                    if not os.path.isdir(directory):
+                        raise
+            fd, tmp = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.rename(tmp, path)
+            tmp = None
+        except (IOError, OSError):
+            return
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def _entries(self):
+        rv = []
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                rv.append((st.st_mtime, st.st_size, path))
+        return rv
+
+    def size(self):
+        ''' Return the total size of all entries, in bytes.
+        '''
+        return sum(size for mtime, size, path in self._entries())
+
+    def evict(self, target=None):
+        ''' Delete the least recently used entries, until the cache holds
+            at most target bytes (by default, three quarters of max_size).
+        '''
+        if target is None:
+            target = self.max_size * 3 // 4
+        entries = sorted(self._entries())
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # another process evicted it
+                pass
+            total -= size
+        self._size = total
+
+    def optimize(self, module, pass_manager):
+        ''' Run a ModulePassManager on module, unless the result of an
+            identical run is already cached.
+
+            Return the optimized module: on a miss, that is module itself;
+            on a hit, a new Module in the same Context, and module is left
+            alone.
+        '''
+        assert isinstance(module, Module)
+        key = self.key('optimize', _io.WriteBitcodeToBytes(module), pass_manager.Fingerprint())
+        data = self.get(key)
+        if data is not None:
+            return _io.ParseBitcode(module._context, _io.MemoryBuffer('', data, copy=False))
+        pass_manager.run(module)
+        self.put(key, _io.WriteBitcodeToBytes(module))
+        return module
+
+    def emit(self, machine, module, codegen, pass_manager=None):
+        ''' Return the code a TargetMachine generates for module, as bytes,
+            after running pass_manager on it if given.
+
+            On a hit, neither the optimization nor the code generation
+            happens, and module is left alone.
+        '''
+        assert isinstance(module, Module)
+        fingerprint = pass_manager.Fingerprint() if pass_manager is not None else ''
+        key = self.key('emit', _io.WriteBitcodeToBytes(module), fingerprint,
+                machine.Fingerprint(), '%d' % codegen)
+        data = self.get(key)
+        if data is None:
+            if pass_manager is not None:
+                pass_manager.run(module)
+            data = machine.EmitToMemoryBuffer(module, codegen).Get()
+            self.put(key, data)
+        return data
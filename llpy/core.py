@@ -24,10 +24,12 @@
 from __future__ import unicode_literals
 
 import ctypes # some wrappers need to know
+import struct
+import sys
 import weakref
 
-from llpy.compat import unicode, is_int
-from llpy.utils import u2b, b2u, deprecated, untested, dangerous
+from llpy.compat import is_int
+from llpy.utils import u2b, b2u, name2b, deprecated, untested, dangerous, strip_asserts
 from llpy.c import (
         _c,
         core as _core,
@@ -64,6 +66,14 @@ from llpy.c.analysis import (
         VerifierFailureAction,
 )
 from llpy import __unknown_values as unknown_values
+from llpy import __validation_level as validation_level
+import llpy
+del llpy.validation_level
+
+# These cost two C calls for every Value that is wrapped.
+check_value_classes = validation_level == 'full'
+# Argument checks on the hottest paths; see the end of this file.
+check_arguments = validation_level != 'none'
 
 
 if (3, 5) <= _version:
@@ -101,7 +111,7 @@ class Context(object):
         exist simultaneously. A single context is not thread safe. However,
         different contexts can execute on different threads simultaneously.
     '''
-    __slots__ = ('_raw', 'type_cache', 'value_cache')
+    __slots__ = ('_raw', 'type_cache', 'value_cache', 'cfg_cache', 'ctypes_cache')
     if (3, 5) <= _version:
         __slots__ += ('_c_diagnostic_handler', '_c_yield_callback')
 
@@ -111,6 +121,10 @@ class Context(object):
         self._raw = _core.ContextCreate()
         self.type_cache = weakref.WeakValueDictionary()
         self.value_cache = weakref.WeakValueDictionary()
+        # see llpy.analysis.get_cfg; cleared whenever a CFG might change
+        self.cfg_cache = {}
+        # see Type.ctypes_type; types are never freed before the context
+        self.ctypes_cache = {}
         if (3, 5) <= _version:
             self._c_diagnostic_handler = None
             self._c_yield_callback = None
@@ -123,7 +137,7 @@ class Context(object):
         _core.ContextDispose(self._raw)
 
     def GetMDKindID(self, name):
-        bname = u2b(name)
+        bname = name2b(name)
         return _core.GetMDKindIDInContext(self._raw, bname, len(bname))
 
     def ConstString(self, value, dont_null_terminate=False):
@@ -174,21 +188,72 @@ class Module(object):
         module is effectively a translation unit or a collection of
         translation units merged together.
     '''
-    __slots__ = ('_raw', '_context')
+    __slots__ = ('_raw', '_context', '_symbols', '_keepalive')
 
     def __init__(self, context, name):
         ''' Create a new, empty module in a specific context.
         '''
         assert isinstance(context, Context)
-        bname = u2b(name)
+        bname = name2b(name)
         self._raw = _core.ModuleCreateWithNameInContext(bname, context._raw)
         self._context = context
+        self._symbols = None
+        self._keepalive = None
 
     def __del__(self):
         ''' Destroy a module instance.
         '''
+        if self._symbols is not None:
+            self.DisableSymbolIndex()
+        fpm = _materializers.pop(_c.pointer_value(self._raw), None)
+        if fpm is not None:
+            _core.FinalizeFunctionPassManager(fpm)
+            _core.DisposePassManager(fpm)
         _core.DisposeModule(self._raw)
 
+    def MaterializeAll(self):
+        ''' Load the bodies of all functions of a lazily loaded module.
+
+            See llpy.io.GetBitcodeModule.
+        '''
+        fpm = _materializers.get(_c.pointer_value(self._raw))
+        if fpm is None:
+            return
+        self._context.cfg_cache.clear()
+        raw = _core.GetFirstFunction(self._raw)
+        while raw:
+            if _core.IsDeclaration(raw):
+                _core.RunFunctionPassManager(fpm, raw)
+            raw = _core.GetNextFunction(raw)
+
+    def EnableSymbolIndex(self):
+        ''' Keep a python-side index of the functions, global variables
+            and types in a module by name, so that GetNamedFunction,
+            GetNamedGlobal and GetTypeByName become dict lookups.
+
+            The index is kept up to date by the wrappers that add, rename
+            and delete globals, and by module pass managers. Lookups that
+            miss still ask LLVM, so globals added behind its back are
+            picked up. Call RebuildSymbolIndex after deleting globals
+            through anything else.
+        '''
+        if self._symbols is None:
+            self._symbols = _SymbolIndex(self)
+            _symbol_indexes[_c.pointer_value(self._raw)] = self._symbols
+
+    def DisableSymbolIndex(self):
+        ''' Drop the index created by EnableSymbolIndex.
+        '''
+        if self._symbols is not None:
+            del _symbol_indexes[_c.pointer_value(self._raw)]
+            self._symbols = None
+
+    def RebuildSymbolIndex(self):
+        ''' Recreate the index created by EnableSymbolIndex from scratch.
+        '''
+        self.DisableSymbolIndex()
+        self.EnableSymbolIndex()
+
     def GetDataLayout(self):
         ''' Obtain the data layout for a module.
         '''
@@ -234,15 +299,26 @@ class Module(object):
     def GetTypeByName(self, name):
         ''' Obtain a Type from a module by its registered name.
         '''
-        rawtype = _core.GetTypeByName(self._raw, u2b(name))
-        return Type(rawtype, self._context)
+        symbols = self._symbols
+        if symbols is not None:
+            name = _symbol_key(name)
+            ty = symbols.types.get(name)
+            if ty is not None:
+                return ty
+        rawtype = _core.GetTypeByName(self._raw, name2b(name))
+        ty = Type(rawtype, self._context)
+        # types are never renamed or deleted, but may be created at any
+        # time, so only hits can be remembered
+        if ty is not None and symbols is not None:
+            symbols.types[name] = ty
+        return ty
 
     def GetNamedMetadataOperands(self, name):
         ''' Obtain the named metadata operands for a module.
 
             Return a list of Value instances that stand for llvm::MDNode.
         '''
-        bname = u2b(name)
+        bname = name2b(name)
         num = _core.GetNamedMetadataNumOperands(self._raw, bname)
         if not num:
             return []
@@ -255,7 +331,7 @@ class Module(object):
             ''' Add an MDNOde operand to named metadata.
             '''
             assert isinstance(val, MDNode)
-            bname = u2b(name)
+            bname = name2b(name)
             _core.AddNamedMetadataOperand(self._raw, bname, val._raw)
 
 
@@ -263,12 +339,25 @@ class Module(object):
         ''' Add a function to a module under a specified name.
         '''
         assert isinstance(ftype, FunctionType)
-        return Value(_core.AddFunction(self._raw, u2b(name), ftype._raw), self._context)
+        rv = Value(_core.AddFunction(self._raw, name2b(name), ftype._raw), self._context)
+        if self._symbols is not None:
+            self._symbols.add(rv)
+        return rv
 
     def GetNamedFunction(self, name):
         ''' Obtain a Function value from a Module by its name.
         '''
-        return Value(_core.GetNamedFunction(self._raw, u2b(name)), self._context)
+        symbols = self._symbols
+        if symbols is not None:
+            name = _symbol_key(name)
+            try:
+                return symbols.functions[name]
+            except KeyError:
+                pass
+        rv = Value(_core.GetNamedFunction(self._raw, name2b(name)), self._context)
+        if rv is not None and symbols is not None:
+            symbols.functions[name] = rv
+        return rv
 
     def GetFirstFunction(self):
         ''' Obtain an iterator to the first Function in a Module.
@@ -281,13 +370,33 @@ class Module(object):
         return Value(_core.GetLastFunction(self._raw), self._context)
     # see class Function for next/prev
 
+    def Functions(self, bulk=False):
+        ''' Obtain a lazy view of the Functions in a Module.
+
+            See IRList.
+        '''
+        return FunctionList(self._raw, self._context, bulk)
+
     def AddGlobal(self, ty, name='', address_space=0):
         assert isinstance(ty, Type)
         assert is_int(address_space)
-        return Value(_core.AddGlobalInAddressSpace(self._raw, ty._raw, u2b(name), address_space), self._context)
+        rv = Value(_core.AddGlobalInAddressSpace(self._raw, ty._raw, name2b(name), address_space), self._context)
+        if self._symbols is not None:
+            self._symbols.add(rv)
+        return rv
 
     def GetNamedGlobal(self, name):
-        return Value(_core.GetNamedGlobal(self._raw, u2b(name)), self._context)
+        symbols = self._symbols
+        if symbols is not None:
+            name = _symbol_key(name)
+            try:
+                return symbols.globals[name]
+            except KeyError:
+                pass
+        rv = Value(_core.GetNamedGlobal(self._raw, name2b(name)), self._context)
+        if rv is not None and symbols is not None:
+            symbols.globals[name] = rv
+        return rv
 
     def GetFirstGlobal(self):
         return Value(_core.GetFirstGlobal(self._raw), self._context)
@@ -296,11 +405,21 @@ class Module(object):
         return Value(_core.GetLastGlobal(self._raw), self._context)
     # see class GlobalVariable for next/prev
 
+    def Globals(self, bulk=False):
+        ''' Obtain a lazy view of the GlobalVariables in a Module.
+
+            See IRList.
+        '''
+        return GlobalList(self._raw, self._context, bulk)
+
     def AddAlias(self, val, name):
         ty = val.TypeOf()
         assert isinstance(ty, PointerType)
         assert isinstance(val, Constant) # not GlobalObject, LLVM bug
-        return Value(_core.AddAlias(self._raw, ty._raw, val._raw, u2b(name)), self._context)
+        rv = Value(_core.AddAlias(self._raw, ty._raw, val._raw, name2b(name)), self._context)
+        if self._symbols is not None:
+            self._symbols.add(rv)
+        return rv
 
     # from Analysis.h
     def Verify(self, action=VerifierFailureAction.ReturnStatus):
@@ -352,7 +471,7 @@ class Type(object):
             It will always return the same object as long as it exists,
             which will actually be an instance of a subclass.
         '''
-        assert isinstance(raw, _core.Type)
+        assert _c.is_handle(raw, _core.Type)
         assert isinstance(context, Context)
         assert cls == Type # subclasses must override it
         if not raw:
@@ -422,6 +541,41 @@ class Type(object):
         assert self.IsSized()
         return Value(_core.SizeOf(self._raw), self._context)
 
+    def ctypes_type(self, target_data=None):
+        ''' Obtain the ctypes type with the same representation as this type.
+
+            i1, i8, i16, i32 and i64 become c_bool and the signed c_intN,
+            float and double become c_float and c_double, void becomes None,
+            arrays become ctypes arrays, and non-variadic functions become
+            a CFUNCTYPE prototype. Pointers become a POINTER to their
+            element, except that pointers to functions become the
+            prototype itself and pointers to anything else without an
+            equivalent become c_void_p.
+
+            Structs become ctypes.Structure subclasses with fields named
+            f0, f1, ... Without target_data, the host's C layout rules
+            apply (packed structs get _pack_ = 1). Given a TargetData,
+            each field is placed at the offset it reports, with explicit
+            padding, so the layout matches what the target emits.
+
+            The result is cached per context. Raises TypeError if there
+            is no ctypes equivalent.
+        '''
+        layout = None
+        if target_data is not None:
+            layout = target_data.StringRep()
+        key = (_c.pointer_value(self._raw), layout)
+        cache = self._context.ctypes_cache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        rv = cache[key] = self._ctypes_type(target_data, key)
+        return rv
+
+    def _ctypes_type(self, target_data, key):
+        raise TypeError('no ctypes equivalent for %s' % self)
+
     if (3, 4) <= _version:
         def Dump(self):
             _core.DumpType(self._raw)
@@ -432,7 +586,7 @@ class Type(object):
             return s
 
 class IntegerType(Type):
-    __slots__ = ()
+    __slots__ = ('_width',)
 
     def __new__(cls, context, bits):
         ''' Obtain an integer type from a context with specified bit width.
@@ -449,7 +603,11 @@ class IntegerType(Type):
         return 'i%d' % (self.GetIntTypeWidth())
 
     def GetIntTypeWidth(self):
-        return _core.GetIntTypeWidth(self._raw)
+        try:
+            return self._width
+        except AttributeError:
+            width = self._width = _core.GetIntTypeWidth(self._raw)
+            return width
 
     def ConstAllOnes(self):
         ''' Obtain a constant value referring to the instance of a type
@@ -457,15 +615,36 @@ class IntegerType(Type):
         '''
         return Value(_core.ConstAllOnes(self._raw), self._context)
 
+    def _ctypes_type(self, target_data, key):
+        try:
+            return _ctypes_ints[self.GetIntTypeWidth()]
+        except KeyError:
+            return Type._ctypes_type(self, target_data, key)
+
     def ConstInt(self, value):
         ''' Obtain a constant value for an integer type.
         '''
         if isinstance(value, bool) and self.GetIntTypeWidth() == 1:
             value = int(value)
         assert is_int(value)
-        # due to the python nature, this is probably more efficient than
-        # converting to an array of uint64_t
-        return self.ConstIntOfString(unicode(value), 10)
+        raw = _const_int(self._raw, self.GetIntTypeWidth(), value)
+        return _wrap_const_int(raw, self._context)
+
+    def ConstInts(self, values):
+        ''' Obtain constant values for many integers at once.
+
+            Returns a python list of ConstantInt instances.
+        '''
+        raw_type = self._raw
+        width = self.GetIntTypeWidth()
+        context = self._context
+        if width <= 64:
+            const_int = _core.ConstInt
+            mask = _mask64
+            raws = [const_int(raw_type, v & mask, False) for v in values]
+        else:
+            raws = [_const_int(raw_type, width, v) for v in values]
+        return [_wrap_const_int(raw, context) for raw in raws]
 
     def ConstIntOfString(self, value, radix=10):
         ''' Obtain a constant value for an integer parsed from a string.
@@ -535,6 +714,9 @@ class FloatType(RealType):
     def __repr__(self):
         return 'float'
 
+    def _ctypes_type(self, target_data, key):
+        return ctypes.c_float
+
 Type._kind_type_map[TypeKind.Float] = FloatType
 
 class DoubleType(RealType):
@@ -553,6 +735,9 @@ class DoubleType(RealType):
     def __repr__(self):
         return 'double'
 
+    def _ctypes_type(self, target_data, key):
+        return ctypes.c_double
+
 Type._kind_type_map[TypeKind.Double] = DoubleType
 
 class X86FP80Type(RealType):
@@ -656,6 +841,13 @@ class FunctionType(Type):
         _core.GetParamTypes(self._raw, temp_buf)
         return [Type(temp_buf[i], self._context) for i in range(num)]
 
+    def _ctypes_type(self, target_data, key):
+        if self.IsVarArg():
+            return Type._ctypes_type(self, target_data, key)
+        rt = self.GetReturnType().ctypes_type(target_data)
+        params = [p.ctypes_type(target_data) for p in self.GetParamTypes()]
+        return ctypes.CFUNCTYPE(rt, *params)
+
 Type._kind_type_map[TypeKind.Function] = FunctionType
 
 
@@ -677,7 +869,7 @@ class StructType(Type):
             raw_body = (_core.Type * num)(*[i._raw for i in body])
             raw_struct = _core.StructTypeInContext(context._raw, raw_body, num, packed)
         else:
-            bname = u2b(name)
+            bname = name2b(name)
             raw_struct = _core.StructCreateNamed(context._raw, bname)
             if body is not None:
                 num = len(body)
@@ -748,6 +940,28 @@ class StructType(Type):
         raw_values = (_core.Value * n)(*[i._raw for i in values])
         return Value(_core.ConstNamedStruct(self._raw, raw_values, n), self._context)
 
+    def _ctypes_type(self, target_data, key):
+        if self.IsOpaqueStruct():
+            return Type._ctypes_type(self, target_data, key)
+        # publish the class before the fields, so that a struct may
+        # contain pointers to itself
+        attrs = {}
+        if target_data is not None or self.IsPackedStruct():
+            attrs['_pack_'] = 1
+        cls = type(str(self.GetStructName() or 'struct'), (ctypes.Structure,), attrs)
+        cache = self._context.ctypes_cache
+        cache[key] = cls
+        try:
+            elems = [e.ctypes_type(target_data) for e in self.GetStructElementTypes()]
+            if target_data is None:
+                cls._fields_ = [('f%d' % i, e) for i, e in enumerate(elems)]
+            else:
+                cls._fields_ = _ctypes_fields(target_data, self, elems)
+        except:
+            del cache[key]
+            raise
+        return cls
+
 Type._kind_type_map[TypeKind.Struct] = StructType
 
 class SequentialType(Type):
@@ -791,6 +1005,28 @@ class ArrayType(SequentialType):
         '''
         return _core.GetArrayLength(self._raw)
 
+    def _ctypes_type(self, target_data, key):
+        return self.GetElementType().ctypes_type(target_data) * self.GetArrayLength()
+
+    def ConstData(self, data):
+        ''' Create a constant array of this type from a buffer of numbers
+            (array.array, bytes, memoryview, numpy array ...) or any other
+            iterable of numbers.
+
+            No Python wrappers are created for the elements, and the result
+            is a ConstantDataArray if the element type is simple enough.
+        '''
+        elem = self.GetElementType()
+        n = self.GetArrayLength()
+        context = self._context
+        if isinstance(elem, IntegerType) and elem.GetIntTypeWidth() == 8:
+            data = _buffer_bytes(data)
+            if len(data) != n:
+                raise ValueError('expected %d elements, got %d' % (n, len(data)))
+            return Value(_core.ConstStringInContext(context._raw, data, n, True), context)
+        raw_values = _const_elements(elem, _buffer_values(data), n)
+        return Value(_core.ConstArray(elem._raw, raw_values, n), context)
+
 Type._kind_type_map[TypeKind.Array] = ArrayType
 
 class PointerType(SequentialType):
@@ -827,6 +1063,19 @@ class PointerType(SequentialType):
         '''
         return Value(_core.ConstPointerNull(self._raw), self._context)
 
+    def _ctypes_type(self, target_data, key):
+        elem = self.GetElementType()
+        is_function = isinstance(elem, FunctionType)
+        if not is_function and not elem.IsSized():
+            return ctypes.c_void_p
+        try:
+            rv = elem.ctypes_type(target_data)
+        except TypeError:
+            return ctypes.c_void_p
+        if is_function:
+            return rv
+        return ctypes.POINTER(rv)
+
 Type._kind_type_map[TypeKind.Pointer] = PointerType
 
 class VectorType(SequentialType):
@@ -855,6 +1104,19 @@ class VectorType(SequentialType):
         '''
         return _core.GetVectorSize(self._raw)
 
+    def ConstData(self, data):
+        ''' Create a constant vector of this type from a buffer of numbers
+            (array.array, bytes, memoryview, numpy array ...) or any other
+            iterable of numbers.
+
+            No Python wrappers are created for the elements, and the result
+            is a ConstantDataVector if the element type is simple enough.
+        '''
+        elem = self.GetElementType()
+        n = self.GetVectorSize()
+        raw_values = _const_elements(elem, _buffer_values(data), n)
+        return Value(_core.ConstVector(raw_values, n), self._context)
+
 Type._kind_type_map[TypeKind.Vector] = VectorType
 
 class VoidType(Type):
@@ -873,6 +1135,9 @@ class VoidType(Type):
     def __repr__(self):
         return 'void'
 
+    def _ctypes_type(self, target_data, key):
+        return None
+
 Type._kind_type_map[TypeKind.Void] = VoidType
 
 class LabelType(Type):
@@ -931,9 +1196,10 @@ class Value(object):
     __slots__ = ('_raw', '_context', '__weakref__')
 
     def __new__(cls, raw, context):
-        assert isinstance(raw, _core.Value)
-        assert isinstance(context, Context)
-        assert cls == Value # do not attempt to create a subclass directly.
+        if check_arguments:
+            assert _c.is_handle(raw, _core.Value)
+            assert isinstance(context, Context)
+            assert cls == Value # do not attempt to create a subclass directly.
         if not raw:
             return None
         raw_ptr = _c.pointer_value(raw)
@@ -946,12 +1212,35 @@ class Value(object):
         context.value_cache[raw_ptr] = self
         self._raw = raw
         self._context = context
-        assert bool(_core.IsConstant(self._raw)) == isinstance(self, Constant)
-        assert bool(_core.IsUndef(self._raw)) == isinstance(self, UndefValue)
+        if check_value_classes:
+            assert bool(_core.IsConstant(self._raw)) == isinstance(self, Constant)
+            assert bool(_core.IsUndef(self._raw)) == isinstance(self, UndefValue)
         return self
 
     @staticmethod
     def _figure_out(value):
+        # Instructions are looked up by opcode; everything else by the
+        # kind of its type, followed by a few IsA probes. Anything that
+        # doesn't fit goes through the exhaustive search.
+        if _core.IsAInstruction(value):
+            cls = Instruction._subclasses.get(_core.GetInstructionOpcode(value))
+            if cls is CallInst:
+                if _core.IsAIntrinsicInst(value):
+                    return IntrinsicInst._figure_out(value)
+                return CallInst
+            if cls is not None:
+                return cls
+            return Value._figure_out_slow(value)
+        kind = _core.GetTypeKind(_core.TypeOf(value))
+        for probe, cls in Value._kind_probes.get(kind, ()):
+            if getattr(_core, probe)(value):
+                if cls is ConstantExpr or cls is GlobalValue:
+                    return cls._figure_out(value)
+                return cls
+        return Value._figure_out_slow(value)
+
+    @staticmethod
+    def _figure_out_slow(value):
         # I seriously can't figure out a better way ...
         if _core.IsAArgument(value): return Argument
         if _core.IsABasicBlock(value): return BasicBlock
@@ -969,20 +1258,7 @@ class Value(object):
                 if _core.IsAConstantPointerNull(value): return ConstantPointerNull
                 if _core.IsAConstantStruct(value): return ConstantStruct
                 if _core.IsAConstantVector(value): return ConstantVector
-                if _core.IsAGlobalValue(value):
-                    if _version <= (3, 4):
-                        if _core.IsAFunction(value): return Function
-                        if _core.IsAGlobalAlias(value): return GlobalAlias
-                        if _core.IsAGlobalVariable(value): return GlobalVariable
-                    if (3, 5) <= _version:
-                        if _core.IsAGlobalAlias(value): return GlobalAlias
-                        if _core.IsAGlobalObject(value):
-                            if _core.IsAFunction(value): return Function
-                            if _core.IsAGlobalVariable(value): return GlobalVariable
-                            assert unknown_values, 'Uh-oh, unknown GlobalObject subclass.'
-                            return GlobalObject
-                    assert unknown_values, 'Uh-oh, unknown GlobalValue subclass.'
-                    return GlobalValue
+                if _core.IsAGlobalValue(value): return GlobalValue._figure_out(value)
                 if _core.IsAUndefValue(value): return UndefValue
                 # As of LLVM 3.3, these still aren't exposed in the C API.
                 if _version <= (3, 3):
@@ -1005,19 +1281,7 @@ class Value(object):
                 # TODO construct from opcode
                 if _core.IsABinaryOperator(value): return BinaryOperator
                 if _core.IsACallInst(value):
-                    if _core.IsAIntrinsicInst(value):
-                        if _core.IsADbgInfoIntrinsic(value):
-                            if _core.IsADbgDeclareInst(value): return DbgDeclareInst
-                            assert unknown_values, 'Uh-oh, unknown DbgInfoIntrinsic subclass.'
-                            return DbgInfoIntrinsic
-                        if _core.IsAMemIntrinsic(value):
-                            if _core.IsAMemCpyInst(value): return MemCpyInst
-                            if _core.IsAMemMoveInst(value): return MemMoveInst
-                            if _core.IsAMemSetInst(value): return MemSetInst
-                            assert unknown_values, 'Uh-oh, unknown MemIntrinsic subclass.'
-                            return MemIntrinsic
-                        assert unknown_values, 'Uh-oh, unknown IntrinsicInst subclass.'
-                        return IntrinsicInst
+                    if _core.IsAIntrinsicInst(value): return IntrinsicInst._figure_out(value)
                     # This is normal
                     #assert unknown_values, 'Uh-oh, unknown CallInst subclass.'
                     return CallInst
@@ -1088,7 +1352,7 @@ class Value(object):
         return b2u(_core.GetValueName(self._raw))
 
     def SetValueName(self, name):
-        _core.SetValueName(self._raw, u2b(name))
+        _core.SetValueName(self._raw, name2b(name))
 
     def Dump(self):
         _core.DumpValue(self._raw)
@@ -1101,6 +1365,7 @@ class Value(object):
 
     def ReplaceAllUsesWith(self, other):
         assert isinstance(other, Value)
+        self._context.cfg_cache.clear()
         _core.ReplaceAllUsesWith(self._raw, other._raw)
 
     def GetFirstUse(self):
@@ -1113,6 +1378,21 @@ class Value(object):
         '''
         return Use(_core.GetFirstUse(self._raw), self._context)
 
+    def Uses(self, bulk=False):
+        ''' Obtain a lazy view of the uses of a value.
+
+            See IRList.
+        '''
+        return UseList(self._raw, self._context, bulk)
+
+    def Users(self, bulk=False):
+        ''' Obtain a lazy view of the users of a value.
+
+            A user appears once for every time it uses this value.
+            See IRList.
+        '''
+        return UserList(self._raw, self._context, bulk)
+
 class Argument(Value):
     __slots__ = ()
 
@@ -1198,19 +1478,21 @@ class BasicBlock(Value):
             The function to add to is determined by the function of the
             passed basic block.
         '''
-        return Value(_core.BasicBlockAsValue(_core.InsertBasicBlockInContext(self._context._raw, self._raw_bb, u2b(name))), self._context)
+        self._context.cfg_cache.clear()
+        return Value(_core.BasicBlockAsValue(_core.InsertBasicBlockInContext(self._context._raw, self._raw_bb, name2b(name))), self._context)
 
-    # This function is dangerous in Python mode.
-    # We *could* just delete it from the cache, though, and hope.
-    @dangerous
-    @untested
     def DeleteBasicBlock(self):
         ''' Remove a basic block from a function and delete it.
 
             This deletes the basic block from its containing function and
             deletes the basic block itself.
+
+            This wrapper and those of the contained instructions become
+            unusable.
         '''
-        _core.DeleteBasicBlock(self._raw_bb)
+        raw_bb = self._raw_bb
+        _forget_values(self._context, _block_values(raw_bb))
+        _core.DeleteBasicBlock(raw_bb)
 
     if 0:
         # This frontend does not support detached BBs.
@@ -1227,12 +1509,14 @@ class BasicBlock(Value):
         ''' Move a basic block to before another one.
         '''
         assert isinstance(other, BasicBlock)
+        self._context.cfg_cache.clear()
         _core.MoveBasicBlockBefore(self._raw_bb, other._raw_bb)
 
     def MoveBasicBlockAfter(self, other):
         ''' Move a basic block to after another one.
         '''
         assert isinstance(other, BasicBlock)
+        self._context.cfg_cache.clear()
         _core.MoveBasicBlockAfter(self._raw_bb, other._raw_bb)
 
     def GetFirstInstruction(self):
@@ -1246,6 +1530,13 @@ class BasicBlock(Value):
         return Value(_core.GetLastInstruction(self._raw_bb), self._context)
     # see also next/prev in Instruction
 
+    def Instructions(self, bulk=False):
+        ''' Obtain a lazy view of the instructions in a basic block.
+
+            See IRList.
+        '''
+        return InstructionList(self._raw_bb, self._context, bulk)
+
 
 class InlineAsm(Value):
     __slots__ = ()
@@ -1297,11 +1588,22 @@ class User(Value):
     def SetOperand(self, index, value):
         assert is_int(index)
         assert isinstance(value, Value)
+        self._context.cfg_cache.clear()
         _core.SetOperand(self._raw, index, value._raw)
 
     def GetNumOperands(self):
         return _core.GetNumOperands(self._raw)
 
+    def GetOperands(self):
+        ''' Obtain all the operands of a user.
+
+            Returns a python list.
+        '''
+        raw = self._raw
+        get_operand = _core.GetOperand
+        n = _core.GetNumOperands(raw)
+        return _wrap_values([get_operand(raw, i) for i in range(n)], self._context)
+
 class  Constant(User):
     __slots__ = ()
 
@@ -1829,6 +2131,23 @@ class   ConstantVector(Constant, AnyConstantVector):
 class   GlobalValue(Constant):
     __slots__ = ()
 
+    @staticmethod
+    def _figure_out(value):
+        # value is a _core.Value that is a GlobalValue
+        if _version <= (3, 4):
+            if _core.IsAFunction(value): return Function
+            if _core.IsAGlobalAlias(value): return GlobalAlias
+            if _core.IsAGlobalVariable(value): return GlobalVariable
+        if (3, 5) <= _version:
+            if _core.IsAFunction(value): return Function
+            if _core.IsAGlobalAlias(value): return GlobalAlias
+            if _core.IsAGlobalObject(value):
+                if _core.IsAGlobalVariable(value): return GlobalVariable
+                assert unknown_values, 'Uh-oh, unknown GlobalObject subclass.'
+                return GlobalObject
+        assert unknown_values, 'Uh-oh, unknown GlobalValue subclass.'
+        return GlobalValue
+
     # Can't enable because Module is not cached.
     # Haven't cached because it would cause issues.
     # I'm also not convinced this is very useful.
@@ -1836,6 +2155,15 @@ class   GlobalValue(Constant):
     #def GetGlobalParent(self):
     #    return _core.GetGlobalParent(self)
 
+    def SetValueName(self, name):
+        symbols = _symbol_index_of(self._raw)
+        if symbols is None:
+            _core.SetValueName(self._raw, name2b(name))
+            return
+        symbols.remove(self)
+        _core.SetValueName(self._raw, name2b(name))
+        symbols.add(self)
+
     def IsDeclaration(self):
         return bool(_core.IsDeclaration(self._raw))
 
@@ -1899,7 +2227,7 @@ class    GlobalObject(GlobalValue):
             return self
 
     def SetSection(self, name):
-        _core.SetSection(self._raw, u2b(name))
+        _core.SetSection(self._raw, name2b(name))
 
     def SetAlignment(self, align):
         assert is_int(align)
@@ -1924,14 +2252,18 @@ class     Function(GlobalObject):
         '''
         return Value(_core.GetPreviousFunction(self._raw), self._context)
 
-    # This function is dangerous in Python mode.
-    # We *could* just delete it from the cache, though, and hope.
-    @dangerous
-    @untested
     def DeleteFunction(self):
         ''' Remove a function from its containing module and deletes it.
+
+            This wrapper and those of the parameters, basic blocks and
+            instructions become unusable.
         '''
-        _core.DeleteFunction(self._raw)
+        raw = self._raw
+        symbols = _symbol_index_of(raw)
+        if symbols is not None:
+            symbols.remove(self)
+        _forget_values(self._context, _function_values(raw))
+        _core.DeleteFunction(raw)
 
     @untested
     def GetIntrinsicID(self):
@@ -2016,6 +2348,13 @@ class     Function(GlobalObject):
         assert is_int(index)
         return Value(_core.GetParam(self._raw, index), self._context)
 
+    def Params(self, bulk=False):
+        ''' Obtain a lazy view of the parameters in a function.
+
+            See IRList.
+        '''
+        return ParamList(self._raw, self._context, bulk)
+
     # not sure it's actually worth exposing anything besides GetParams
     @deprecated
     def GetFirstParam(self):
@@ -2030,9 +2369,18 @@ class     Function(GlobalObject):
         return Value(_core.GetLastParam(self._raw), self._context)
 
 
+    def Materialize(self):
+        ''' Load the body of a function from a lazily loaded module.
+
+            The methods that look at the basic blocks of a function do
+            this automatically; so do linking and JIT compilation.
+        '''
+        _materialize(self._raw)
+
     def CountBasicBlocks(self):
         ''' Obtain the number of basic blocks in a function.
         '''
+        _materialize(self._raw)
         return _core.CountBasicBlocks(self._raw)
 
     def GetBasicBlocks(self):
@@ -2048,29 +2396,42 @@ class     Function(GlobalObject):
         context = self._context
         return [Value(_core.BasicBlockAsValue(bb), context) for bb in raw_out]
 
+    def BasicBlocks(self, bulk=False):
+        ''' Obtain a lazy view of the basic blocks in a function.
+
+            See IRList.
+        '''
+        _materialize(self._raw)
+        return BasicBlockList(self._raw, self._context, bulk)
+
     def GetFirstBasicBlock(self):
         ''' Obtain the first basic block in a function.
 
             The returned basic block can be used as an iterator. You will
             likely eventually call into GetNextBasicBlock() with it.
         '''
+        _materialize(self._raw)
         return Value(_core.BasicBlockAsValue(_core.GetFirstBasicBlock(self._raw)), self._context)
 
     def GetLastBasicBlock(self):
         ''' Obtain the last basic block in a function.
         '''
+        _materialize(self._raw)
         return Value(_core.BasicBlockAsValue(_core.GetLastBasicBlock(self._raw)), self._context)
 
     def GetEntryBasicBlock(self):
         ''' Obtain the basic block that corresponds to the entry point of a
             function.
         '''
+        _materialize(self._raw)
         return Value(_core.BasicBlockAsValue(_core.GetEntryBasicBlock(self._raw)), self._context)
 
     def AppendBasicBlock(self, name=''):
         ''' Append a basic block to the end of a function.
         '''
-        return Value(_core.BasicBlockAsValue(_core.AppendBasicBlockInContext(self._context._raw, self._raw, u2b(name))), self._context)
+        _materialize(self._raw)
+        self._context.cfg_cache.clear()
+        return Value(_core.BasicBlockAsValue(_core.AppendBasicBlockInContext(self._context._raw, self._raw, name2b(name))), self._context)
 
     # from Analysis.h
     def Verify(self, action=VerifierFailureAction.ReturnStatus):
@@ -2104,10 +2465,17 @@ class     GlobalVariable(GlobalObject):
     def GetPreviousGlobal(self):
         return Value(_core.GetPreviousGlobal(self._raw), self._context)
 
-    @dangerous
-    @untested
     def DeleteGlobal(self):
-        _core.DeleteGlobal(self._raw)
+        ''' Remove a global variable from its module and delete it.
+
+            This wrapper becomes unusable.
+        '''
+        raw = self._raw
+        symbols = _symbol_index_of(raw)
+        if symbols is not None:
+            symbols.remove(self)
+        _forget_values(self._context, [raw])
+        _core.DeleteGlobal(raw)
 
     def GetInitializer(self):
         return Value(_core.GetInitializer(self._raw), self._context)
@@ -2199,17 +2567,17 @@ class  Instruction(User):
         '''
         return Value(_core.GetPreviousInstruction(self._raw), self._context)
 
-    # This function is dangerous in Python mode.
-    # We *could* just delete it from the cache, though, and hope.
-    @dangerous
-    @untested
     def InstructionEraseFromParent(self):
         ''' Remove and delete an instruction.
 
             The instruction specified is removed from its containing
             building block and then deleted.
+
+            This wrapper becomes unusable.
         '''
-        _core.InstructionEraseFromParent(self._raw)
+        raw = self._raw
+        _forget_values(self._context, [raw])
+        _core.InstructionEraseFromParent(raw)
 
     def GetInstructionOpcode(self):
         ''' Obtain the code Opcode for an individual instruction.
@@ -2277,6 +2645,22 @@ class    IntrinsicInst(CallInst):
     __init__ = untested(lambda *args: None)
     __slots__ = ()
 
+    @staticmethod
+    def _figure_out(value):
+        # value is a _core.Value that is an IntrinsicInst
+        if _core.IsADbgInfoIntrinsic(value):
+            if _core.IsADbgDeclareInst(value): return DbgDeclareInst
+            assert unknown_values, 'Uh-oh, unknown DbgInfoIntrinsic subclass.'
+            return DbgInfoIntrinsic
+        if _core.IsAMemIntrinsic(value):
+            if _core.IsAMemCpyInst(value): return MemCpyInst
+            if _core.IsAMemMoveInst(value): return MemMoveInst
+            if _core.IsAMemSetInst(value): return MemSetInst
+            assert unknown_values, 'Uh-oh, unknown MemIntrinsic subclass.'
+            return MemIntrinsic
+        assert unknown_values, 'Uh-oh, unknown IntrinsicInst subclass.'
+        return IntrinsicInst
+
 class     DbgInfoIntrinsic(IntrinsicInst):
     __init__ = untested(lambda *args: None)
     __slots__ = ()
@@ -2350,6 +2734,20 @@ class   PHINode(Instruction):
         raw_blocks = (_core.BasicBlock * n)(*[i._raw_bb for i in blocks])
         _core.AddIncoming(self._raw, raw_values, raw_blocks, n)
 
+    def AddIncomingPairs(self, pairs):
+        ''' Add incoming (value, block) pairs to the end of a PHI list.
+        '''
+        pairs = list(pairs)
+        n = len(pairs)
+        raw_values = (_core.Value * n)()
+        raw_blocks = (_core.BasicBlock * n)()
+        for i, (v, bb) in enumerate(pairs):
+            assert isinstance(v, Value)
+            assert isinstance(bb, BasicBlock)
+            raw_values[i] = v._raw
+            raw_blocks[i] = bb._raw_bb
+        _core.AddIncoming(self._raw, raw_values, raw_blocks, n)
+
     def CountIncoming(self):
         ''' Obtain the number of incoming basic blocks to a PHI node.
         '''
@@ -2367,6 +2765,21 @@ class   PHINode(Instruction):
         assert is_int(index)
         return Value(_core.BasicBlockAsValue(_core.GetIncomingBlock(self._raw, index)), self._context)
 
+    def GetIncoming(self):
+        ''' Obtain all the incoming values to a PHI node.
+
+            Returns a python list of (Value, BasicBlock) pairs.
+        '''
+        raw = self._raw
+        context = self._context
+        n = _core.CountIncoming(raw)
+        get_value = _core.GetIncomingValue
+        get_block = _core.GetIncomingBlock
+        as_value = _core.BasicBlockAsValue
+        values = _wrap_values([get_value(raw, i) for i in range(n)], context)
+        blocks = _wrap_values([as_value(get_block(raw, i)) for i in range(n)], context)
+        return list(zip(values, blocks))
+
 class   SelectInst(Instruction):
     __slots__ = ()
 
@@ -2408,6 +2821,7 @@ class    IndirectBrInst(TerminatorInst):
 
     def AddDestination(self, dest):
         assert isinstance(dest, BasicBlock)
+        self._context.cfg_cache.clear()
         _core.AddDestination(self._raw, dest._raw_bb)
 
 class    InvokeInst(TerminatorInst, AnyCallOrInvoke):
@@ -2426,8 +2840,30 @@ class    SwitchInst(TerminatorInst):
     def AddCase(self, onval, dest):
         assert isinstance(onval, ConstantInt)
         assert isinstance(dest, BasicBlock)
+        self._context.cfg_cache.clear()
         _core.AddCase(self._raw, onval._raw, dest._raw_bb)
 
+    def AddCases(self, cases):
+        ''' Add many (value, dest) cases at once.
+
+            The values may be ConstantInts or python ints, which are
+            converted to the type of the condition without creating
+            wrappers.
+        '''
+        self._context.cfg_cache.clear()
+        raw = self._raw
+        raw_type = _core.TypeOf(_core.GetOperand(raw, 0))
+        width = _core.GetIntTypeWidth(raw_type)
+        add_case = _core.AddCase
+        for onval, dest in cases:
+            assert isinstance(dest, BasicBlock)
+            if isinstance(onval, ConstantInt):
+                raw_val = onval._raw
+            else:
+                assert is_int(onval)
+                raw_val = _const_int(raw_type, width, onval)
+            add_case(raw, raw_val, dest._raw_bb)
+
 class    UnreachableInst(TerminatorInst):
     __slots__ = ()
 
@@ -2523,6 +2959,128 @@ if (3, 5) <= _version:
         __slots__ = ()
 
 
+# Dispatch tables for Value._figure_out.
+# Opcodes that map to None are left to Value._figure_out_slow.
+Instruction._subclasses = {
+    Opcode.Ret: ReturnInst,
+    Opcode.Br: BranchInst,
+    Opcode.Switch: SwitchInst,
+    Opcode.IndirectBr: IndirectBrInst,
+    Opcode.Invoke: InvokeInst,
+    Opcode.Unreachable: UnreachableInst,
+    Opcode.Add: BinaryOperator,
+    Opcode.FAdd: BinaryOperator,
+    Opcode.Sub: BinaryOperator,
+    Opcode.FSub: BinaryOperator,
+    Opcode.Mul: BinaryOperator,
+    Opcode.FMul: BinaryOperator,
+    Opcode.UDiv: BinaryOperator,
+    Opcode.SDiv: BinaryOperator,
+    Opcode.FDiv: BinaryOperator,
+    Opcode.URem: BinaryOperator,
+    Opcode.SRem: BinaryOperator,
+    Opcode.FRem: BinaryOperator,
+    Opcode.Shl: BinaryOperator,
+    Opcode.LShr: BinaryOperator,
+    Opcode.AShr: BinaryOperator,
+    Opcode.And: BinaryOperator,
+    Opcode.Or: BinaryOperator,
+    Opcode.Xor: BinaryOperator,
+    Opcode.Alloca: AllocaInst,
+    Opcode.Load: LoadInst,
+    Opcode.Store: StoreInst,
+    Opcode.GetElementPtr: GetElementPtrInst,
+    Opcode.Trunc: TruncInst,
+    Opcode.ZExt: ZExtInst,
+    Opcode.SExt: SExtInst,
+    Opcode.FPToUI: FPToUIInst,
+    Opcode.FPToSI: FPToSIInst,
+    Opcode.UIToFP: UIToFPInst,
+    Opcode.SIToFP: SIToFPInst,
+    Opcode.FPTrunc: FPTruncInst,
+    Opcode.FPExt: FPExtInst,
+    Opcode.PtrToInt: PtrToIntInst,
+    Opcode.IntToPtr: IntToPtrInst,
+    Opcode.BitCast: BitCastInst,
+    Opcode.ICmp: ICmpInst,
+    Opcode.FCmp: FCmpInst,
+    Opcode.PHI: PHINode,
+    Opcode.Call: CallInst,
+    Opcode.Select: SelectInst,
+    Opcode.UserOp1: None,
+    Opcode.UserOp2: None,
+    Opcode.VAArg: VAArgInst,
+    Opcode.ExtractElement: ExtractElementInst,
+    Opcode.InsertElement: InsertElementInst,
+    Opcode.ShuffleVector: ShuffleVectorInst,
+    Opcode.ExtractValue: ExtractValueInst,
+    Opcode.InsertValue: InsertValueInst,
+    Opcode.Fence: None,
+    Opcode.AtomicCmpXchg: None,
+    Opcode.AtomicRMW: None,
+    Opcode.Resume: ResumeInst,
+    Opcode.LandingPad: LandingPadInst,
+}
+if (3, 3) <= _version:
+    Instruction._subclasses[Opcode.AtomicRMW] = AtomicRMWInst
+if (3, 4) <= _version:
+    Instruction._subclasses[Opcode.AddrSpaceCast] = AddrSpaceCastInst
+if (3, 5) <= _version:
+    Instruction._subclasses[Opcode.Fence] = FenceInst
+
+# For everything else, the probes worth trying for each TypeKind,
+# most likely first.
+def f():
+    if (3, 4) <= _version:
+        data_array = [('IsAConstantDataArray', ConstantDataArray)]
+        data_vector = [('IsAConstantDataVector', ConstantDataVector)]
+    else:
+        data_array = []
+        data_vector = []
+    rest = [
+        ('IsAArgument', Argument),
+        ('IsAConstantExpr', ConstantExpr),
+        ('IsAUndefValue', UndefValue),
+    ]
+    real = [('IsAConstantFP', ConstantFP)] + rest
+    Value._kind_probes = {
+        TypeKind.Integer: [('IsAConstantInt', ConstantInt)] + rest,
+        TypeKind.Pointer: [
+            ('IsAGlobalValue', GlobalValue),
+            ('IsAConstantPointerNull', ConstantPointerNull),
+        ] + rest + [
+            ('IsABlockAddress', BlockAddress),
+            ('IsAInlineAsm', InlineAsm),
+        ],
+        TypeKind.Float: real,
+        TypeKind.Double: real,
+        TypeKind.X86_FP80: real,
+        TypeKind.FP128: real,
+        TypeKind.PPC_FP128: real,
+        TypeKind.Struct: [
+            ('IsAConstantStruct', ConstantStruct),
+            ('IsAConstantAggregateZero', ConstantAggregateZero),
+        ] + rest,
+        TypeKind.Array: data_array + [
+            ('IsAConstantArray', ConstantArray),
+            ('IsAConstantAggregateZero', ConstantAggregateZero),
+        ] + rest,
+        TypeKind.Vector: data_vector + [
+            ('IsAConstantVector', ConstantVector),
+            ('IsAConstantAggregateZero', ConstantAggregateZero),
+        ] + rest,
+        TypeKind.Label: [('IsABasicBlock', BasicBlock)],
+        TypeKind.Metadata: [
+            ('IsAMDNode', MDNode),
+            ('IsAMDString', MDString),
+        ],
+    }
+    if (3, 1) <= _version:
+        Value._kind_probes[TypeKind.Half] = real
+f()
+del f
+
+
 
 class Use(object):
     ''' Is it even worth exposing this in the public API?
@@ -2531,7 +3089,7 @@ class Use(object):
     __slots__ = ('_raw', '_context')
 
     def __new__(cls, raw, context):
-        assert isinstance(raw, _core.Use)
+        assert _c.is_handle(raw, _core.Use)
         assert isinstance(context, Context)
         assert cls == Use
         if not raw:
@@ -2561,6 +3119,169 @@ class Use(object):
         return Value(_core.GetUsedValue(self._raw), self._context)
 
 
+class IRList(object):
+    ''' A lazy view of one of the lists in the IR.
+
+        Iterating creates wrappers one at a time, never an intermediate
+        list. The next element is looked up before the current one is
+        produced, so it is safe to erase the current element.
+
+        With bulk=True, all the raw handles are fetched first (in a
+        single C call, where the C API has one) and only the wrappers
+        are created lazily. Use that if the list is otherwise modified
+        during iteration.
+    '''
+    __slots__ = ('_raw', '_context', '_bulk')
+
+    # names in llpy.c.core, looked up when used
+    _first = _next = None
+    _last = _prev = None
+    _count = None
+    _get_all = None
+    _raw_type = 'Value'
+
+    def __init__(self, raw, context, bulk=False):
+        self._raw = raw
+        self._context = context
+        self._bulk = bulk
+
+    def _wrapper(self):
+        context = self._context
+        return lambda raw: Value(raw, context)
+
+    def _walk(self, first, step):
+        wrap = self._wrapper()
+        step = getattr(_core, step)
+        raw = getattr(_core, first)(self._raw)
+        while raw:
+            next_raw = step(raw)
+            yield wrap(raw)
+            raw = next_raw
+
+    def _raws(self):
+        if self._get_all is not None:
+            n = len(self)
+            raw_out = (getattr(_core, self._raw_type) * n)()
+            if n:
+                getattr(_core, self._get_all)(self._raw, raw_out)
+            return list(raw_out)
+        step = getattr(_core, self._next)
+        rv = []
+        raw = getattr(_core, self._first)(self._raw)
+        while raw:
+            rv.append(raw)
+            raw = step(raw)
+        return rv
+
+    def _wrap_all(self, raws):
+        wrap = self._wrapper()
+        for raw in raws:
+            yield wrap(raw)
+
+    def __iter__(self):
+        if self._bulk:
+            return self._wrap_all(self._raws())
+        return self._walk(self._first, self._next)
+
+    def __reversed__(self):
+        if self._bulk or self._last is None:
+            raws = self._raws()
+            raws.reverse()
+            return self._wrap_all(raws)
+        return self._walk(self._last, self._prev)
+
+    def __len__(self):
+        if self._count is not None:
+            return getattr(_core, self._count)(self._raw)
+        step = getattr(_core, self._next)
+        n = 0
+        raw = getattr(_core, self._first)(self._raw)
+        while raw:
+            n += 1
+            raw = step(raw)
+        return n
+
+    def __bool__(self):
+        return bool(getattr(_core, self._first)(self._raw))
+    __nonzero__ = __bool__
+
+class FunctionList(IRList):
+    ''' The functions in a module.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstFunction'
+    _next = 'GetNextFunction'
+    _last = 'GetLastFunction'
+    _prev = 'GetPreviousFunction'
+
+class GlobalList(IRList):
+    ''' The global variables in a module.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstGlobal'
+    _next = 'GetNextGlobal'
+    _last = 'GetLastGlobal'
+    _prev = 'GetPreviousGlobal'
+
+class ParamList(IRList):
+    ''' The parameters of a function.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstParam'
+    _next = 'GetNextParam'
+    _last = 'GetLastParam'
+    _prev = 'GetPreviousParam'
+    _count = 'CountParams'
+    _get_all = 'GetParams'
+
+class BasicBlockList(IRList):
+    ''' The basic blocks of a function.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstBasicBlock'
+    _next = 'GetNextBasicBlock'
+    _last = 'GetLastBasicBlock'
+    _prev = 'GetPreviousBasicBlock'
+    _count = 'CountBasicBlocks'
+    _get_all = 'GetBasicBlocks'
+    _raw_type = 'BasicBlock'
+
+    def _wrapper(self):
+        context = self._context
+        as_value = _core.BasicBlockAsValue
+        return lambda raw: Value(as_value(raw), context)
+
+class InstructionList(IRList):
+    ''' The instructions in a basic block.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstInstruction'
+    _next = 'GetNextInstruction'
+    _last = 'GetLastInstruction'
+    _prev = 'GetPreviousInstruction'
+
+class UseList(IRList):
+    ''' The uses of a value, in no particular order.
+    '''
+    __slots__ = ()
+    _first = 'GetFirstUse'
+    _next = 'GetNextUse'
+
+    def _wrapper(self):
+        context = self._context
+        return lambda raw: Use(raw, context)
+
+class UserList(UseList):
+    ''' The users of a value, once per use.
+    '''
+    __slots__ = ()
+
+    def _wrapper(self):
+        context = self._context
+        get_user = _core.GetUser
+        return lambda raw: Value(get_user(raw), context)
+
+
 def ConstVector(values):
     ''' Create a ConstantVector from values.
     '''
@@ -2605,10 +3326,11 @@ class IRBuilder(object):
     @untested
     def InsertIntoBuilder(self, instr, name=None):
         assert isinstance(instr, Instruction)
+        self._context.cfg_cache.clear()
         if name is None:
             _core.InsertIntoBuilder(self._raw, instr._raw)
         else:
-            _core.InsertIntoBuilderWithName(self._raw, instr._raw, u2b(name))
+            _core.InsertIntoBuilderWithName(self._raw, instr._raw, name2b(name))
 
     # Metadata
     @untested
@@ -2627,37 +3349,44 @@ class IRBuilder(object):
 
     # Terminators
     def BuildRetVoid(self):
+        self._context.cfg_cache.clear()
         return Value(_core.BuildRetVoid(self._raw), self._context)
 
     def BuildRet(self, v):
         assert isinstance(v, Value)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildRet(self._raw, v._raw), self._context)
 
     def BuildAggregateRet(self, values):
         assert all(isinstance(v, Value) for v in values)
         n = len(values)
         raw_values = (_core.Value * n)(*[i._raw for i in values])
+        self._context.cfg_cache.clear()
         return Value(_core.BuildAggregateRet(self._raw, raw_values, n), self._context)
 
     def BuildBr(self, dest):
         assert isinstance(dest, BasicBlock)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildBr(self._raw, dest._raw_bb), self._context)
 
     def BuildCondBr(self, if_, then, else_):
         assert isinstance(if_, Value)
         assert isinstance(then, BasicBlock)
         assert isinstance(else_, BasicBlock)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildCondBr(self._raw, if_._raw, then._raw_bb, else_._raw_bb), self._context)
 
     def BuildSwitch(self, v, else_, hint=10):
         assert isinstance(v, Value)
         assert isinstance(else_, BasicBlock)
         assert is_int(hint)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildSwitch(self._raw, v._raw, else_._raw_bb, hint), self._context)
 
     def BuildIndirectBr(self, addr, hint=10):
         assert isinstance(addr, Value)
         assert is_int(hint)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildIndirectBr(self._raw, addr._raw, hint), self._context)
 
     @untested
@@ -2668,148 +3397,151 @@ class IRBuilder(object):
         assert isinstance(catch, BasicBlock)
         n = len(args)
         raw_args = (_core.Value * n)(*[i._raw for i in args])
-        return Value(_core.BuildInvoke(self._raw, fn._raw, raw_args, n, then._raw_bb, catch._raw_bb, u2b(name)), self._context)
+        self._context.cfg_cache.clear()
+        return Value(_core.BuildInvoke(self._raw, fn._raw, raw_args, n, then._raw_bb, catch._raw_bb, name2b(name)), self._context)
 
     @untested
     def BuildLandingPad(self, ty, persfn, n, name=''):
         assert isinstance(ty, Type)
         assert isinstance(persfn, Value)
         assert is_int(n)
-        return Value(_core.BuildLandingPad(self._raw, ty._raw, persfn._raw, n, u2b(name)), self._context)
+        return Value(_core.BuildLandingPad(self._raw, ty._raw, persfn._raw, n, name2b(name)), self._context)
 
     @untested
     def BuildResume(self, exn):
         assert isinstance(exn, Value)
+        self._context.cfg_cache.clear()
         return Value(_core.BuildResume(self._raw, exn._raw), self._context)
 
     def BuildUnreachable(self):
+        self._context.cfg_cache.clear()
         return Value(_core.BuildUnreachable(self._raw), self._context)
 
     # Arithmetic
     def BuildAdd(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildAdd(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildAdd(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNSWAdd(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNSWAdd(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNSWAdd(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNUWAdd(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNUWAdd(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNUWAdd(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFAdd(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFAdd(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFAdd(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildSub(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildSub(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildSub(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNSWSub(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNSWSub(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNSWSub(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNUWSub(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNUWSub(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNUWSub(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFSub(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFSub(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFSub(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildMul(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildMul(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildMul(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNSWMul(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNSWMul(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNSWMul(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNUWMul(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNUWMul(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNUWMul(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFMul(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFMul(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFMul(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildUDiv(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildUDiv(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildUDiv(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildSDiv(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildSDiv(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildSDiv(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildExactSDiv(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildExactSDiv(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildExactSDiv(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFDiv(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFDiv(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFDiv(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildURem(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildURem(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildURem(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildSRem(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildSRem(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildSRem(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFRem(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFRem(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFRem(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildShl(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildShl(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildShl(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildLShr(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildLShr(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildLShr(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildAShr(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildAShr(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildAShr(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildAnd(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildAnd(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildAnd(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildOr(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildOr(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildOr(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildXor(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildXor(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildXor(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
@@ -2817,50 +3549,50 @@ class IRBuilder(object):
         assert isinstance(op, Opcode)
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildBinOp(self._raw, op, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildBinOp(self._raw, op, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNeg(self, rhs, name=''):
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNeg(self._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNeg(self._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNSWNeg(self, rhs, name=''):
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNSWNeg(self._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNSWNeg(self._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNUWNeg(self, rhs, name=''):
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNUWNeg(self._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNUWNeg(self._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFNeg(self, rhs, name=''):
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFNeg(self._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFNeg(self._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildNot(self, rhs, name=''):
         assert isinstance(rhs, Value)
-        return Value(_core.BuildNot(self._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildNot(self._raw, rhs._raw, name2b(name)), self._context)
 
     # Memory
     @dangerous # declares malloc() with wrong prototype
     @untested
     def BuildMalloc(self, ty, name=''):
         assert isinstance(ty, Type)
-        return Value(_core.BuildMalloc(self._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildMalloc(self._raw, ty._raw, name2b(name)), self._context)
 
     @dangerous # as BuildMalloc
     @untested
     def BuildArrayMalloc(self, ty, val, name=''):
         assert isinstance(ty, Type)
         assert isinstance(val, Value)
-        return Value(_core.BuildArrayMalloc(self._raw, ty._raw, val._raw, u2b(name)), self._context)
+        return Value(_core.BuildArrayMalloc(self._raw, ty._raw, val._raw, name2b(name)), self._context)
 
     def BuildAlloca(self, ty, name=''):
         assert isinstance(ty, Type)
-        return Value(_core.BuildAlloca(self._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildAlloca(self._raw, ty._raw, name2b(name)), self._context)
 
     def BuildArrayAlloca(self, ty, val, name=''):
         assert isinstance(ty, Type)
         assert isinstance(val, Value)
-        return Value(_core.BuildArrayAlloca(self._raw, ty._raw, val._raw, u2b(name)), self._context)
+        return Value(_core.BuildArrayAlloca(self._raw, ty._raw, val._raw, name2b(name)), self._context)
 
     @dangerous # not really, just for symmetry with BuildMalloc
     @untested
@@ -2870,7 +3602,7 @@ class IRBuilder(object):
 
     def BuildLoad(self, ptr, name=''):
         assert isinstance(ptr, Value)
-        return Value(_core.BuildLoad(self._raw, ptr._raw, u2b(name)), self._context)
+        return Value(_core.BuildLoad(self._raw, ptr._raw, name2b(name)), self._context)
 
     def BuildStore(self, val, ptr):
         assert isinstance(ptr, Value)
@@ -2881,220 +3613,220 @@ class IRBuilder(object):
         assert all(isinstance(i, Value) for i in indices)
         n = len(indices)
         raw_indices = (_core.Value * n)(*[i._raw for i in indices])
-        return Value(_core.BuildGEP(self._raw, ptr._raw, raw_indices, n, u2b(name)), self._context)
+        return Value(_core.BuildGEP(self._raw, ptr._raw, raw_indices, n, name2b(name)), self._context)
 
     def BuildInBoundsGEP(self, ptr, indices, name=''):
         assert isinstance(ptr, Value)
         assert all(isinstance(i, Value) for i in indices)
         n = len(indices)
         raw_indices = (_core.Value * n)(*[i._raw for i in indices])
-        return Value(_core.BuildInBoundsGEP(self._raw, ptr._raw, raw_indices, n, u2b(name)), self._context)
+        return Value(_core.BuildInBoundsGEP(self._raw, ptr._raw, raw_indices, n, name2b(name)), self._context)
 
     @untested
     def BuildStructGEP(self, ptr, index, name=''):
         assert isinstance(ptr, Value)
         assert is_int(index)
-        return Value(_core.BuildStructGEP(self._raw, ptr._raw, index, u2b(name)), self._context)
+        return Value(_core.BuildStructGEP(self._raw, ptr._raw, index, name2b(name)), self._context)
 
     def BuildGlobalString(self, s, name=''):
-        return Value(_core.BuildGlobalString(self._raw, u2b(s), u2b(name)), self._context)
+        return Value(_core.BuildGlobalString(self._raw, u2b(s), name2b(name)), self._context)
 
     def BuildGlobalStringPtr(self, s, name=''):
-        return Value(_core.BuildGlobalStringPtr(self._raw, u2b(s), u2b(name)), self._context)
+        return Value(_core.BuildGlobalStringPtr(self._raw, u2b(s), name2b(name)), self._context)
 
     # Casts
     def BuildTrunc(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildTrunc(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildTrunc(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildZExt(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildZExt(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildZExt(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildSExt(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildSExt(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildSExt(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildFPToUI(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildFPToUI(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildFPToUI(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildFPToSI(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildFPToSI(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildFPToSI(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildUIToFP(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildUIToFP(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildUIToFP(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildSIToFP(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildSIToFP(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildSIToFP(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildFPTrunc(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildFPTrunc(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildFPTrunc(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildFPExt(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildFPExt(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildFPExt(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildPtrToInt(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildPtrToInt(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildPtrToInt(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildIntToPtr(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildIntToPtr(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildIntToPtr(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     def BuildBitCast(self, rhs, ty, name=''):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildBitCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildBitCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     if (3, 4) <= _version:
         def BuildAddrSpaceCast(self, rhs, ty, name=''):
             assert isinstance(rhs, Value)
             assert isinstance(ty, Type)
-            return Value(_core.BuildAddrSpaceCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+            return Value(_core.BuildAddrSpaceCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildZExtOrBitCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildZExtOrBitCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildZExtOrBitCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildSExtOrBitCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildSExtOrBitCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildSExtOrBitCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildTruncOrBitCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildTruncOrBitCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildTruncOrBitCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildCast(self, op, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildCast(self._raw, op, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildCast(self._raw, op, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildPointerCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildPointerCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildPointerCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildIntCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildIntCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildIntCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     @deprecated
     @untested
     def BuildFPCast(self, rhs, ty, name):
         assert isinstance(rhs, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildFPCast(self._raw, rhs._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildFPCast(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
 
     # Comparisons
     def BuildICmp(self, ipred, lhs, rhs, name=''):
         assert isinstance(ipred, IntPredicate)
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildICmp(self._raw, ipred, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildICmp(self._raw, ipred, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     def BuildFCmp(self, rpred, lhs, rhs, name=''):
         assert isinstance(rpred, RealPredicate)
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildFCmp(self._raw, rpred, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildFCmp(self._raw, rpred, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     # Miscellaneous instructions
     def BuildPhi(self, ty, name=''):
         assert isinstance(ty, Type)
-        return Value(_core.BuildPhi(self._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildPhi(self._raw, ty._raw, name2b(name)), self._context)
 
     def BuildCall(self, fn, args, name=''):
         assert isinstance(fn, Value)
         assert all(isinstance(a, Value) for a in args)
         n = len(args)
         raw_args = (_core.Value * n)(*[i._raw for i in args])
-        return Value(_core.BuildCall(self._raw, fn._raw, raw_args, n, u2b(name)), self._context)
+        return Value(_core.BuildCall(self._raw, fn._raw, raw_args, n, name2b(name)), self._context)
 
     def BuildSelect(self, if_, then, else_, name=''):
         assert isinstance(if_, Value)
         assert isinstance(then, Value)
         assert isinstance(else_, Value)
-        return Value(_core.BuildSelect(self._raw, if_._raw, then._raw, else_._raw, u2b(name)), self._context)
+        return Value(_core.BuildSelect(self._raw, if_._raw, then._raw, else_._raw, name2b(name)), self._context)
 
     @untested
     def BuildVAArg(self, lst, ty, name):
         assert isinstance(lst, Value)
         assert isinstance(ty, Type)
-        return Value(_core.BuildVAArg(self._raw, lst._raw, ty._raw, u2b(name)), self._context)
+        return Value(_core.BuildVAArg(self._raw, lst._raw, ty._raw, name2b(name)), self._context)
 
     def BuildExtractElement(self, vecval, index, name=''):
         assert isinstance(vecval, Value)
         assert isinstance(index, Value)
-        return Value(_core.BuildExtractElement(self._raw, vecval._raw, index._raw, u2b(name)), self._context)
+        return Value(_core.BuildExtractElement(self._raw, vecval._raw, index._raw, name2b(name)), self._context)
 
     def BuildInsertElement(self, vecval, eltval, index, name=''):
         assert isinstance(vecval, Value)
         assert isinstance(eltval, Value)
         assert isinstance(index, Value)
-        return Value(_core.BuildInsertElement(self._raw, vecval._raw, eltval._raw, index._raw, u2b(name)), self._context)
+        return Value(_core.BuildInsertElement(self._raw, vecval._raw, eltval._raw, index._raw, name2b(name)), self._context)
 
     def BuildShuffleVector(self, v1, v2, mask, name=''):
         assert isinstance(v1, Value)
         assert isinstance(v2, Value)
         assert isinstance(mask, Value)
-        return Value(_core.BuildShuffleVector(self._raw, v1._raw, v2._raw, mask._raw, u2b(name)), self._context)
+        return Value(_core.BuildShuffleVector(self._raw, v1._raw, v2._raw, mask._raw, name2b(name)), self._context)
 
     def BuildExtractValue(self, aggval, index, name=''):
         assert isinstance(aggval, Value)
         assert is_int(index)
-        return Value(_core.BuildExtractValue(self._raw, aggval._raw, index, u2b(name)), self._context)
+        return Value(_core.BuildExtractValue(self._raw, aggval._raw, index, name2b(name)), self._context)
 
     def BuildInsertValue(self, aggval, eltval, index, name=''):
         assert isinstance(aggval, Value)
         assert isinstance(eltval, Value)
         assert is_int(index)
-        return Value(_core.BuildInsertValue(self._raw, aggval._raw, eltval._raw, index, u2b(name)), self._context)
+        return Value(_core.BuildInsertValue(self._raw, aggval._raw, eltval._raw, index, name2b(name)), self._context)
 
     def BuildIsNull(self, val, name=''):
         assert isinstance(val, Value)
-        return Value(_core.BuildIsNull(self._raw, val._raw, u2b(name)), self._context)
+        return Value(_core.BuildIsNull(self._raw, val._raw, name2b(name)), self._context)
 
     def BuildIsNotNull(self, val, name=''):
         assert isinstance(val, Value)
-        return Value(_core.BuildIsNotNull(self._raw, val._raw, u2b(name)), self._context)
+        return Value(_core.BuildIsNotNull(self._raw, val._raw, name2b(name)), self._context)
 
     def BuildPtrDiff(self, lhs, rhs, name=''):
         assert isinstance(lhs, Value)
         assert isinstance(rhs, Value)
-        return Value(_core.BuildPtrDiff(self._raw, lhs._raw, rhs._raw, u2b(name)), self._context)
+        return Value(_core.BuildPtrDiff(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
 
     if (3, 3) <= _version:
         def BuildAtomicRMW(self, op, ptr, val, order, single, name=''):
@@ -3115,7 +3847,85 @@ class IRBuilder(object):
             assert isinstance(order, AtomicOrdering)
             assert isinstance(single, bool)
             name = ''
-            return Value(_core.BuildFence(self._raw, order, single, u2b(name)), self._context)
+            return Value(_core.BuildFence(self._raw, order, single, name2b(name)), self._context)
+
+    def Emit(self, program, inputs=(), keep=()):
+        ''' Emit a whole sequence of instructions at the current position,
+            without creating a wrapper for each of them.
+
+            Each element of program is a tuple of an opcode, which is the
+            name of a Build* method without the prefix (e.g. 'Add', 'ICmp',
+            'CondBr'), followed by the arguments that method takes, in
+            the same order. The name is optional.
+
+            Wherever a value is expected, an int refers to an earlier
+            result: the inputs are numbered first, then each instruction
+            of program in turn. Value arguments may also be given directly.
+
+            Two opcodes differ from their Build* methods: 'Phi' takes
+            (type, incoming, name), where incoming is a list of
+            (value, block) pairs whose values may also refer to later
+            results; and 'Switch' takes (value, else_block, cases), where
+            cases is a list of (value, block) pairs as for
+            SwitchInst.AddCases.
+
+            Return wrappers for just the results whose indices are in keep.
+        '''
+        raw_builder = self._raw
+        results = [v._raw for v in inputs]
+        functions = {}
+        Values = _core.Value
+        phis = []
+        for instr in program:
+            op = instr[0]
+            spec = _emit_specs.get(op)
+            if spec is None:
+                raise ValueError('Unknown opcode for IRBuilder.Emit: %r' % (op,))
+            nargs = len(instr) - 1
+            if nargs != len(spec) and not (nargs == len(spec) - 1 and spec.endswith('n')):
+                raise TypeError('IRBuilder.Emit: %s takes %d arguments, got %d' % (op, len(spec), nargs))
+            fn = functions.get(op)
+            if fn is None:
+                fn = functions[op] = getattr(_core, 'Build' + op)
+            args = [raw_builder]
+            extra = None
+            for code, arg in zip(spec, instr[1:]):
+                if code == 'v':
+                    args.append(_emit_value(arg, results))
+                elif code == 'V':
+                    n = len(arg)
+                    args.append((Values * n)(*[_emit_value(a, results) for a in arg]))
+                    args.append(n)
+                elif code == 'b':
+                    assert isinstance(arg, BasicBlock)
+                    args.append(arg._raw_bb)
+                elif code == 't':
+                    assert isinstance(arg, Type)
+                    args.append(arg._raw)
+                elif code == 'n':
+                    args.append(name2b(arg))
+                elif code == 'I':
+                    extra = arg
+                elif code == 'C':
+                    extra = arg
+                    args.append(len(arg))
+                else:
+                    args.append(arg)
+            if nargs < len(spec):
+                # the name was omitted
+                args.append(b'')
+            raw = fn(*args)
+            results.append(raw)
+            if op == 'Phi':
+                phis.append((raw, extra))
+            elif op == 'Switch':
+                _emit_cases(raw, extra)
+        for raw, incoming in phis:
+            _emit_incoming(raw, incoming, results)
+        context = self._context
+        # any of them might have been a terminator
+        context.cfg_cache.clear()
+        return [Value(results[i], context) for i in keep]
 
 class ModuleProvider(object):
     __slots__ = ('_raw', '_mod')
@@ -3145,6 +3955,356 @@ def _message_to_string(message):
     _core.DisposeMessage(message)
     return b2u(s)
 
+_mask64 = (1 << 64) - 1
+
+def _const_int(raw_type, width, value):
+    ''' Create a raw ConstantInt, truncating value to width bits.
+    '''
+    if width <= 64:
+        return _core.ConstInt(raw_type, value & _mask64, False)
+    num_words = (width + 63) // 64
+    value &= (1 << (64 * num_words)) - 1
+    words = (ctypes.c_uint64 * num_words)()
+    for i in range(num_words):
+        words[i] = value & _mask64
+        value >>= 64
+    return _core.ConstIntOfArbitraryPrecision(raw_type, num_words, words)
+
+_ctypes_ints = {
+        1: ctypes.c_bool,
+        8: ctypes.c_int8,
+        16: ctypes.c_int16,
+        32: ctypes.c_int32,
+        64: ctypes.c_int64,
+}
+
+def _ctypes_fields(target_data, ty, elems):
+    ''' Lay out ctypes fields for a struct at the offsets target_data
+        reports, padding with byte arrays.
+    '''
+    fields = []
+    end = 0
+    for i, e in enumerate(elems):
+        offset = target_data.OffsetOfElement(ty, i)
+        if offset < end:
+            raise TypeError('field %d of %s overlaps under this layout' % (i, ty))
+        if offset > end:
+            fields.append(('_pad%d' % i, ctypes.c_ubyte * (offset - end)))
+        fields.append(('f%d' % i, e))
+        end = offset + ctypes.sizeof(e)
+    size = target_data.ABISizeOfType(ty)
+    if size > end:
+        fields.append(('_pad%d' % len(elems), ctypes.c_ubyte * (size - end)))
+    return fields
+
+_struct_prefixes = '@=<>!'
+
+def _buffer_values(data):
+    ''' Return the elements of a buffer, or any other iterable, as a list.
+    '''
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return list(data)
+    if view.ndim == 1:
+        try:
+            return view.tolist()
+        except NotImplementedError:
+            pass
+    # multidimensional, or a format memoryview doesn't handle itself
+    fmt = view.format
+    order = fmt[0] if fmt[0] in _struct_prefixes else '@'
+    code = fmt.lstrip(_struct_prefixes)
+    raw = view.tobytes()
+    count = len(raw) // struct.calcsize(order + code)
+    return list(struct.unpack('%s%d%s' % (order, count, code), raw))
+
+def _buffer_bytes(data):
+    ''' Return the elements of a buffer, or any other iterable, as bytes,
+        truncating each element to 8 bits.
+    '''
+    try:
+        view = memoryview(data)
+    except TypeError:
+        pass
+    else:
+        if view.itemsize == 1:
+            return view.tobytes()
+    return bytes(bytearray(v & 0xFF for v in _buffer_values(data)))
+
+def _const_elements(elem, values, n):
+    ''' Create a ctypes array of raw constants of type elem.
+    '''
+    if len(values) != n:
+        raise ValueError('expected %d elements, got %d' % (n, len(values)))
+    raw_elem = elem._raw
+    raw_values = (_core.Value * n)()
+    if isinstance(elem, IntegerType):
+        width = elem.GetIntTypeWidth()
+        const_int = _core.ConstInt
+        # lookup tables tend to repeat values, and a dict lookup is much
+        # cheaper than a C call
+        known = {}
+        for i, v in enumerate(values):
+            raw = known.get(v)
+            if raw is None:
+                if width <= 64:
+                    raw = const_int(raw_elem, v & _mask64, False)
+                else:
+                    raw = _const_int(raw_elem, width, v)
+                known[v] = raw
+            raw_values[i] = raw
+    elif isinstance(elem, RealType):
+        const_real = _core.ConstReal
+        for i, v in enumerate(values):
+            raw_values[i] = const_real(raw_elem, v)
+    else:
+        raise TypeError('Constant data must have integer or floating-point elements, not %s' % elem)
+    return raw_values
+
+def _wrap_values(raws, context):
+    ''' Like [Value(raw, context) for raw in raws], but with the cache
+        lookup done inline.
+    '''
+    cache_get = context.value_cache.get
+    pointer_value = _c.pointer_value
+    rv = []
+    for raw in raws:
+        value = cache_get(pointer_value(raw))
+        if value is None:
+            value = Value(raw, context)
+        rv.append(value)
+    return rv
+
+def _wrap_const_int(raw, context):
+    ''' Like Value(raw, context), but skips figuring out the class.
+    '''
+    raw_ptr = _c.pointer_value(raw)
+    cache = context.value_cache
+    self = cache.get(raw_ptr)
+    if self is None:
+        self = object.__new__(ConstantInt)
+        self._raw = raw
+        self._context = context
+        cache[raw_ptr] = self
+    return self
+
+def _block_values(raw_bb):
+    ''' Yield the raw values that die along with a basic block.
+    '''
+    raw = _core.BasicBlockAsValue(raw_bb)
+    yield raw
+    # LLVM destroys any blockaddress() of the block too.
+    use = _core.GetFirstUse(raw)
+    while use:
+        user = _core.GetUser(use)
+        if _core.IsABlockAddress(user):
+            yield user
+        use = _core.GetNextUse(use)
+    instr = _core.GetFirstInstruction(raw_bb)
+    while instr:
+        yield instr
+        instr = _core.GetNextInstruction(instr)
+
+def _function_values(raw):
+    ''' Yield the raw values that die along with a function.
+    '''
+    yield raw
+    param = _core.GetFirstParam(raw)
+    while param:
+        yield param
+        param = _core.GetNextParam(param)
+    bb = _core.GetFirstBasicBlock(raw)
+    while bb:
+        for v in _block_values(bb):
+            yield v
+        bb = _core.GetNextBasicBlock(bb)
+
+class _SymbolIndex(object):
+    ''' The name index of a Module; see Module.EnableSymbolIndex.
+    '''
+    __slots__ = ('functions', 'globals', 'aliases', 'types')
+
+    def __init__(self, module):
+        context = module._context
+        get_name = _core.GetValueName
+        for attr, first, step in [
+                ('functions', _core.GetFirstFunction, _core.GetNextFunction),
+                ('globals', _core.GetFirstGlobal, _core.GetNextGlobal),
+        ]:
+            table = {}
+            raw = first(module._raw)
+            while raw:
+                name = b2u(get_name(raw))
+                if name:
+                    table[name] = Value(raw, context)
+                raw = step(raw)
+            setattr(self, attr, table)
+        # the C API can't enumerate aliases, so this only knows about
+        # the ones added by AddAlias since the index was built
+        self.aliases = {}
+        self.types = {}
+
+    def _table(self, value):
+        if isinstance(value, Function):
+            return self.functions
+        if isinstance(value, GlobalVariable):
+            return self.globals
+        if isinstance(value, GlobalAlias):
+            return self.aliases
+        return None
+
+    def add(self, value):
+        table = self._table(value)
+        if table is not None:
+            name = b2u(_core.GetValueName(value._raw))
+            if name:
+                table[name] = value
+
+    def remove(self, value):
+        table = self._table(value)
+        if table is not None:
+            name = b2u(_core.GetValueName(value._raw))
+            if table.get(name) is value:
+                del table[name]
+
+def _symbol_key(name):
+    ''' The index keys are always text, even if bytes were looked up.
+    '''
+    if isinstance(name, bytes):
+        return b2u(name)
+    return name
+
+# raw module address -> _SymbolIndex, for modules that have one
+_symbol_indexes = {}
+
+def _symbol_index_of(raw):
+    ''' Find the _SymbolIndex of the module a raw global belongs to.
+    '''
+    if not _symbol_indexes:
+        return None
+    return _symbol_indexes.get(_c.pointer_value(_core.GetGlobalParent(raw)))
+
+# The arguments of each opcode accepted by IRBuilder.Emit:
+# v - value, V - list of values, b - basic block, t - type,
+# n - name (optional, always last), I - phi incoming (value, block) pairs,
+# C - switch (value, block) cases, anything else - passed through
+# (predicates, indices)
+_emit_specs = {
+        'RetVoid': '',
+        'Ret': 'v',
+        'AggregateRet': 'V',
+        'Br': 'b',
+        'CondBr': 'vbb',
+        'Switch': 'vbC',
+        'Unreachable': '',
+        'Alloca': 'tn',
+        'ArrayAlloca': 'tvn',
+        'Load': 'vn',
+        'Store': 'vv',
+        'GEP': 'vVn',
+        'InBoundsGEP': 'vVn',
+        'StructGEP': 'vin',
+        'ICmp': 'pvvn',
+        'FCmp': 'pvvn',
+        'Phi': 'tIn',
+        'Call': 'vVn',
+        'Select': 'vvvn',
+        'ExtractElement': 'vvn',
+        'InsertElement': 'vvvn',
+        'ShuffleVector': 'vvvn',
+        'ExtractValue': 'vin',
+        'InsertValue': 'vvin',
+        'IsNull': 'vn',
+        'IsNotNull': 'vn',
+        'PtrDiff': 'vvn',
+}
+for _op in ['Add', 'NSWAdd', 'NUWAdd', 'FAdd', 'Sub', 'NSWSub', 'NUWSub', 'FSub',
+        'Mul', 'NSWMul', 'NUWMul', 'FMul', 'UDiv', 'SDiv', 'ExactSDiv', 'FDiv',
+        'URem', 'SRem', 'FRem', 'Shl', 'LShr', 'AShr', 'And', 'Or', 'Xor']:
+    _emit_specs[_op] = 'vvn'
+for _op in ['Neg', 'NSWNeg', 'NUWNeg', 'FNeg', 'Not']:
+    _emit_specs[_op] = 'vn'
+for _op in ['Trunc', 'ZExt', 'SExt', 'FPToUI', 'FPToSI', 'UIToFP', 'SIToFP',
+        'FPTrunc', 'FPExt', 'PtrToInt', 'IntToPtr', 'BitCast']:
+    _emit_specs[_op] = 'vtn'
+if (3, 4) <= _version:
+    _emit_specs['AddrSpaceCast'] = 'vtn'
+del _op
+
+def _emit_value(arg, results):
+    if isinstance(arg, Value):
+        return arg._raw
+    # is_int rejects bools
+    if not is_int(arg):
+        raise TypeError('IRBuilder.Emit: operands must be Values or result indices, not %r' % (arg,))
+    if not 0 <= arg < len(results):
+        raise IndexError('IRBuilder.Emit: result index %d out of range' % arg)
+    return results[arg]
+
+def _emit_cases(raw, cases):
+    raw_type = _core.TypeOf(_core.GetOperand(raw, 0))
+    width = _core.GetIntTypeWidth(raw_type)
+    for onval, dest in cases:
+        if not isinstance(dest, BasicBlock):
+            raise TypeError('IRBuilder.Emit: Switch case destinations must be BasicBlocks')
+        if isinstance(onval, ConstantInt):
+            raw_val = onval._raw
+        elif is_int(onval):
+            raw_val = _const_int(raw_type, width, onval)
+        else:
+            raise TypeError('IRBuilder.Emit: Switch case values must be ConstantInts or ints')
+        _core.AddCase(raw, raw_val, dest._raw_bb)
+
+def _emit_incoming(raw, incoming, results):
+    n = len(incoming)
+    raw_values = (_core.Value * n)()
+    raw_blocks = (_core.BasicBlock * n)()
+    for i, (v, bb) in enumerate(incoming):
+        if not isinstance(bb, BasicBlock):
+            raise TypeError('IRBuilder.Emit: Phi incoming blocks must be BasicBlocks')
+        raw_values[i] = _emit_value(v, results)
+        raw_blocks[i] = bb._raw_bb
+    _core.AddIncoming(raw, raw_values, raw_blocks, n)
+
+# Function pass managers without any passes, for lazily loaded modules;
+# running one on a function that is not materialized yet loads its body.
+_materializers = {}
+
+def _enable_materializer(module):
+    raw = _core.CreateFunctionPassManagerForModule(module._raw)
+    _core.InitializeFunctionPassManager(raw)
+    _materializers[_c.pointer_value(module._raw)] = raw
+
+def _materialize(raw):
+    ''' Materialize a function, if it belongs to a lazily loaded module.
+    '''
+    # in LLVM 3.x, functions whose bodies are not loaded yet look like
+    # declarations
+    if _materializers and _core.IsDeclaration(raw):
+        fpm = _materializers.get(_c.pointer_value(_core.GetGlobalParent(raw)))
+        if fpm is not None:
+            _core.RunFunctionPassManager(fpm, raw)
+
+def _forget_values(context, raws):
+    ''' Remove the wrappers of values that are about to be deleted from
+        the cache, so that a new value at the same address gets a fresh
+        wrapper.
+
+        Wrappers that are still referenced elsewhere lose their handles,
+        so using them raises AttributeError instead of touching freed
+        memory.
+    '''
+    context.cfg_cache.clear()
+    cache = context.value_cache
+    for raw in raws:
+        self = cache.pop(_c.pointer_value(raw), None)
+        if self is None:
+            continue
+        del self._raw
+        if isinstance(self, BasicBlock):
+            del self._raw_bb
+
 if (3, 4) <= _version:
     _py_fatal_error_handler = None
 
@@ -3179,3 +4339,44 @@ if (3, 4) <= _version:
     def LoadLibraryPermanently(lib):
         if _support.LoadLibraryPermanently(u2b(lib)):
             raise OSError('Could not open library %r' % lib)
+
+
+if not check_arguments:
+    # The builder methods that are called for nearly every instruction
+    # get explicit unchecked versions, so that they don't depend on
+    # strip_asserts being able to find the source.
+    def _unchecked_binop(op):
+        fn = getattr(_core, op)
+        def method(self, lhs, rhs, name=''):
+            return Value(fn(self._raw, lhs._raw, rhs._raw, name2b(name)), self._context)
+        method.__name__ = str(op)
+        return method
+
+    def _unchecked_cast(op):
+        fn = getattr(_core, op)
+        def method(self, rhs, ty, name=''):
+            return Value(fn(self._raw, rhs._raw, ty._raw, name2b(name)), self._context)
+        method.__name__ = str(op)
+        return method
+
+    for _op in (
+            'BuildAdd', 'BuildNSWAdd', 'BuildNUWAdd', 'BuildFAdd',
+            'BuildSub', 'BuildNSWSub', 'BuildNUWSub', 'BuildFSub',
+            'BuildMul', 'BuildNSWMul', 'BuildNUWMul', 'BuildFMul',
+            'BuildUDiv', 'BuildSDiv', 'BuildExactSDiv', 'BuildFDiv',
+            'BuildURem', 'BuildSRem', 'BuildFRem',
+            'BuildShl', 'BuildLShr', 'BuildAShr',
+            'BuildAnd', 'BuildOr', 'BuildXor',
+    ):
+        setattr(IRBuilder, _op, _unchecked_binop(_op))
+    for _op in (
+            'BuildTrunc', 'BuildZExt', 'BuildSExt',
+            'BuildFPToUI', 'BuildFPToSI', 'BuildUIToFP', 'BuildSIToFP',
+            'BuildFPTrunc', 'BuildFPExt',
+            'BuildPtrToInt', 'BuildIntToPtr', 'BuildBitCast',
+    ):
+        setattr(IRBuilder, _op, _unchecked_cast(_op))
+    del _op, _unchecked_binop, _unchecked_cast
+
+    # Everything else is best-effort.
+    strip_asserts(sys.modules[__name__])
@@ -21,6 +21,7 @@
 
 import ctypes
 
+from llpy.compat import is_int
 from llpy.utils import u2b, untested
 from llpy.c import (
         _c,
@@ -31,6 +32,10 @@ from llpy.c import (
 from llpy.core import (
         _message_to_string,
         _version,
+        Function,
+        GlobalValue,
+        Module,
+        Type,
         Value,
 )
 from llpy.target import TargetData
@@ -49,7 +54,6 @@ from llpy.c.execution_engine import (
 class GenericValue(object):
     __slots__ = ('_raw')
 
-    @untested
     def __init__(self, ty, value):
         assert isinstance(ty, Type)
         if isinstance(value, int):
@@ -60,7 +64,6 @@ class GenericValue(object):
             raise TypeError('Can only (currently) create GenericValue from int or float')
             # _engine.CreateGenericValueOfPointer takes (void *)
 
-    @untested
     def __del__(self):
         _engine.DisposeGenericValue(self._raw)
 
@@ -68,7 +71,6 @@ class GenericValue(object):
     def IntWidth(self):
         return _engine.GenericValueIntWidth(self._raw)
 
-    @untested
     def ToInt(self, signed):
         assert isinstance(signed, bool)
         rv = _engine.GenericValueToInt(self._raw, signed)
@@ -90,11 +92,9 @@ class GenericValue(object):
 class ExecutionEngine(object):
     __slots__ = ('_raw')
 
-    @untested
     def __del__(self):
         _engine.DisposeExecutionEngine(self._raw)
 
-    @untested
     def __new__(cls, mod):
         assert isinstance(mod, Module)
         assert cls is ExecutionEngine
@@ -174,7 +174,6 @@ class ExecutionEngine(object):
         eat = ctypes.c_char_p * el
         return _engine.RunFunctionAsMain(self._raw, func._raw, al, aat(*args), eat(*envp))
 
-    @untested
     def RunFunction(self, func, gvalues):
         assert isinstance(func, Function)
         assert all(isinstance(v, GenericValue) for v in gvalues)
@@ -217,11 +216,10 @@ class ExecutionEngine(object):
     @untested
     def RecompileAndRelinkFunction(self, func):
         assert isinstance(func, Function)
-        raise NotImplementedError
+        proto = func.TypeOf().ctypes_type(self.GetExecutionEngineTargetData())
         rp = _engine.RecompileAndRelinkFunction(self._raw, func._raw)
-        return ctypes.cast(func.TypeOf().ctypes_type(), rp)
+        return _bind(proto(rp), self)
 
-    @untested
     def GetExecutionEngineTargetData(self):
         raw_td = _engine.GetExecutionEngineTargetData(self._raw)
         return TargetData(_message_to_string(_target.CopyStringRepOfTargetData(raw_td)))
@@ -232,9 +230,35 @@ class ExecutionEngine(object):
             assert isinstance(glob, GlobalValue)
             _engine.AddGlobalMapping(self._raw, glob._raw, vp)
 
-    @untested
     def GetPointerToGlobal(self, glob):
+        ''' Compile (if needed) and return the address of a global, as
+            the ctypes equivalent of its type (laid out according to the
+            engine's TargetData).
+
+            For a function, that is a callable CFUNCTYPE instance.
+        '''
         assert isinstance(glob, GlobalValue)
-        raise NotImplementedError
+        ty = glob.TypeOf().ctypes_type(self.GetExecutionEngineTargetData())
         rp = _engine.GetPointerToGlobal(self._raw, glob._raw)
-        return ctypes.cast(glob.TypeOf().ctypes_type(), rp)
+        if isinstance(glob, Function):
+            return _bind(ty(rp), self)
+        return _bind(ctypes.cast(rp, ty), self)
+
+    def GetCallable(self, func):
+        ''' Return a native callable for the compiled code of func.
+
+            Arguments and the return value are converted by ctypes
+            according to func's FunctionType (see Type.ctypes_type), so a
+            call costs one foreign call, unlike RunFunction which needs a
+            GenericValue for every argument and for the result.
+
+            The callable keeps the engine alive.
+        '''
+        assert isinstance(func, Function)
+        return self.GetPointerToGlobal(func)
+
+
+def _bind(ptr, engine):
+    # the code belongs to the engine, so it must outlive the pointer
+    ptr._llpy_engine = engine
+    return ptr
@@ -22,6 +22,10 @@
 '''
 
 import ctypes
+import mmap
+import os
+import tempfile
+import threading
 
 from llpy.compat import is_int
 from llpy.utils import u2b
@@ -35,22 +39,44 @@ from llpy.c import (
 from llpy.core import (
         Context,
         Module,
+        _enable_materializer,
         _message_to_string,
         _version,
 )
 
 
 class MemoryBuffer(object):
-    __slots__ = ('_raw',)
+    __slots__ = ('_raw', '_pin')
 
-    def __init__(self, filename, body=None):
+    def __init__(self, filename, body=None, copy=True, null_terminated=False):
+        ''' Read a file (or stdin, if filename is None), or wrap body.
+
+            body may be any contiguous buffer-protocol object, e.g. bytes,
+            bytearray or mmap. Unless copy is False, its contents are
+            copied; otherwise, the object is kept alive and locked in place
+            for as long as this buffer exists (where _c.buffer_pinning()
+            is False, a private copy is held instead).
+
+            The IR parser needs a buffer whose last byte is 0; pass
+            null_terminated=True to exclude that byte from the contents.
+        '''
+        self._pin = None
         if body is not None:
             assert filename is not None
             assert (3, 3) <= _version
-            assert isinstance(body, bytes)
-            size = len(body)
             filename = u2b(filename)
-            self._raw = _core.CreateMemoryBufferWithMemoryRangeCopy(body, size, filename)
+            pin = _c.BufferPin(body)
+            size = pin.size
+            if null_terminated:
+                assert size and ctypes.string_at(pin.address + size - 1, 1) == b'\0'
+                size -= 1
+            start = ctypes.cast(pin.address, _c.string_buffer)
+            if copy:
+                self._raw = _core.CreateMemoryBufferWithMemoryRangeCopy(start, size, filename)
+                pin.release()
+            else:
+                self._raw = _core.CreateMemoryBufferWithMemoryRange(start, size, filename, null_terminated)
+                self._pin = pin
             return
 
         self._raw = _core.MemoryBuffer()
@@ -66,14 +92,28 @@ class MemoryBuffer(object):
             raise OSError(error)
 
     if (3, 3) <= _version:
-        def Get(self):
+        def Get(self, view=False):
+            ''' Return the contents as bytes, or as a read-only memoryview
+                of this buffer's own memory.
+
+                view=True needs Python 3.8 or later.
+            '''
             ptr = _core.GetBufferStart(self._raw)
             size = _core.GetBufferSize(self._raw)
-            arr = ctypes.cast(ptr, ctypes.POINTER(ctypes.c_char * size))
-            return arr.contents.raw
+            if not view:
+                arr = ctypes.cast(ptr, ctypes.POINTER(ctypes.c_char * size))
+                return arr.contents.raw
+            if not hasattr(memoryview, 'toreadonly'):
+                raise NotImplementedError('read-only views need Python 3.8 or later')
+            arr = ctypes.cast(ptr, ctypes.POINTER(ctypes.c_ubyte * size)).contents
+            # the view keeps the array alive, which keeps this alive
+            arr._mbuf = self
+            return memoryview(arr).cast('B').toreadonly()
 
     def __del__(self):
         _core.DisposeMemoryBuffer(self._raw)
+        if self._pin is not None:
+            self._pin.release()
 
 
 def WriteBitcodeToFile(mod, path):
@@ -92,6 +132,79 @@ def WriteBitcodeToFD(mod, fd, close, unbuffered=False):
     if _bit_writer.WriteBitcodeToFD(mod._raw, fd, close, unbuffered):
         raise OSError
 
+def _bitcode_memfd(mod):
+    fd = os.memfd_create('llpy-bitcode', os.MFD_CLOEXEC)
+    try:
+        if _bit_writer.WriteBitcodeToFD(mod._raw, fd, False, False):
+            raise OSError
+    except:
+        os.close(fd)
+        raise
+    return fd
+
+def _bitcode_pipe(mod):
+    r, w = os.pipe()
+    chunks = []
+    errors = []
+    def drain():
+        try:
+            with os.fdopen(r, 'rb') as f:
+                chunks.append(f.read())
+        except Exception as e:
+            errors.append(e)
+    thread = threading.Thread(target=drain)
+    thread.daemon = True
+    thread.start()
+    # LLVM closes w when done, which ends the thread
+    rv = _bit_writer.WriteBitcodeToFD(mod._raw, w, True, False)
+    thread.join()
+    if errors:
+        raise errors[0]
+    if rv:
+        raise OSError
+    return b''.join(chunks)
+
+def WriteBitcodeToBytes(mod):
+    ''' Return the bitcode of a module.
+
+        The C API can only write to files, so this goes through a memfd
+        where the OS supports it, or else a pipe that is drained by
+        a thread.
+    '''
+    assert isinstance(mod, Module)
+    if not hasattr(os, 'memfd_create'):
+        return _bitcode_pipe(mod)
+    fd = _bitcode_memfd(mod)
+    with os.fdopen(fd, 'rb') as f:
+        f.seek(0)
+        return f.read()
+
+def WriteBitcodeToMemoryBuffer(mod, name=''):
+    ''' Return the bitcode of a module, in a MemoryBuffer.
+
+        With a memfd, the buffer maps its pages directly.
+    '''
+    assert isinstance(mod, Module)
+    if (3, 3) <= _version:
+        if not hasattr(os, 'memfd_create'):
+            return MemoryBuffer(name, _bitcode_pipe(mod), copy=False)
+        fd = _bitcode_memfd(mod)
+        try:
+            body = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        return MemoryBuffer(name, body, copy=False)
+    # no MemoryBuffer from memory until 3.3, so it has to be a file
+    if hasattr(os, 'memfd_create'):
+        fd = _bitcode_memfd(mod)
+        try:
+            return MemoryBuffer('/proc/self/fd/%d' % fd)
+        finally:
+            os.close(fd)
+    with tempfile.NamedTemporaryFile() as f:
+        WriteBitcodeToFile(mod, f.name)
+        return MemoryBuffer(f.name)
+
 def ParseBitcode(ctx, mbuf):
     assert isinstance(ctx, Context)
     assert isinstance(mbuf, MemoryBuffer)
@@ -104,10 +217,40 @@ def ParseBitcode(ctx, mbuf):
     m = Module.__new__(Module)
     m._raw = mod
     m._context = ctx
+    m._symbols = None
+    m._keepalive = None
+    return m
+
+def GetBitcodeModule(ctx, mbuf):
+    ''' Like ParseBitcode, but function bodies are only loaded when they
+        are needed: by Function.Materialize, the wrappers that look at
+        basic blocks, Module.MaterializeAll, linking, or JIT compilation.
+
+        The module takes over mbuf, which becomes unusable.
+    '''
+    assert isinstance(ctx, Context)
+    assert isinstance(mbuf, MemoryBuffer)
+    mod = _core.Module()
+    error = _c.string_buffer()
+    rv = bool(_bit_reader.GetBitcodeModuleInContext(ctx._raw, mbuf._raw, ctypes.byref(mod), ctypes.byref(error)))
+    error = _message_to_string(error)
+    if rv:
+        # the buffer is only taken on success
+        raise OSError(error)
+    m = Module.__new__(Module)
+    m._raw = mod
+    m._context = ctx
+    m._symbols = None
+    # the module reads the buffer, and thus any memory it wraps, as long
+    # as it lives, and deletes the buffer itself
+    m._keepalive = mbuf._pin
+    mbuf._raw = _core.MemoryBuffer()
+    mbuf._pin = None
+    _enable_materializer(m)
     return m
 
-# The GetBitcodeModuleProvider function is lazy, but is not really
-# usable because it changes ownership (this is not documented!)
+# The GetBitcodeModuleProvider function is lazy too, but is just an older
+# spelling of GetBitcodeModuleInContext.
 
 if (3, 2) <= _version:
     def PrintModuleToFile(mod, path):
@@ -118,6 +261,92 @@ if (3, 2) <= _version:
         if rv:
             raise OSError(error)
 
+    def PrintModuleToStream(mod, stream, compress=None, chunk_size=1 << 16):
+        ''' Write the textual IR of a module to anything with a write()
+            method that takes bytes, e.g. a binary file or sock.makefile('wb').
+
+            The text is passed on a chunk at a time, so it is never all in
+            memory at once. compress may be 'gzip' or 'xz', to wrap stream
+            accordingly.
+
+            Printing each global and function separately (with
+            Value.PrintToString) would not give the same text: attribute
+            groups and metadata are numbered across the whole module.
+            So LLVM prints the whole module, into a pipe drained by a
+            thread where /dev/fd exists, and into a temporary file
+            otherwise.
+        '''
+        assert isinstance(mod, Module)
+        if compress == 'gzip':
+            import gzip
+            out = gzip.GzipFile(fileobj=stream, mode='wb')
+        elif compress == 'xz':
+            import lzma
+            out = lzma.LZMAFile(stream, 'wb')
+        else:
+            assert compress is None
+            out = stream
+        try:
+            if _dev_fd:
+                _print_through_pipe(mod, out, chunk_size)
+            else:
+                _print_through_file(mod, out, chunk_size)
+        except:
+            if out is not stream:
+                try:
+                    out.close()
+                except Exception:
+                    # the original error is the interesting one
+                    pass
+            raise
+        if out is not stream:
+            out.close()
+
+    _dev_fd = os.path.isdir('/dev/fd')
+
+    def _print_through_pipe(mod, out, chunk_size):
+        r, w = os.pipe()
+        errors = []
+        def drain():
+            try:
+                while True:
+                    chunk = os.read(r, chunk_size)
+                    if not chunk:
+                        break
+                    if not errors:
+                        try:
+                            out.write(chunk)
+                        except Exception as e:
+                            # keep reading, or LLVM would block forever
+                            errors.append(e)
+            finally:
+                os.close(r)
+        thread = threading.Thread(target=drain)
+        thread.daemon = True
+        thread.start()
+        try:
+            PrintModuleToFile(mod, '/dev/fd/%d' % w)
+        finally:
+            # LLVM opened and closed its own copy
+            os.close(w)
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _print_through_file(mod, out, chunk_size):
+        fd, path = tempfile.mkstemp(suffix='.ll')
+        try:
+            os.close(fd)
+            PrintModuleToFile(mod, path)
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+        finally:
+            os.unlink(path)
+
 if (3, 4) <= _version:
     def ParseIR(ctx, mbuf):
         assert isinstance(ctx, Context)
@@ -125,10 +354,14 @@ if (3, 4) <= _version:
         mod = _core.Module()
         error = _c.string_buffer()
         rv = bool(_ir_reader.ParseIRInContext(ctx._raw, mbuf._raw, ctypes.byref(mod), ctypes.byref(error)))
+        # ParseIRInContext takes ownership of the buffer, even on failure
+        mbuf._raw = _core.MemoryBuffer()
         error = _message_to_string(error)
         if rv:
             raise OSError(error)
         m = Module.__new__(Module)
         m._raw = mod
         m._context = ctx
+        m._symbols = None
+        m._keepalive = None
         return m
@@ -1 +1,56 @@
-from llpy.c import linker
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2013 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Wrap the C interface to the llvm linker.
+'''
+
+import ctypes
+
+from llpy.c import (
+        _c,
+        linker as _linker,
+)
+from llpy.core import (
+        Module,
+        _message_to_string,
+        _version,
+)
+
+
+if (3, 2) <= _version:
+    def LinkModules(dest, src, preserve_source=False):
+        ''' Link src into dest.
+
+            Unless preserve_source is set, src may be left in any state,
+            and should only be dropped afterwards.
+        '''
+        assert isinstance(dest, Module)
+        assert isinstance(src, Module)
+        assert dest._context is src._context
+        if preserve_source:
+            mode = _linker.LinkerMode.LLVMLinkerPreserveSource
+        else:
+            mode = _linker.LinkerMode.LLVMLinkerDestroySource
+        error = _c.string_buffer()
+        rv = bool(_linker.LinkModules(dest._raw, src._raw, mode, ctypes.byref(error)))
+        error = _message_to_string(error)
+        dest._context.cfg_cache.clear()
+        if dest._symbols is not None:
+            dest.RebuildSymbolIndex()
+        if rv:
+            raise OSError(error)
@@ -0,0 +1,165 @@
+#   -*- encoding: utf-8 -*-
+#   Copyright © 2015 Ben Longbons
+#
+#   This file is part of Python3 bindings for LLVM.
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Lesser General Public License as published
+#   by the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU Lesser General Public License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Summarize many bitcode and IR files in parallel.
+
+    Each file is parsed in its own Context, in a pool of worker processes,
+    and boiled down to a picklable FileSummary. From the shell:
+
+        python -m llpy.scan [-j JOBS] [--chunksize N] [--json] PATH...
+
+    where each PATH is a .bc or .ll file, or a directory to search for them.
+'''
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+
+from llpy.c import core as _core
+from llpy.core import (
+        Context,
+        Linkage,
+        _version,
+)
+from llpy import io as _io
+from llpy.analysis import profile
+from llpy.target import TargetData
+
+
+class Symbol(collections.namedtuple('Symbol', 'name kind linkage defined size')):
+    ''' A function or global variable of a scanned module.
+
+        kind is 'function' or 'global', and linkage the name of a Linkage.
+        size is the number of instructions of a function, or the ABI size
+        in bytes of a global variable (None if unsized).
+    '''
+    __slots__ = ()
+
+class FileSummary(collections.namedtuple('FileSummary', 'path triple data_layout symbols error')):
+    ''' What scan() found in one file.
+
+        If it could not be read or parsed, error is the message, and
+        everything else but path is empty.
+    '''
+    __slots__ = ()
+
+    def defined(self):
+        return [s for s in self.symbols if s.defined]
+
+    def declared(self):
+        return [s for s in self.symbols if not s.defined]
+
+
+def summarize(path):
+    ''' Parse one file and summarize it. This is what the workers run.
+    '''
+    try:
+        ctx = Context()
+        mbuf = _io.MemoryBuffer(path)
+        if path.endswith('.ll'):
+            if not (3, 4) <= _version:
+                raise OSError('parsing IR needs LLVM 3.4')
+            mod = _io.ParseIR(ctx, mbuf)
+        else:
+            mod = _io.ParseBitcode(ctx, mbuf)
+    except OSError as e:
+        return FileSummary(path, '', '', (), str(e) or 'could not read %s' % path)
+    layout = mod.GetDataLayout()
+    prof = profile(mod, TargetData(layout))
+    names = Linkage._enum_names
+    symbols = []
+    raw = _core.GetFirstFunction(mod._raw)
+    for f in prof.functions:
+        symbols.append(Symbol(f.name, 'function', names[_core.GetLinkage(raw)],
+                not _core.IsDeclaration(raw), f.instructions))
+        raw = _core.GetNextFunction(raw)
+    raw = _core.GetFirstGlobal(mod._raw)
+    for g in prof.globals:
+        symbols.append(Symbol(g.name, 'global', names[_core.GetLinkage(raw)],
+                not _core.IsDeclaration(raw), g.size))
+        raw = _core.GetNextGlobal(raw)
+    return FileSummary(path, mod.GetTarget(), layout, tuple(symbols), None)
+
+def find(paths, suffixes=('.bc', '.ll')):
+    ''' Expand directories in paths into the files below them that have
+        one of the given suffixes, in sorted order.
+    '''
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffixes):
+                    yield os.path.join(root, name)
+
+def scan(paths, jobs=None, chunksize=16):
+    ''' Summarize each file in paths, yielding FileSummary objects in order.
+
+        jobs is the number of worker processes (default: one per CPU);
+        with jobs=1, everything happens in this process. Each worker is
+        handed chunksize files at a time.
+    '''
+    if jobs == 1:
+        for path in paths:
+            yield summarize(path)
+        return
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for summary in pool.imap(summarize, paths, chunksize):
+            yield summary
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m llpy.scan',
+            description='Summarize the symbols of LLVM bitcode and IR files.')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+            help='number of worker processes (default: one per CPU)')
+    parser.add_argument('--chunksize', type=int, default=16,
+            help='number of files handed to a worker at a time')
+    parser.add_argument('--json', action='store_true',
+            help='print one JSON object per file instead of a table')
+    parser.add_argument('paths', nargs='+', metavar='PATH')
+    args = parser.parse_args(argv)
+
+    status = 0
+    for s in scan(list(find(args.paths)), args.jobs, args.chunksize):
+        if s.error is not None:
+            status = 1
+        if args.json:
+            d = s._asdict()
+            d['symbols'] = [sym._asdict() for sym in s.symbols]
+            print(json.dumps(d, sort_keys=True))
+        elif s.error is not None:
+            print('%s: error: %s' % (s.path, s.error))
+        else:
+            defined = s.defined()
+            size = sum(sym.size for sym in defined if sym.kind == 'function')
+            print('%s: %s, %d defined, %d declared, %d instructions' % (
+                    s.path, s.triple or 'no triple', len(defined), len(s.declared()), size))
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
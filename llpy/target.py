@@ -33,6 +33,7 @@ from llpy.core import (
         Type,
         StructType,
         GlobalVariable,
+        Module,
 
         _message_to_string,
         _version,
@@ -41,6 +42,7 @@ from llpy.core import (
 from llpy.io import (
         MemoryBuffer,
 )
+from llpy.transforms import PassManagerBase
 from llpy.c.target import ByteOrdering
 
 
@@ -57,13 +59,13 @@ class TargetData(object):
         '''
         _target.DisposeTargetData(self._raw)
 
-    @untested
     def Add(self, pm):
         ''' Adds target data information to a pass manager. This does not
             take ownership of the target data.
         '''
-        assert isinstance(pm, PassManager)
+        assert isinstance(pm, PassManagerBase)
         _target.AddTargetData(self._raw, pm._raw)
+        pm._record('TargetData', self.StringRep())
 
     def StringRep(self):
         ''' Converts target data to a target layout string.
@@ -208,13 +210,11 @@ if (3, 1) <= _version:
     InitializeAllDisassemblers = untested(InitializeAllDisassemblers)
 
 from llpy.c.target import InitializeNativeTarget
-InitializeNativeTarget = untested(InitializeNativeTarget)
 
 if (3, 4) <= _version:
     from llpy.c.target import InitializeNativeAsmParser
     InitializeNativeAsmParser = untested(InitializeNativeAsmParser)
     from llpy.c.target import InitializeNativeAsmPrinter
-    InitializeNativeAsmPrinter = untested(InitializeNativeAsmPrinter)
     from llpy.c.target import InitializeNativeDisassembler
     InitializeNativeDisassembler = untested(InitializeNativeDisassembler)
 
@@ -231,10 +231,9 @@ if (3, 1) <= _version:
     class Target(object):
         __slots__ = ('_raw')
 
-        @untested
         def __new__(cls, raw):
             assert cls is Target
-            assert isinstance(raw, _machine.Target)
+            assert _c.is_handle(raw, _machine.Target)
             if raw:
                 self = object.__new__(Target)
                 self._raw = raw
@@ -255,6 +254,19 @@ if (3, 1) <= _version:
         def Name(self):
             return b2u(_machine.GetTargetName(self._raw))
 
+        if (3, 4) <= _version:
+            @staticmethod
+            def FromTriple(triple):
+                ''' Find the registered Target for a target triple.
+                '''
+                raw = _machine.Target()
+                error = _c.string_buffer()
+                rv = bool(_machine.GetTargetFromTriple(u2b(triple), ctypes.byref(raw), ctypes.byref(error)))
+                error = _message_to_string(error)
+                if rv:
+                    raise OSError(error)
+                return Target(raw)
+
         @untested
         def Description(self):
             return b2u(_machine.GetTargetDescription(self._raw))
@@ -273,17 +285,22 @@ if (3, 1) <= _version:
 
     class TargetMachine(object):
 
-        @untested
         def __init__(self, target, triple, cpu, features, opt, reloc, codemodel):
             assert isinstance(opt, CodeGenOptLevel)
             assert isinstance(reloc, RelocMode)
             assert isinstance(codemodel, CodeModel)
             self._raw = _machine.CreateTargetMachine(target._raw, u2b(triple), u2b(cpu), u2b(features), opt, reloc, codemodel)
+            self._fingerprint = repr((triple, cpu, features, int(opt), int(reloc), int(codemodel)))
 
-        @untested
         def __del__(self):
             _machine.DisposeTargetMachine(self._raw)
 
+        def Fingerprint(self):
+            ''' Describe everything that affects code generation, for use
+                in cache keys.
+            '''
+            return self._fingerprint
+
         @untested
         def Target(self):
             return Target(_machine.GetTargetMachineTarget(self._raw))
@@ -316,11 +333,27 @@ if (3, 1) <= _version:
             if rv:
                 raise OSError(error)
 
-        if (3, 3) <= _version:
+        if (3, 5) <= _version:
             @untested
-            def EmitToMemoryBuffer(self, mod, codegen):
+            def AddAnalysisPasses(self, pm):
+                ''' Add the target's analysis passes (e.g. its cost
+                    model) to a pass manager.
+                '''
+                assert isinstance(pm, PassManagerBase)
+                _machine.AddAnalysisPasses(self._raw, pm._raw)
+                pm._record('TargetMachine', self._fingerprint)
+
+        if (3, 3) <= _version:
+            def EmitToMemoryBuffer(self, mod, codegen, cache=None):
+                ''' Generate code for a module into a new MemoryBuffer.
+
+                    If a llpy.cache.CompileCache is given, code generated
+                    earlier for an identical module is reused.
+                '''
                 assert isinstance(mod, Module)
                 assert isinstance(codegen, CodeGenFileType)
+                if cache is not None:
+                    return MemoryBuffer('', cache.emit(self, mod, codegen), copy=False)
                 error = _c.string_buffer()
                 raw_mb = _core.MemoryBuffer()
                 rv = bool(_machine.TargetMachineEmitToMemoryBuffer(self._raw, mod._raw, codegen, ctypes.byref(error), ctypes.byref(raw_mb)))
@@ -329,4 +362,11 @@ if (3, 1) <= _version:
                     raise OSError(error)
                 mb = object.__new__(MemoryBuffer)
                 mb._raw = raw_mb
+                mb._pin = None
                 return mb
+
+if (3, 4) <= _version:
+    def GetDefaultTargetTriple():
+        ''' The triple LLVM was configured to generate code for.
+        '''
+        return _message_to_string(_machine.GetDefaultTargetTriple())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import gc
+import unittest
+
+import llpy.core
+import llpy.target
+from llpy.analysis import CFG, UseDefTable, ValueKind, get_cfg, profile
+from llpy.core import Opcode
+
+
+class TestUseDefTable(unittest.TestCase):
+
+    def setUp(self):
+        ctx = self.ctx = llpy.core.Context()
+        mod = self.mod = llpy.core.Module(ctx, 'TestUseDefTable')
+        i32 = llpy.core.IntegerType(ctx, 32)
+        zero = i32.ConstNull()
+        one = i32.ConstInt(1)
+        self.x = mod.AddGlobal(llpy.core.ArrayType(i32, 4), 'x')
+        self.y = mod.AddGlobal(i32, 'y')
+        self.f = mod.AddFunction(llpy.core.FunctionType(i32, [i32]), 'f')
+        self.i = self.f.GetParam(0)
+        self.entry = self.f.AppendBasicBlock('entry')
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(self.entry)
+        self.p = builder.BuildGEP(self.x, [zero, self.i], 'p')
+        self.a = builder.BuildLoad(self.p, 'a')
+        self.q = self.x.ConstGEP([zero, one])
+        self.b = builder.BuildLoad(self.q, 'b')
+        self.c = builder.BuildLoad(self.y, 'c')
+        self.s = builder.BuildAdd(self.a, self.b, 's')
+        self.r = builder.BuildRet(self.s)
+
+    def tearDown(self):
+        del self.mod
+        del self.ctx
+        gc.collect()
+
+    def test_table(self):
+        t = UseDefTable(self.mod)
+        order = [self.x, self.y, self.f, self.i, self.entry,
+                self.p, self.a, self.b, self.c, self.s, self.r]
+        for i, v in enumerate(order):
+            assert t.id_of(v) == i
+            assert t.value(i) is v
+        assert len(t) > len(order)
+        assert t.kind[t.id_of(self.x)] == ValueKind.GlobalVariable
+        assert t.kind[t.id_of(self.f)] == ValueKind.Function
+        assert t.kind[t.id_of(self.i)] == ValueKind.Argument
+        assert t.kind[t.id_of(self.entry)] == ValueKind.BasicBlock
+        assert t.kind[t.id_of(self.a)] == ValueKind.Instruction
+        assert t.kind[t.id_of(self.q)] == ValueKind.ConstantExpr
+        assert t.opcode[t.id_of(self.a)] == Opcode.Load
+        assert t.opcode[t.id_of(self.q)] == Opcode.GetElementPtr
+        assert t.block[t.id_of(self.a)] == t.id_of(self.entry)
+        assert t.function[t.id_of(self.a)] == t.id_of(self.f)
+        assert t.function[t.id_of(self.i)] == t.id_of(self.f)
+        assert t.block[t.id_of(self.x)] == -1
+
+        assert list(t.operands_of(t.id_of(self.a))) == [t.id_of(self.p)]
+        assert list(t.operands_of(t.id_of(self.s))) == [t.id_of(self.a), t.id_of(self.b)]
+        assert sorted(t.users_of(t.id_of(self.x))) == sorted([t.id_of(self.p), t.id_of(self.q)])
+        assert list(t.users_of(t.id_of(self.i))) == [t.id_of(self.p)]
+        s = t.id_of(self.s)
+        assert list(t.users_of(t.id_of(self.b))) == [s]
+        start = t.user_start[t.id_of(self.b)]
+        assert t.user_operand_index[start] == 1
+        assert len(t.users_of(t.id_of(self.r))) == 0
+
+    def test_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        t = UseDefTable(self.mod)
+        c = t.as_numpy()
+        x = t.id_of(self.x)
+        loads = numpy.flatnonzero((c['kind'] == ValueKind.Instruction)
+                                  & (c['opcode'] == Opcode.Load))
+        addr = c['operands'][c['operand_start'][loads]]
+        gep = c['opcode'][addr] == Opcode.GetElementPtr
+        base = c['operands'][c['operand_start'][addr]]
+        found = [t.value(i) for i in loads[gep & (base == x)]]
+        assert found == [self.a, self.b]
+
+class TestCFG(unittest.TestCase):
+
+    def setUp(self):
+        ctx = self.ctx = llpy.core.Context()
+        mod = self.mod = llpy.core.Module(ctx, 'TestCFG')
+        i1 = llpy.core.IntegerType(ctx, 1)
+        void = llpy.core.VoidType(ctx)
+        f = self.f = mod.AddFunction(llpy.core.FunctionType(void, [i1]), 'f')
+        cond = f.GetParam(0)
+        names = ['entry', 'head', 'inner', 'latch', 'exit', 'dead']
+        self.blocks = [f.AppendBasicBlock(name) for name in names]
+        entry, head, inner, latch, exit, dead = self.blocks
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(entry)
+        builder.BuildBr(head)
+        builder.PositionBuilderAtEnd(head)
+        builder.BuildCondBr(cond, inner, exit)
+        builder.PositionBuilderAtEnd(inner)
+        builder.BuildCondBr(cond, inner, latch)
+        builder.PositionBuilderAtEnd(latch)
+        builder.BuildCondBr(cond, head, exit)
+        builder.PositionBuilderAtEnd(exit)
+        builder.BuildRetVoid()
+        builder.PositionBuilderAtEnd(dead)
+        builder.BuildBr(exit)
+        self.builder = builder
+
+    def tearDown(self):
+        del self.builder
+        del self.mod
+        del self.ctx
+        gc.collect()
+
+    def test_cfg(self):
+        cfg = CFG(self.f)
+        assert len(cfg) == 6
+        for i, bb in enumerate(self.blocks):
+            assert cfg.id_of(bb) == i
+            assert cfg.block(i) is bb
+        entry, head, inner, latch, exit, dead = range(6)
+        assert list(cfg.successors(head)) == [inner, exit]
+        assert list(cfg.successors(inner)) == [inner, latch]
+        assert list(cfg.successors(exit)) == []
+        assert sorted(cfg.predecessors(exit)) == [head, latch, dead]
+        assert list(cfg.rpo)[:2] == [entry, head]
+        assert sorted(cfg.rpo) == [entry, head, inner, latch, exit]
+        assert cfg.rpo_number[dead] == -1
+
+        assert list(cfg.idom) == [entry, entry, head, inner, head, -1]
+        assert cfg.dominates(head, latch)
+        assert not cfg.dominates(latch, head)
+        assert cfg.dominates(exit, exit)
+        assert not cfg.dominates(entry, dead)
+        assert sorted(cfg.dom_children(head)) == [inner, exit]
+
+        assert list(cfg.frontier(entry)) == []
+        assert list(cfg.frontier(head)) == [head]
+        assert list(cfg.frontier(inner)) == [head, inner, exit]
+        assert list(cfg.frontier(latch)) == [head, exit]
+
+        outer, = cfg.loops
+        assert outer.header == head
+        assert sorted(outer.blocks) == [head, inner, latch]
+        assert outer.depth == 1
+        nested, = outer.children
+        assert nested.header == inner
+        assert list(nested.blocks) == [inner]
+        assert nested.parent is outer
+        assert nested.depth == 2
+        assert cfg.loop_of(latch) is outer
+        assert cfg.loop_of(inner) is nested
+        assert cfg.loop_of(exit) is None
+
+    def test_cache(self):
+        cfg = get_cfg(self.f)
+        assert get_cfg(self.f) is cfg
+        extra = self.f.AppendBasicBlock('extra')
+        new = get_cfg(self.f)
+        assert new is not cfg
+        assert len(new) == 7
+        assert get_cfg(self.f) is new
+        self.builder.PositionBuilderAtEnd(extra)
+        self.builder.BuildUnreachable()
+        assert get_cfg(self.f) is not new
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        ctx = self.ctx = llpy.core.Context()
+        mod = self.mod = llpy.core.Module(ctx, 'TestProfile')
+        i8 = llpy.core.IntegerType(ctx, 8)
+        i32 = llpy.core.IntegerType(ctx, 32)
+        void = llpy.core.VoidType(ctx)
+        mod.AddGlobal(llpy.core.ArrayType(i32, 10), 'table')
+        mod.AddGlobal(i8, 'flag')
+        mod.AddGlobal(llpy.core.StructType(ctx, None, 'opaque'), 'thing')
+        ft = llpy.core.FunctionType(void, [])
+        ext = mod.AddFunction(ft, 'ext')
+        f = mod.AddFunction(ft, 'f')
+        g = mod.AddFunction(ft, 'g')
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(f.AppendBasicBlock(''))
+        builder.BuildCall(ext, [])
+        builder.BuildCall(ext, [])
+        builder.BuildRetVoid()
+        builder.PositionBuilderAtEnd(g.AppendBasicBlock(''))
+        builder.BuildCall(f, [])
+        next_ = g.AppendBasicBlock('')
+        builder.BuildBr(next_)
+        builder.PositionBuilderAtEnd(next_)
+        builder.BuildRetVoid()
+
+    def tearDown(self):
+        del self.mod
+        del self.ctx
+        gc.collect()
+
+    def test_profile(self):
+        p = profile(self.mod)
+        assert [tuple(f) for f in p.functions] == [
+                ('ext', 0, 0, 0, 2),
+                ('f', 1, 3, 2, 1),
+                ('g', 2, 3, 1, 0),
+        ]
+        assert [tuple(g) for g in p.globals] == [('table', None), ('flag', None), ('thing', None)]
+        assert p.opcodes == (('Br', 1), ('Call', 3), ('Ret', 2))
+        assert p.instructions() == 6
+        assert p == profile(self.mod)
+
+    def test_invoke(self):
+        ext = self.mod.GetNamedFunction('ext')
+        h = self.mod.AddFunction(ext.TypeOf().GetElementType(), 'h')
+        builder = llpy.core.IRBuilder(self.ctx)
+        entry = h.AppendBasicBlock('entry')
+        ok = h.AppendBasicBlock('ok')
+        bad = h.AppendBasicBlock('bad')
+        builder.PositionBuilderAtEnd(entry)
+        builder.BuildInvoke(ext, [], ok, bad)
+        builder.PositionBuilderAtEnd(ok)
+        builder.BuildRetVoid()
+        builder.PositionBuilderAtEnd(bad)
+        builder.BuildUnreachable()
+        p = profile(self.mod)
+        assert tuple(p.functions[0]) == ('ext', 0, 0, 0, 3)
+        assert tuple(p.functions[3]) == ('h', 3, 3, 1, 0)
+
+    def test_sizes(self):
+        td = llpy.target.TargetData('e-p:64:64')
+        p = profile(self.mod, td)
+        assert [g.size for g in p.globals] == [40, 1, None]
+        assert p.global_size() == 41
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import gc
+import unittest
+
+import llpy.core
+from llpy.core import _version
+from llpy.assembler import ident
+if (3, 4) <= _version:
+    from llpy.assembler import IRWriter
+
+
+class TestIdent(unittest.TestCase):
+
+    def test_ident(self):
+        assert ident('@', 'foo') == '@foo'
+        assert ident('%', '.L$x') == '%.L$x'
+        assert ident('@', 'a b') == '@"a b"'
+        assert ident('@', 'x"y') == '@"x\\22y"'
+        assert ident('@', '\udcff') == '@"\\FF"'
+
+class TestIRWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = llpy.core.Context()
+        self.mod = llpy.core.Module(self.ctx, 'TestIRWriter')
+
+    def tearDown(self):
+        del self.mod
+        del self.ctx
+        gc.collect()
+
+    if (3, 4) <= _version:
+        def write(self):
+            ctx = self.ctx
+            i8 = llpy.core.IntegerType(ctx, 8)
+            i32 = llpy.core.IntegerType(ctx, 32)
+            st = llpy.core.StructType(ctx, [i32, llpy.core.PointerType(i8)], 'Foo')
+            fty = llpy.core.FunctionType(i32, [i32])
+            counter = self.mod.AddGlobal(i32, 'counter')
+            callee = self.mod.AddFunction(fty, 'callee')
+
+            w = IRWriter(ctx)
+            w.define_global('x', st)
+            w.define('caller', fty, [
+                    'entry:',
+                    '  %%a = load %s' % w.ref(counter),
+                    '  %%b = call i32 %s(i32 %%a)' % w.declare(callee),
+                    '  ret i32 %b',
+            ], ['n'])
+            return w, st
+
+        def test_text(self):
+            w, st = self.write()
+            assert w.getvalue() == (
+                    '%Foo = type { i32, i8* }\n'
+                    '@counter = external global i32\n'
+                    'declare i32 @callee(i32)\n'
+                    '@x = global %Foo zeroinitializer\n'
+                    'define i32 @caller(i32 %n) {\n'
+                    'entry:\n'
+                    '  %a = load i32* @counter\n'
+                    '  %b = call i32 @callee(i32 %a)\n'
+                    '  ret i32 %b\n'
+                    '}\n'
+            )
+
+        def test_parse(self):
+            w, st = self.write()
+            mod2 = w.parse('parsed')
+            assert mod2.GetContext() is self.ctx
+            assert not mod2.GetNamedFunction('caller').IsDeclaration()
+            assert mod2.GetNamedFunction('callee').IsDeclaration()
+
+        def test_link_into(self):
+            w, st = self.write()
+            w.link_into(self.mod)
+            caller = self.mod.GetNamedFunction('caller')
+            assert not caller.IsDeclaration()
+            call = caller.GetEntryBasicBlock().GetFirstInstruction().GetNextInstruction()
+            assert call.GetOperands()[-1] is self.mod.GetNamedFunction('callee')
+            assert self.mod.GetNamedGlobal('x').TypeOf().GetElementType() is st
+
+        def test_named_struct(self):
+            ctx = self.ctx
+            i32 = llpy.core.IntegerType(ctx, 32)
+            st = llpy.core.StructType(ctx, [i32], 'Bar')
+            pst = llpy.core.PointerType(st)
+            arr = llpy.core.ArrayType(st, 2)
+            fty = llpy.core.FunctionType(pst, [pst, llpy.core.PointerType(arr)])
+            w = IRWriter(ctx)
+            assert w.type(st) == '%Bar'
+            assert w.type(pst) == '%Bar*'
+            assert w.type(arr) == '[2 x %Bar]'
+            w.define_global('y', arr)
+            w.define('first', fty, [
+                    'entry:',
+                    '  ret %Bar* %p',
+            ], ['p', 'a'])
+            assert w.getvalue().count('%Bar = type { i32 }\n') == 1
+            w.link_into(self.mod)
+            assert self.mod.GetNamedGlobal('y').TypeOf().GetElementType() is arr
+            assert self.mod.GetNamedFunction('first').TypeOf().GetElementType() is fty
+
+        def test_error(self):
+            w = IRWriter(self.ctx)
+            w.write('this is not IR\n')
+            with self.assertRaises(OSError):
+                w.parse()
+
+if __name__ == '__main__':
+    unittest.main()
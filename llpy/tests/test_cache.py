@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import gc
+import os
+import unittest
+
+import llpy.core
+import llpy.target
+import llpy.transforms
+from llpy.core import _version
+
+from llpy.compat import TemporaryDirectory
+
+
+class FakePassManager(object):
+    def __init__(self):
+        self.runs = 0
+
+    def Fingerprint(self):
+        return 'fake'
+
+    def run(self, mod):
+        self.runs += 1
+        mod.GetNamedFunction('dead').DeleteFunction()
+        return True
+
+class FakeBuffer(object):
+    def Get(self):
+        return b'object code'
+
+class FakeMachine(object):
+    def __init__(self):
+        self.emits = 0
+
+    def Fingerprint(self):
+        return 'machine'
+
+    def EmitToMemoryBuffer(self, mod, codegen):
+        self.emits += 1
+        return FakeBuffer()
+
+if (3, 3) <= _version:
+    from llpy.cache import CompileCache
+
+    class TestCompileCache(unittest.TestCase):
+
+        def setUp(self):
+            self.dir = TemporaryDirectory()
+            self.tdn = self.dir.__enter__()
+            self.ctx = llpy.core.Context()
+            self.mod = llpy.core.Module(self.ctx, 'TestCompileCache')
+            void = llpy.core.VoidType(self.ctx)
+            func_type = llpy.core.FunctionType(void, [])
+            self.mod.AddFunction(func_type, 'live')
+            self.mod.AddFunction(func_type, 'dead')
+
+        def tearDown(self):
+            del self.mod
+            del self.ctx
+            gc.collect()
+            self.dir.__exit__(None, None, None)
+
+        def test_key(self):
+            cache = CompileCache(self.tdn)
+            assert cache.key('a', b'b') == cache.key(b'a', 'b')
+            assert cache.key('a', 'b') != cache.key('ab')
+
+        def test_lru(self):
+            cache = CompileCache(self.tdn, max_size=100)
+            k1, k2, k3 = [cache.key('%d' % i) for i in range(3)]
+            assert cache.get(k1) is None
+            cache.put(k1, b'1' * 40)
+            cache.put(k2, b'2' * 40)
+            assert cache.get(k1) == b'1' * 40
+            os.utime(cache._path(k1), (1, 1))
+            os.utime(cache._path(k2), (2, 2))
+            cache.put(k3, b'3' * 40)
+            assert cache.get(k1) is None
+            assert cache.get(k2) is None
+            assert cache.get(k3) == b'3' * 40
+            assert cache.size() == 40
+            assert not [n for n in os.listdir(os.path.dirname(cache._path(k3))) if n.startswith('.')]
+
+        def test_optimize(self):
+            cache = CompileCache(self.tdn)
+            pm = FakePassManager()
+            mod = cache.optimize(self.mod, pm)
+            assert mod is self.mod
+            assert pm.runs == 1
+            assert mod.GetNamedFunction('dead') is None
+
+            ctx = llpy.core.Context()
+            void = llpy.core.VoidType(ctx)
+            func_type = llpy.core.FunctionType(void, [])
+            other = llpy.core.Module(ctx, 'TestCompileCache')
+            other.AddFunction(func_type, 'live')
+            other.AddFunction(func_type, 'dead')
+            mod = cache.optimize(other, pm)
+            assert pm.runs == 1
+            assert mod is not other
+            assert mod.GetNamedFunction('live') is not None
+            assert mod.GetNamedFunction('dead') is None
+
+        def test_emit(self):
+            cache = CompileCache(self.tdn)
+            machine = FakeMachine()
+            codegen = llpy.target.CodeGenFileType.Object
+            assert cache.emit(machine, self.mod, codegen) == b'object code'
+            assert cache.emit(machine, self.mod, codegen) == b'object code'
+            assert machine.emits == 1
+
+            pm = FakePassManager()
+            assert cache.emit(machine, self.mod, codegen, pm) == b'object code'
+            assert machine.emits == 2
+            assert pm.runs == 1
+
+        def test_fingerprint(self):
+            td = llpy.target.TargetData('e-p:32:32-n8:16:32')
+            plain = llpy.transforms.ModulePassManager()
+            plain.AddCFGSimplificationPass()
+            with_td = llpy.transforms.ModulePassManager()
+            with_td.AddCFGSimplificationPass()
+            td.Add(with_td)
+            assert plain.Fingerprint() != with_td.Fingerprint()
+            assert td.StringRep() in with_td.Fingerprint()
+
+            cache = CompileCache(self.tdn)
+            mod = cache.optimize(self.mod, plain)
+            assert mod is self.mod
+            assert cache.size() > 0
+
+        if (3, 4) <= _version:
+            def test_emit_machine(self):
+                llpy.target.InitializeNativeTarget()
+                llpy.target.InitializeNativeAsmPrinter()
+                triple = llpy.target.GetDefaultTargetTriple()
+                machine = llpy.target.TargetMachine(
+                        llpy.target.Target.FromTriple(triple), triple, '', '',
+                        llpy.target.CodeGenOptLevel.Default,
+                        llpy.target.RelocMode.Default,
+                        llpy.target.CodeModel.Default)
+                codegen = llpy.target.CodeGenFileType.Object
+                cache = CompileCache(self.tdn)
+                direct = machine.EmitToMemoryBuffer(self.mod, codegen).Get()
+                first = machine.EmitToMemoryBuffer(self.mod, codegen, cache=cache).Get()
+                assert first == direct
+                size = cache.size()
+                assert size > 0
+                second = machine.EmitToMemoryBuffer(self.mod, codegen, cache=cache).Get()
+                assert second == direct
+                assert cache.size() == size
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2713,6 +2713,8 @@ define i1 @{op}(double %lhs, double %rhs) {{
         assert instr.GetNumOperands() == 2
         assert instr.GetOperand(0) is va
         assert instr.GetOperand(1) is vb
+        assert instr.GetOperands() == [va, vb]
+        assert instr.GetIncoming() == [(va, la), (vb, lb)]
 
         builder.BuildRet(instr)
         self.assertDump(func,
@@ -2732,6 +2734,54 @@ lc:                                               ; preds = %lb, %la
   ret i32 %vd
 }
 
+''')
+
+    def test_AddIncomingPairs(self):
+        builder = self.builder
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        func_type = llpy.core.FunctionType(i32, [i32])
+        func = self.mod.AddFunction(func_type, 'func')
+        bb = func.AppendBasicBlock('entry')
+        blocks = [func.AppendBasicBlock('l%d' % i) for i in range(3)]
+        exit = func.AppendBasicBlock('exit')
+        builder.PositionBuilderAtEnd(bb)
+        switch = builder.BuildSwitch(func.GetParam(0), exit, 3)
+        switch.AddCases([(i, blocks[i]) for i in range(2)] + [(i32.ConstInt(-1), blocks[2])])
+        for l in blocks:
+            builder.PositionBuilderAtEnd(l)
+            builder.BuildBr(exit)
+        builder.PositionBuilderAtEnd(exit)
+        phi = builder.BuildPhi(i32, 'phi')
+        values = i32.ConstInts(range(4))
+        pairs = list(zip(values, [bb] + blocks))
+        phi.AddIncomingPairs(iter(pairs))
+        assert phi.GetIncoming() == pairs
+        builder.BuildRet(phi)
+
+        self.assertDump(func,
+'''
+define i32 @func(i32) {
+entry:
+  switch i32 %0, label %exit [
+    i32 0, label %l0
+    i32 1, label %l1
+    i32 -1, label %l2
+  ]
+
+l0:                                               ; preds = %entry
+  br label %exit
+
+l1:                                               ; preds = %entry
+  br label %exit
+
+l2:                                               ; preds = %entry
+  br label %exit
+
+exit:                                             ; preds = %l2, %l1, %l0, %entry
+  %phi = phi i32 [ 0, %entry ], [ 1, %l0 ], [ 2, %l1 ], [ 3, %l2 ]
+  ret i32 %phi
+}
+
 ''')
 
     def test_BuildCall(self):
@@ -3219,5 +3269,103 @@ define void @func() {{
 '''.format(order=order_name))
                 func.SetValueName('')
 
+    def test_Emit(self):
+        builder = self.builder
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        func_type = llpy.core.FunctionType(i32, [i32, i32])
+        func = self.mod.AddFunction(func_type, 'func')
+        a = func.GetParam(0)
+        b = func.GetParam(1)
+        a.SetValueName('a')
+        b.SetValueName('b')
+        bb = func.AppendBasicBlock('entry')
+        builder.PositionBuilderAtEnd(bb)
+
+        program = [
+                ('Add', 0, 1, 'sum'),
+                ('Mul', 2, 2),
+                ('ICmp', llpy.core.IntPredicate.SLT, 3, i32.ConstNull(), 'neg'),
+                ('Select', 4, 2, 3),
+                ('Ret', 5),
+        ]
+        add, cmp, ret = builder.Emit(program, [a, b], keep=[2, 4, -1])
+        assert isinstance(add, llpy.core.BinaryOperator)
+        assert add.GetOperands() == [a, b]
+        assert isinstance(cmp, llpy.core.ICmpInst)
+        assert isinstance(ret, llpy.core.ReturnInst)
+        assert ret.GetInstructionParent() is bb
+        assert builder.Emit([]) == []
+        with self.assertRaises(ValueError):
+            builder.Emit([('Bogus', 0)], [a])
+
+        self.assertDump(func,
+'''
+define i32 @func(i32 %a, i32 %b) {
+entry:
+  %sum = add i32 %a, %b
+  %0 = mul i32 %sum, %sum
+  %neg = icmp slt i32 %0, 0
+  %1 = select i1 %neg, i32 %sum, i32 %0
+  ret i32 %1
+}
+
+''')
+    def test_Emit_phi_switch(self):
+        builder = self.builder
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        func = self.mod.AddFunction(llpy.core.FunctionType(i32, [i32]), 'count')
+        n = func.GetParam(0)
+        entry = func.AppendBasicBlock('entry')
+        loop = func.AppendBasicBlock('loop')
+        done = func.AppendBasicBlock('done')
+        builder.PositionBuilderAtEnd(entry)
+        switch, = builder.Emit([
+                ('Switch', 0, loop, [(0, done), (i32.ConstInt(1), done)]),
+        ], [n], keep=[1])
+        assert isinstance(switch, llpy.core.SwitchInst)
+        assert switch.GetNumOperands() == 6
+
+        builder.PositionBuilderAtEnd(loop)
+        # the phi refers to 'next', which comes after it
+        phi, = builder.Emit([
+                ('Phi', i32, [(i32.ConstNull(), entry), (2, loop)], 'i'),
+                ('Add', 1, i32.ConstInt(1), 'next'),
+                ('ICmp', llpy.core.IntPredicate.SLT, 2, 0),
+                ('CondBr', 3, loop, done),
+        ], [n], keep=[1])
+        assert isinstance(phi, llpy.core.PHINode)
+        assert phi.CountIncoming() == 2
+        assert phi.GetIncomingBlock(0) is entry
+        assert phi.GetIncomingValue(1) is phi.GetNextInstruction()
+        assert phi.GetIncomingBlock(1) is loop
+
+        builder.PositionBuilderAtEnd(done)
+        with self.assertRaises(TypeError):
+            builder.Emit([('Add', 0)], [n])
+        with self.assertRaises(TypeError):
+            builder.Emit([('Add', 0, 0, 'x', 'y')], [n])
+        with self.assertRaises(TypeError):
+            builder.Emit([('Switch', 0, loop)], [n])
+        builder.Emit([('Ret', 0)], [n])
+        func.Verify()
+
+    def test_Emit_bad_operand(self):
+        builder = self.builder
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        func = self.mod.AddFunction(llpy.core.FunctionType(i32, [i32]), 'func')
+        n = func.GetParam(0)
+        bb = func.AppendBasicBlock('entry')
+        builder.PositionBuilderAtEnd(bb)
+        with self.assertRaises(IndexError):
+            builder.Emit([('Add', 0, -1)], [n])
+        with self.assertRaises(IndexError):
+            builder.Emit([('Add', 0, 1)], [n])
+        with self.assertRaises(TypeError):
+            builder.Emit([('Add', 0, True)], [n])
+        with self.assertRaises(TypeError):
+            builder.Emit([('Call', n, [0, False])], [n])
+        with self.assertRaises(IndexError):
+            builder.Emit([('Phi', i32, [(-1, bb)])], [n])
+
 if __name__ == '__main__':
     unittest.main()
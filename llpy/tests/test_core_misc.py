@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 from __future__ import unicode_literals
 
+import array
+import ctypes
 import gc
 import os
 import unittest
@@ -234,6 +236,33 @@ declare void @foo()
         assert first is last.GetPreviousFunction()
         assert last.GetNextFunction() is None
 
+    def test_function_list(self):
+        void = llpy.core.VoidType(self.ctx)
+        ft = llpy.core.FunctionType(void, [])
+        functions = self.mod.Functions()
+        assert not functions
+        assert len(functions) == 0
+        assert list(functions) == []
+        fns = [self.mod.AddFunction(ft, 'f%d' % i) for i in range(3)]
+        assert functions
+        assert len(functions) == 3
+        assert list(functions) == fns
+        assert list(reversed(functions)) == fns[::-1]
+        assert list(self.mod.Functions(bulk=True)) == fns
+        assert list(reversed(self.mod.Functions(bulk=True))) == fns[::-1]
+
+        for fn in functions:
+            fn.DeleteFunction()
+        assert len(functions) == 0
+
+    def test_global_list(self):
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        gvs = [self.mod.AddGlobal(i32, 'g%d' % i) for i in range(3)]
+        assert len(self.mod.Globals()) == 3
+        assert list(self.mod.Globals()) == gvs
+        assert list(reversed(self.mod.Globals())) == gvs[::-1]
+        assert list(self.mod.Globals(bulk=True)) == gvs
+
     def test_gv(self):
         i32 = llpy.core.IntegerType(self.ctx, 32)
         foo = self.mod.AddGlobal(i32, 'foo')
@@ -253,6 +282,62 @@ declare void @foo()
         assert foo is bar.GetPreviousGlobal()
         assert bar.GetNextGlobal() is None
 
+    def test_symbol_index(self):
+        mod = self.mod
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        ft = llpy.core.FunctionType(i32, [])
+        f = mod.AddFunction(ft, 'f')
+        g = mod.AddGlobal(i32, 'g')
+        st = llpy.core.StructType(self.ctx, [i32], 'st')
+        mod.EnableSymbolIndex()
+        assert mod.GetNamedFunction('f') is f
+        assert mod.GetNamedGlobal('g') is g
+        assert mod.GetNamedFunction('g') is None
+        assert mod.GetNamedGlobal('f') is None
+        assert mod.GetTypeByName('st') is st
+        assert mod.GetTypeByName('later') is None
+        later = llpy.core.StructType(self.ctx, [i32], 'later')
+        assert mod.GetTypeByName('later') is later
+
+        h = mod.AddFunction(ft, 'h')
+        assert mod.GetNamedFunction('h') is h
+        # LLVM renames on a clash
+        f2 = mod.AddFunction(ft, 'f')
+        assert f2.GetValueName() != 'f'
+        assert mod.GetNamedFunction('f') is f
+        assert mod.GetNamedFunction(f2.GetValueName()) is f2
+
+        assert mod.GetNamedFunction(b'h') is h
+        assert mod.GetNamedGlobal(b'g') is g
+        h.SetValueName('k')
+        assert mod.GetNamedFunction('h') is None
+        assert mod.GetNamedFunction(b'h') is None
+        assert mod.GetNamedFunction('k') is h
+        g.SetValueName('gg')
+        assert mod.GetNamedGlobal('g') is None
+        assert mod.GetNamedGlobal('gg') is g
+
+        h.DeleteFunction()
+        assert mod.GetNamedFunction('k') is None
+        assert mod.GetNamedFunction(b'k') is None
+        g.DeleteGlobal()
+        assert mod.GetNamedGlobal('gg') is None
+        assert mod.GetNamedGlobal(b'g') is None
+
+        a = mod.AddAlias(f, 'a')
+        assert mod._symbols.aliases == {'a': a}
+        # LLVM renames on a clash with an alias too
+        f3 = mod.AddFunction(ft, 'a')
+        assert f3.GetValueName() != 'a'
+        assert mod.GetNamedFunction(f3.GetValueName()) is f3
+        a.SetValueName('b')
+        assert mod._symbols.aliases == {'b': a}
+
+        mod.RebuildSymbolIndex()
+        assert mod.GetNamedFunction('f') is f
+        mod.DisableSymbolIndex()
+        assert mod.GetNamedFunction('f') is f
+
     def test_alias(self):
         i32 = llpy.core.IntegerType(self.ctx, 32)
         foo = self.mod.AddGlobal(i32, 'foo')
@@ -379,6 +464,28 @@ class TestType(DumpTestCase):
         #assert answer is i32.ConstIntOfString('33', 13)
         assert answer is i32.ConstIntOfString('52', 8)
         assert answer is i32.ConstIntOfString('101010', 2)
+        assert i32.ConstInt(-1) is n1
+        assert i32.ConstInt(2**32 + 42) is answer
+
+    def test_wide_int_values(self):
+        i128 = llpy.core.IntegerType(self.ctx, 128)
+        big = 2**100 + 12345
+        assert i128.ConstInt(big) is i128.ConstIntOfString(str(big), 10)
+        assert i128.ConstInt(-1) is i128.ConstAllOnes()
+        i65 = llpy.core.IntegerType(self.ctx, 65)
+        assert i65.ConstInt(2**64) is i65.ConstIntOfString(str(2**64), 10)
+
+    def test_int_values_bulk(self):
+        i8 = llpy.core.IntegerType(self.ctx, 8)
+        i128 = llpy.core.IntegerType(self.ctx, 128)
+        values = i8.ConstInts(range(-2, 300))
+        assert len(values) == 302
+        assert values[0] is i8.ConstAllOnes().ConstAdd(i8.ConstAllOnes())
+        assert values[2] is i8.ConstNull()
+        assert values[258] is values[2]
+        assert all(type(v) is llpy.core.ConstantInt for v in values)
+        assert i128.ConstInts([2**100, 7]) == [i128.ConstInt(2**100), i128.ConstInt(7)]
+        assert i8.ConstInts([]) == []
 
     if (3, 1) <= _version:
         def test_half(self):
@@ -662,6 +769,34 @@ class TestType(DumpTestCase):
 
         self.assertDump(av, '[2 x i64] [i64 0, i64 -1]\n')
 
+    def test_array_data(self):
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        arr = llpy.core.ArrayType(i32, 3)
+        self.assertDump(arr.ConstData(array.array('i', [1, 2, -3])), '[3 x i32] [i32 1, i32 2, i32 -3]\n')
+        self.assertDump(arr.ConstData([1, 1, 2]), '[3 x i32] [i32 1, i32 1, i32 2]\n')
+        with self.assertRaises(ValueError):
+            arr.ConstData([1, 2])
+
+        i8 = llpy.core.IntegerType(self.ctx, 8)
+        s3 = llpy.core.ArrayType(i8, 3)
+        self.assertDump(s3.ConstData(b'ab\0'), '[3 x i8] c"ab\\00"\n')
+        self.assertDump(s3.ConstData([97, 98, 256]), '[3 x i8] c"ab\\00"\n')
+
+        mod = llpy.core.Module(self.ctx, 'TestType')
+        table = mod.AddGlobal(arr, 'table')
+        table.SetInitializer(arr.ConstData(memoryview(b'\1\0\2\0\3\0').cast('H')))
+        self.assertDump(table, '@table = global [3 x i32] [i32 1, i32 2, i32 3]\n')
+
+    def test_array_data_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        dbl = llpy.core.DoubleType(self.ctx)
+        arr = llpy.core.ArrayType(dbl, 4)
+        data = numpy.arange(4, dtype='>f8').reshape(2, 2)
+        self.assertDump(arr.ConstData(data), '[4 x double] [double 0.000000e+00, double 1.000000e+00, double 2.000000e+00, double 3.000000e+00]\n')
+
     def test_pointer(self):
         i64 = llpy.core.IntegerType(self.ctx, 64)
         pa0 = llpy.core.PointerType(i64)
@@ -700,6 +835,15 @@ class TestType(DumpTestCase):
 
         self.assertDump(v2v, '<2 x i64> <i64 0, i64 -1>\n')
 
+    def test_vector_data(self):
+        dbl = llpy.core.DoubleType(self.ctx)
+        v2t = llpy.core.VectorType(dbl, 2)
+        v2v = v2t.ConstData(array.array('d', [0.5, -2.0]))
+        assert v2v.TypeOf() is v2t
+        self.assertDump(v2v, '<2 x double> <double 5.000000e-01, double -2.000000e+00>\n')
+        with self.assertRaises(TypeError):
+            llpy.core.VectorType(llpy.core.PointerType(dbl), 2).ConstData([0, 0])
+
     def test_void(self):
         void = llpy.core.VoidType(self.ctx)
         assert self.ty_str(void) == 'void'
@@ -756,6 +900,55 @@ class TestType(DumpTestCase):
                     continue
             assert md.GetValueName() == ''
 
+    def test_ctypes_type(self):
+        ctx = self.ctx
+        i1 = llpy.core.IntegerType(ctx, 1)
+        i8 = llpy.core.IntegerType(ctx, 8)
+        i32 = llpy.core.IntegerType(ctx, 32)
+        i64 = llpy.core.IntegerType(ctx, 64)
+        i24 = llpy.core.IntegerType(ctx, 24)
+        f = llpy.core.FloatType(ctx)
+        d = llpy.core.DoubleType(ctx)
+        void = llpy.core.VoidType(ctx)
+        assert i1.ctypes_type() is ctypes.c_bool
+        assert i8.ctypes_type() is ctypes.c_int8
+        assert i32.ctypes_type() is ctypes.c_int32
+        assert i64.ctypes_type() is ctypes.c_int64
+        assert f.ctypes_type() is ctypes.c_float
+        assert d.ctypes_type() is ctypes.c_double
+        assert void.ctypes_type() is None
+        with self.assertRaises(TypeError):
+            i24.ctypes_type()
+
+        arr = llpy.core.ArrayType(d, 4)
+        assert arr.ctypes_type() is ctypes.c_double * 4
+        assert llpy.core.PointerType(i32).ctypes_type() is ctypes.POINTER(ctypes.c_int32)
+        assert llpy.core.PointerType(i24).ctypes_type() is ctypes.c_void_p
+
+        st = llpy.core.StructType(ctx, [i8, d], None)
+        cst = st.ctypes_type()
+        assert issubclass(cst, ctypes.Structure)
+        assert cst.f1.offset == ctypes.alignment(ctypes.c_double)
+        assert st.ctypes_type() is cst
+        pst = llpy.core.StructType(ctx, [i8, d], None, True)
+        assert pst.ctypes_type().f1.offset == 1
+
+        node = llpy.core.StructType(ctx, None, 'node')
+        node.StructSetBody([i32, llpy.core.PointerType(node)])
+        cnode = node.ctypes_type()
+        assert cnode.__name__ == 'node'
+        assert dict(cnode._fields_)['f1'] is ctypes.POINTER(cnode)
+        opaque = llpy.core.StructType(ctx, None, 'opaque')
+        assert llpy.core.PointerType(opaque).ctypes_type() is ctypes.c_void_p
+
+        ft = llpy.core.FunctionType(d, [i32, llpy.core.PointerType(st)])
+        proto = ft.ctypes_type()
+        assert proto._restype_ is ctypes.c_double
+        assert proto._argtypes_ == (ctypes.c_int32, ctypes.POINTER(cst))
+        assert llpy.core.PointerType(ft).ctypes_type() is proto
+        with self.assertRaises(TypeError):
+            llpy.core.FunctionType(void, [], True).ctypes_type()
+
 
 @unittest.skip('NYI')
 class TestIRBuilder(unittest.TestCase):
@@ -190,6 +190,57 @@ class TestBasicBlock(DumpTestCase):
         assert call.GetPreviousInstruction() is None
         assert ret.GetPreviousInstruction() is call
 
+    def test_delete(self):
+        bb0 = self.func.AppendBasicBlock()
+        bb1 = self.func.AppendBasicBlock()
+        builder = llpy.core.IRBuilder(self.ctx)
+        builder.PositionBuilderAtEnd(bb1)
+        call = builder.BuildCall(self.func, [])
+        ret = builder.BuildRetVoid()
+        builder.PositionBuilderAtEnd(bb0)
+        builder.BuildRetVoid()
+
+        call.InstructionEraseFromParent()
+        with self.assertRaises(AttributeError):
+            call.GetInstructionParent()
+        assert bb1.GetFirstInstruction() is ret
+
+        bb1.DeleteBasicBlock()
+        with self.assertRaises(AttributeError):
+            bb1.GetBasicBlockParent()
+        with self.assertRaises(AttributeError):
+            ret.GetInstructionParent()
+        self.check_order([bb0])
+        self.assertDump(self.func,
+'''
+define void @func() {
+  ret void
+}
+
+''')
+
+    def test_delete_function(self):
+        bb = self.func.AppendBasicBlock()
+        builder = llpy.core.IRBuilder(self.ctx)
+        builder.PositionBuilderAtEnd(bb)
+        ret = builder.BuildRetVoid()
+        func = self.func
+        del self.func
+        func.DeleteFunction()
+        for v in [func, bb, ret]:
+            with self.assertRaises(AttributeError):
+                v.TypeOf()
+        assert self.mod.GetFirstFunction() is None
+        assert not any(True for _ in self.ctx.value_cache.values())
+
+    def test_delete_global(self):
+        i32 = llpy.core.IntegerType(self.ctx, 32)
+        gv = self.mod.AddGlobal(i32, 'gv')
+        gv.DeleteGlobal()
+        with self.assertRaises(AttributeError):
+            gv.GetInitializer()
+        assert self.mod.GetNamedGlobal('gv') is None
+
 
 class TestInlineAsm(DumpTestCase):
     __slots__ = ()
@@ -2094,6 +2145,45 @@ class TestUse(DumpTestCase):
     def tearDown(self):
         gc.collect()
 
+    def test_lists(self):
+        ctx = llpy.core.Context()
+        mod = llpy.core.Module(ctx, 'TestUse')
+        i32 = llpy.core.IntegerType(ctx, 32)
+        func_type = llpy.core.FunctionType(i32, [i32, i32])
+        func = mod.AddFunction(func_type, 'func')
+        arg, brg = func.GetParams()
+        entry = func.AppendBasicBlock('entry')
+        exit = func.AppendBasicBlock('exit')
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(entry)
+        a = builder.BuildAdd(arg, arg, 'a')
+        b = builder.BuildMul(a, brg, 'b')
+        br = builder.BuildBr(exit)
+        builder.PositionBuilderAtEnd(exit)
+        r = builder.BuildRet(b)
+
+        for bulk in [False, True]:
+            assert list(func.Params(bulk)) == [arg, brg]
+            assert list(reversed(func.Params(bulk))) == [brg, arg]
+            assert len(func.Params(bulk)) == 2
+            assert list(func.BasicBlocks(bulk)) == [entry, exit]
+            assert list(reversed(func.BasicBlocks(bulk))) == [exit, entry]
+            assert len(func.BasicBlocks(bulk)) == 2
+            assert list(entry.Instructions(bulk)) == [a, b, br]
+            assert list(reversed(entry.Instructions(bulk))) == [br, b, a]
+            assert len(exit.Instructions(bulk)) == 1
+            assert list(arg.Users(bulk)) == [a, a]
+            assert [u.GetUser() for u in arg.Uses(bulk)] == [a, a]
+            assert len(a.Uses(bulk)) == 1
+            assert list(reversed(a.Users(bulk))) == [b]
+            assert brg.Uses(bulk)
+            assert not r.Uses(bulk)
+
+        # erasing the current element is allowed
+        for inst in exit.Instructions():
+            inst.InstructionEraseFromParent()
+        assert len(exit.Instructions()) == 0
+
     def test_use(self):
         ctx = llpy.core.Context()
         mod = llpy.core.Module(ctx, 'TestUse')
@@ -2181,5 +2271,74 @@ define i32 @func(i32 %arg, i32 %brg) {
 
 ''')
 
+class TestFigureOut(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = llpy.core.Context()
+        self.mod = llpy.core.Module(self.ctx, 'TestFigureOut')
+
+    def tearDown(self):
+        del self.mod
+        del self.ctx
+        gc.collect()
+
+    def check(self, v):
+        Value = llpy.core.Value
+        assert Value._figure_out(v._raw) is Value._figure_out_slow(v._raw)
+        assert Value._figure_out(v._raw) is type(v)
+
+    def test_values(self):
+        ctx = self.ctx
+        i1 = llpy.core.IntegerType(ctx, 1)
+        i32 = llpy.core.IntegerType(ctx, 32)
+        i64 = llpy.core.IntegerType(ctx, 64)
+        dbl = llpy.core.DoubleType(ctx)
+        i32p = llpy.core.PointerType(i32)
+        func_type = llpy.core.FunctionType(i32, [i32, dbl, i32p])
+        func = self.mod.AddFunction(func_type, 'func')
+        gv = self.mod.AddGlobal(i32, 'gv')
+        gv.SetInitializer(i32.ConstInt(1))
+        a, d, p = func.GetParams()
+        entry = func.AppendBasicBlock('entry')
+        exit = func.AppendBasicBlock('exit')
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(entry)
+        values = [
+            builder.BuildAdd(a, a),
+            builder.BuildFAdd(d, d),
+            builder.BuildAlloca(i32),
+            builder.BuildLoad(p),
+            builder.BuildStore(a, p),
+            builder.BuildGEP(p, [i64.ConstInt(1)]),
+            builder.BuildZExt(a, i64),
+            builder.BuildSExt(a, i64),
+            builder.BuildTrunc(a, i1),
+            builder.BuildFPToSI(d, i32),
+            builder.BuildSIToFP(a, dbl),
+            builder.BuildPtrToInt(p, i64),
+            builder.BuildBitCast(p, llpy.core.PointerType(dbl)),
+            builder.BuildICmp(llpy.core.IntPredicate.EQ, a, a),
+            builder.BuildFCmp(llpy.core.RealPredicate.OEQ, d, d),
+            builder.BuildCall(func, [a, d, p]),
+            builder.BuildSelect(i1.ConstInt(1), a, a),
+            builder.BuildBr(exit),
+        ]
+        builder.PositionBuilderAtEnd(exit)
+        values += [
+            builder.BuildPhi(i32),
+            builder.BuildRet(a),
+            a, d, p, entry, exit, func, gv,
+            i32.ConstInt(7),
+            dbl.ConstReal(1.5),
+            i32p.ConstNull(),
+            i32.GetUndef(),
+            i32.ConstInt(3).ConstAdd(gv.ConstPtrToInt(i32)),
+            i32.ConstArray([i32.ConstInt(1), i32.ConstInt(2)]),
+            llpy.core.StructType(ctx, [i32, dbl], None).ConstNull(),
+        ]
+        for v in values:
+            self.check(v)
+
+
 if __name__ == '__main__':
     unittest.main()
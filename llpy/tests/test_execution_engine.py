@@ -1,21 +1,55 @@
 #!/usr/bin/env python3
 
+import ctypes
+import gc
 import unittest
 
 import llpy.core
 import llpy.execution_engine
+import llpy.target
 
-@unittest.skip('NYI')
 class TestEE(unittest.TestCase):
 
     def setUp(self):
-        pass
+        llpy.target.InitializeNativeTarget()
+        llpy.execution_engine.LinkInJIT()
+        self.ctx = llpy.core.Context()
+        self.mod = llpy.core.Module(self.ctx, 'TestEE')
+        i32 = self.i32 = llpy.core.IntegerType(self.ctx, 32)
+        self.func = self.mod.AddFunction(llpy.core.FunctionType(i32, [i32, i32]), 'muladd')
+        builder = llpy.core.IRBuilder(self.ctx)
+        builder.PositionBuilderAtEnd(self.func.AppendBasicBlock('entry'))
+        builder.Emit([
+                ('Mul', 0, 0),
+                ('Add', 2, 1),
+                ('Ret', 3),
+        ], [self.func.GetParam(0), self.func.GetParam(1)])
+        self.ee = llpy.execution_engine.ExecutionEngine(self.mod)
 
     def tearDown(self):
+        del self.ee
+        del self.func
+        del self.mod
+        del self.ctx
         gc.collect()
 
-    def test_nyi(self):
-        pass
+    def test_RunFunction(self):
+        args = [llpy.execution_engine.GenericValue(self.i32, v) for v in [6, -1]]
+        assert self.ee.RunFunction(self.func, args).ToInt(True) == 35
+
+    def test_GetCallable(self):
+        fn = self.ee.GetCallable(self.func)
+        assert fn._restype_ is ctypes.c_int32
+        assert fn._argtypes_ == (ctypes.c_int32, ctypes.c_int32)
+        assert fn(6, -1) == 35
+        assert fn(-3, 1) == 10
+        assert fn(1 << 16, 0) == 0
+        ee = self.ee
+        del self.ee
+        del ee
+        gc.collect()
+        # the engine lives as long as the callable
+        assert fn(2, 3) == 7
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,11 +3,15 @@
 from __future__ import unicode_literals
 
 import gc
+import gzip
+import io
+import mmap
 import os
 import tempfile
 import unittest
 
 import llpy.core
+from llpy.c import _c
 from llpy.core import _version
 import llpy.io
 
@@ -50,6 +54,107 @@ class TestIO(DumpTestCase):
         glo2 = mod2.GetNamedGlobal('goo')
         assert glo2.GetInitializer().GetOperand(0) is glo2
 
+    def test_bc_bytes(self):
+        ctx = llpy.core.Context()
+        mod = llpy.core.Module(ctx, 'TestIO')
+        i32 = llpy.core.IntegerType(ctx, 32)
+        mod.AddGlobal(i32, 'goo').SetInitializer(i32.ConstInt(7))
+        with TemporaryDirectory() as tdn:
+            path_file = os.path.join(tdn, 'file')
+            llpy.io.WriteBitcodeToFile(mod, path_file)
+            expected = slurp(path_file)
+        assert llpy.io.WriteBitcodeToBytes(mod) == expected
+        assert llpy.io._bitcode_pipe(mod) == expected
+
+        fdopen = os.fdopen
+        def broken_fdopen(fd, mode):
+            with fdopen(fd, mode) as f:
+                f.read()
+            raise IOError('drain failed')
+        os.fdopen = broken_fdopen
+        try:
+            with self.assertRaises(IOError):
+                llpy.io._bitcode_pipe(mod)
+        finally:
+            os.fdopen = fdopen
+
+        mb = llpy.io.WriteBitcodeToMemoryBuffer(mod)
+        if (3, 3) <= _version:
+            assert mb.Get() == expected
+        mod2 = llpy.io.ParseBitcode(ctx, mb)
+        assert mod2.GetNamedGlobal('goo').GetInitializer() is i32.ConstInt(7)
+
+    def test_lazy(self):
+        ctx = llpy.core.Context()
+        mod = llpy.core.Module(ctx, 'TestIO')
+        i32 = llpy.core.IntegerType(ctx, 32)
+        func_type = llpy.core.FunctionType(i32, [])
+        builder = llpy.core.IRBuilder(ctx)
+        for name in ['f', 'g']:
+            func = mod.AddFunction(func_type, name)
+            builder.PositionBuilderAtEnd(func.AppendBasicBlock())
+            builder.BuildRet(i32.ConstInt(7))
+        mod.AddFunction(func_type, 'decl')
+        mb = llpy.io.WriteBitcodeToMemoryBuffer(mod)
+        del mod
+
+        lazy = llpy.io.GetBitcodeModule(ctx, mb)
+        del mb
+        gc.collect()
+        f = lazy.GetNamedFunction('f')
+        g = lazy.GetNamedFunction('g')
+        decl = lazy.GetNamedFunction('decl')
+        assert f.IsDeclaration()
+        assert g.IsDeclaration()
+        assert f.CountBasicBlocks() == 1
+        assert not f.IsDeclaration()
+        assert g.IsDeclaration()
+        lazy.MaterializeAll()
+        assert not g.IsDeclaration()
+        assert decl.IsDeclaration()
+        assert g.GetEntryBasicBlock().GetFirstInstruction().GetOperand(0) is i32.ConstInt(7)
+
+    if (3, 3) <= _version:
+        def test_lazy_error(self):
+            ctx = llpy.core.Context()
+            mb = llpy.io.MemoryBuffer('junk', b'not bitcode')
+            with self.assertRaises(OSError):
+                llpy.io.GetBitcodeModule(ctx, mb)
+            assert mb.Get() == b'not bitcode'
+
+    if (3, 2) <= _version:
+        def test_print_stream(self):
+            ctx = llpy.core.Context()
+            mod = llpy.core.Module(ctx, 'TestIO')
+            i32 = llpy.core.IntegerType(ctx, 32)
+            for i in range(100):
+                mod.AddGlobal(i32, 'g%d' % i).SetInitializer(i32.ConstInt(i))
+            with TemporaryDirectory() as tdn:
+                path_file = os.path.join(tdn, 'file')
+                llpy.io.PrintModuleToFile(mod, path_file)
+                txt = slurp(path_file)
+
+            class Broken(object):
+                def write(self, b):
+                    raise IOError('broken')
+                def flush(self):
+                    pass
+
+            dev_fd = llpy.io._dev_fd
+            try:
+                for llpy.io._dev_fd in sorted({dev_fd, False}):
+                    for compress, decompress in [
+                            (None, lambda b: b),
+                            ('gzip', lambda b: gzip.GzipFile(fileobj=io.BytesIO(b)).read()),
+                    ]:
+                        out = io.BytesIO()
+                        llpy.io.PrintModuleToStream(mod, out, compress, chunk_size=7)
+                        assert decompress(out.getvalue()) == txt
+                        with self.assertRaises(IOError):
+                            llpy.io.PrintModuleToStream(mod, Broken(), compress, chunk_size=7)
+            finally:
+                llpy.io._dev_fd = dev_fd
+
     if (3, 2) <= _version:
         @unittest.skip('NYI')
         def test_ir(self):
@@ -83,6 +188,38 @@ class TestIO(DumpTestCase):
             buf = llpy.io.MemoryBuffer('name', stuff)
             assert buf.Get() == stuff
 
+        @unittest.skipUnless(_c.buffer_pinning() and hasattr(memoryview, 'toreadonly'), 'needs CPython 3.8+')
+        def test_mbuf_nocopy(self):
+            stuff = bytearray(b'abc')
+            buf = llpy.io.MemoryBuffer('name', stuff, copy=False)
+            view = buf.Get(view=True)
+            assert view.readonly
+            assert view == b'abc'
+            stuff[0:1] = b'x'
+            assert buf.Get() == b'xbc'
+            assert view == b'xbc'
+            with self.assertRaises(BufferError):
+                stuff.append(0)
+            del buf
+            gc.collect()
+            assert view == b'xbc'
+            del view
+            gc.collect()
+            stuff.append(0)
+
+        def test_mbuf_mmap(self):
+            with tempfile.TemporaryFile() as f:
+                f.write(b'BC\xc0\xde\0')
+                f.flush()
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                buf = llpy.io.MemoryBuffer('name', m, copy=False, null_terminated=True)
+                assert buf.Get() == b'BC\xc0\xde'
+                with self.assertRaises(BufferError):
+                    m.close()
+                del buf
+                gc.collect()
+                m.close()
+
     @unittest.skip('NYI')
     def test_stdin(self):
         with ReplaceInFD(0) as f:
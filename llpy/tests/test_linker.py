@@ -1,4 +1,47 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import gc
+import unittest
+
+import llpy.core
+from llpy.core import _version
 from llpy import linker
 
+
+class TestLinker(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx = llpy.core.Context()
+
+    def tearDown(self):
+        del self.ctx
+        gc.collect()
+
+    if (3, 2) <= _version:
+        def module(self, name, define):
+            mod = llpy.core.Module(self.ctx, name)
+            void = llpy.core.VoidType(self.ctx)
+            func = mod.AddFunction(llpy.core.FunctionType(void, []), 'func')
+            if define:
+                builder = llpy.core.IRBuilder(self.ctx)
+                builder.PositionBuilderAtEnd(func.AppendBasicBlock('entry'))
+                builder.BuildRetVoid()
+            return mod
+
+        def test_LinkModules(self):
+            dest = self.module('dest', False)
+            src = self.module('src', True)
+            assert dest.GetNamedFunction('func').IsDeclaration()
+            linker.LinkModules(dest, src, preserve_source=True)
+            assert not dest.GetNamedFunction('func').IsDeclaration()
+            assert not src.GetNamedFunction('func').IsDeclaration()
+
+        def test_error(self):
+            dest = self.module('dest', True)
+            src = self.module('src', True)
+            with self.assertRaises(OSError):
+                linker.LinkModules(dest, src)
+
 if __name__ == '__main__':
     unittest.main()
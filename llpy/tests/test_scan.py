@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import gc
+import os
+import pickle
+import unittest
+
+import llpy.core
+import llpy.io
+from llpy import scan
+
+from llpy.compat import TemporaryDirectory
+
+
+class TestScan(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.tdn = self.dir.__enter__()
+        ctx = llpy.core.Context()
+        mod = llpy.core.Module(ctx, 'TestScan')
+        mod.SetTarget('x86_64-unknown-linux-gnu')
+        i32 = llpy.core.IntegerType(ctx, 32)
+        func_type = llpy.core.FunctionType(i32, [])
+        func = mod.AddFunction(func_type, 'func')
+        builder = llpy.core.IRBuilder(ctx)
+        builder.PositionBuilderAtEnd(func.AppendBasicBlock())
+        builder.BuildRet(builder.BuildCall(mod.AddFunction(func_type, 'ext'), []))
+        glo = mod.AddGlobal(i32, 'glo')
+        glo.SetInitializer(i32.ConstInt(1))
+        glo.SetLinkage(llpy.core.Linkage.Internal)
+        self.good = os.path.join(self.tdn, 'good.bc')
+        self.bad = os.path.join(self.tdn, 'sub', 'bad.bc')
+        llpy.io.WriteBitcodeToFile(mod, self.good)
+        os.mkdir(os.path.dirname(self.bad))
+        with open(self.bad, 'wb') as f:
+            f.write(b'junk')
+        with open(os.path.join(self.tdn, 'ignored.txt'), 'wb') as f:
+            f.write(b'junk')
+
+    def tearDown(self):
+        self.dir.__exit__(None, None, None)
+        gc.collect()
+
+    def check(self, summaries):
+        good, bad = summaries
+        assert good.path == self.good
+        assert good.error is None
+        assert good.triple == 'x86_64-unknown-linux-gnu'
+        assert good.symbols == (
+                scan.Symbol('func', 'function', 'External', True, 2),
+                scan.Symbol('ext', 'function', 'External', False, 0),
+                scan.Symbol('glo', 'global', 'Internal', True, 4),
+        )
+        assert [s.name for s in good.defined()] == ['func', 'glo']
+        assert [s.name for s in good.declared()] == ['ext']
+        assert bad.path == self.bad
+        assert bad.error
+        assert bad.symbols == ()
+        assert pickle.loads(pickle.dumps(good)) == good
+
+    def test_find(self):
+        assert list(scan.find([self.tdn])) == [self.good, self.bad]
+        assert list(scan.find([self.bad])) == [self.bad]
+
+    def test_serial(self):
+        self.check(list(scan.scan([self.good, self.bad], jobs=1)))
+
+    def test_pool(self):
+        self.check(list(scan.scan([self.good, self.bad], jobs=2, chunksize=1)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from __future__ import unicode_literals
 
+import ctypes
 import gc
 import unittest
 
@@ -100,6 +101,20 @@ class TestTargetData(unittest.TestCase):
         assert self.td.OffsetOfElement(st, 1) == 4
         assert self.td.ElementAtOffset(st, 4) == 1
 
+    def test_ctypes_type(self):
+        ctx = llpy.core.Context()
+        i8 = llpy.core.IntegerType(ctx, 8)
+        i64 = llpy.core.IntegerType(ctx, 64)
+        st = llpy.core.StructType(ctx, [i8, i64], None)
+        cst = st.ctypes_type(self.td)
+        assert ctypes.sizeof(cst) == 12
+        assert cst.f0.offset == 0
+        assert cst.f1.offset == 4
+        assert cst.f1.size == 8
+        assert st.ctypes_type(self.td) is cst
+        arr = llpy.core.ArrayType(st, 3)
+        assert ctypes.sizeof(arr.ctypes_type(self.td)) == 36
+
 @unittest.skip('NYI')
 class TestTargetInit(unittest.TestCase):
 
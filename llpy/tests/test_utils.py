@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+from __future__ import unicode_literals
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+
+from llpy import utils
+
+
+SOURCE = '''
+import functools
+
+def decorate(f):
+    @functools.wraps(f)
+    def inner(*args):
+        return f(*args)
+    return inner
+
+def check(x):
+    assert x
+    return 'checked'
+
+class Thing(object):
+    def method(self, x):
+        assert x
+        return 'method'
+
+    @staticmethod
+    def static(x):
+        assert x
+        return 'static'
+
+    @property
+    def prop(self):
+        assert False
+        return 'prop'
+
+    @decorate
+    def wrapped(self, x):
+        assert x
+        return 'wrapped'
+
+    class Inner(object):
+        def method(self, x):
+            assert x
+            return 'inner'
+'''
+
+
+class TestStripAsserts(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with open(os.path.join(self.dir, 'llpy_strip_sample.py'), 'w') as f:
+            f.write(SOURCE)
+        sys.path.insert(0, self.dir)
+        self.mod = importlib.import_module('llpy_strip_sample')
+
+    def tearDown(self):
+        sys.path.remove(self.dir)
+        del sys.modules['llpy_strip_sample']
+        shutil.rmtree(self.dir)
+
+    def test_strip(self):
+        mod = self.mod
+        thing = mod.Thing()
+        if __debug__:
+            with self.assertRaises(AssertionError):
+                mod.check(False)
+            with self.assertRaises(AssertionError):
+                thing.method(False)
+        utils.strip_asserts(mod)
+        assert mod.check(False) == 'checked'
+        assert thing.method(False) == 'method'
+        assert mod.Thing.static(False) == 'static'
+        assert thing.prop == 'prop'
+        assert thing.wrapped(False) == 'wrapped'
+        assert mod.Thing.Inner().method(False) == 'inner'
+
+    def test_no_source(self):
+        # as if only the .pyc files were installed
+        import py_compile
+        path = os.path.join(self.dir, 'llpy_strip_sample.py')
+        del sys.modules['llpy_strip_sample']
+        py_compile.compile(path, path + 'c')
+        os.remove(path)
+        if hasattr(importlib, 'invalidate_caches'):
+            importlib.invalidate_caches()
+        mod = importlib.import_module('llpy_strip_sample')
+        assert mod.__file__.endswith('.pyc')
+        check = mod.check.__code__
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            assert not utils.strip_asserts(mod)
+        assert len(w) == 1 and issubclass(w[0].category, RuntimeWarning)
+        assert mod.check.__code__ is check
+
+    def test_stale_source(self):
+        mod = self.mod
+        with open(os.path.join(self.dir, 'llpy_strip_sample.py'), 'w') as f:
+            f.write(SOURCE.replace("return 'checked'", "return 'edited'"))
+        assert utils.strip_asserts(mod)
+        # check() no longer matches its source, so is left alone
+        assert mod.check(True) == 'checked'
+        if __debug__:
+            with self.assertRaises(AssertionError):
+                mod.check(False)
+        assert mod.Thing().method(False) == 'method'
+
+
+class TestName2b(unittest.TestCase):
+
+    def test_name2b(self):
+        assert utils.name2b('') == b''
+        assert utils.name2b('tmp') == b'tmp'
+        assert utils.name2b('tmp') is utils.name2b('tmp')
+        assert utils.name2b('\xe9\udcff') == b'\xc3\xa9\xff'
+        b = b'addr'
+        assert utils.name2b(b) is b
+
+
+if __name__ == '__main__':
+    unittest.main()
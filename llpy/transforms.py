@@ -24,11 +24,15 @@
 import functools
 
 import llpy
+from llpy.compat import is_int
 from llpy.utils import u2b, b2u, deprecated, untested, dangerous
 from llpy.core import (
+        Function,
+        Module,
         _version,
 )
 from llpy.c import (
+        _c,
         core as _core,
 )
 from llpy.c.transforms import (
@@ -44,7 +48,7 @@ class PassRegistry(object):
 
     @untested
     def __init__(self, raw):
-        assert isinstance(raw, _core.PassRegistry)
+        assert _c.is_handle(raw, _core.PassRegistry)
         self._raw = raw
 
     @staticmethod
@@ -109,23 +113,36 @@ class PassRegistry(object):
 
 def py_fun(c_fun):
     @functools.wraps(c_fun)
-    def inner(self):
-        c_fun(self._raw)
+    def inner(self, *args):
+        c_fun(self._raw, *args)
+        self._record(name, *args)
     assert inner.__name__.startswith('LLVM')
-    inner.__name__ = inner.__name__[4:]
+    inner.__name__ = name = inner.__name__[4:]
     inner.__qualname__ = 'PassManagerBase.%s' % inner.__name__
     inner.__module__ = __name__
     return inner
 
 class PassManagerBase(object):
-    __slots__ = ('_raw',)
+    __slots__ = ('_raw', '_pipeline')
 
-    @untested
     def __init__(self, raw):
-        assert isinstance(raw, _core.PassManager)
+        assert _c.is_handle(raw, _core.PassManager)
         self._raw = raw
+        self._pipeline = []
+
+    def Fingerprint(self):
+        ''' Describe the passes added so far, for use in cache keys.
+        '''
+        return repr(self._pipeline)
+
+    def _record(self, name, *args):
+        ''' Note a pass (and its parameters) for Fingerprint.
+
+            Everything that adds a pass must call this, or the cache
+            could mistake two different pipelines for the same one.
+        '''
+        self._pipeline.append((name,) + args if args else name)
 
-    @untested
     def __del__(self):
         ''' Frees the memory of a pass pipeline. For function pipelines,
             does not free the module.
@@ -203,14 +220,12 @@ class PassManagerBase(object):
             c_fun = getattr(mod, pass_, None)
             if c_fun is None:
                 continue
-            # TODO remove this untested, and just rely on the C untested
-            locals()[pass_] = untested(py_fun(c_fun))
+            locals()[pass_] = py_fun(c_fun)
     del mod, lst, pass_, c_fun
 
 class ModulePassManager(PassManagerBase):
     __slots__ = ()
 
-    @untested
     def __init__(self, builder=None):
         ''' Constructs a new whole-module pass pipeline.
 
@@ -222,8 +237,8 @@ class ModulePassManager(PassManagerBase):
         if builder is not None:
             assert isinstance(builder, PassManagerBuilder)
             _pmb.PassManagerBuilderPopulateModulePassManager(builder._raw, self._raw)
+            self._record('PassManagerBuilder', builder.Settings())
 
-    @untested
     def run(self, mod):
         ''' Initializes, executes on the provided module, and finalizes all
             of the passes scheduled in the pass manager.
@@ -231,7 +246,12 @@ class ModulePassManager(PassManagerBase):
             Returns 1 if any of the passes modified the module, 0 otherwise.
         '''
         assert isinstance(mod, Module)
-        return bool(_core.RunPassManager(self._raw, mod._raw))
+        mod._context.cfg_cache.clear()
+        rv = bool(_core.RunPassManager(self._raw, mod._raw))
+        if mod._symbols is not None:
+            # passes may delete or rename globals
+            mod.RebuildSymbolIndex()
+        return rv
 
 class FunctionPassManager(PassManagerBase):
     __slots__ = ()
@@ -250,6 +270,7 @@ class FunctionPassManager(PassManagerBase):
         if builder is not None:
             assert isinstance(builder, PassManagerBuilder)
             _pmb.PassManagerBuilderPopulateFunctionPassManager(builder._raw, self._raw)
+            self._record('PassManagerBuilder', builder.Settings())
 
     @untested
     def initialize(self):
@@ -269,6 +290,7 @@ class FunctionPassManager(PassManagerBase):
             false otherwise.
         '''
         assert isinstance(func, Function)
+        func._context.cfg_cache.clear()
         return bool(_core.RunFunctionPassManager(self._raw, func._raw))
 
     @untested
@@ -281,11 +303,18 @@ class FunctionPassManager(PassManagerBase):
         return bool(_core.FinalizeFunctionPassManager(self._raw))
 
 class PassManagerBuilder:
-    __slots__ = ('_raw',)
+    __slots__ = ('_raw', '_settings')
 
     @untested
     def __init__(self):
         self._raw = _pmb.PassManagerBuilderCreate()
+        # the C API can only set these, so remember them here
+        self._settings = {}
+
+    def Settings(self):
+        ''' Return the settings changed so far, as sorted (name, value) pairs.
+        '''
+        return tuple(sorted(self._settings.items()))
 
     @untested
     def __del__(self):
@@ -295,28 +324,34 @@ class PassManagerBuilder:
     def SetOptLevel(self, level):
         assert is_int(level)
         _pmb.PassManagerBuilderSetOptLevel(self._raw, level)
+        self._settings['OptLevel'] = level
 
     @untested
     def SetSizeLevel(self, level):
         assert is_int(level)
         _pmb.PassManagerBuilderSetSizeLevel(self._raw, level)
+        self._settings['SizeLevel'] = level
 
     @untested
     def SetDisableUnitAtATime(self, boo):
         assert isinstance(boo, bool)
         _pmb.PassManagerBuilderSetDisableUnitAtATime(self._raw, boo)
+        self._settings['DisableUnitAtATime'] = boo
 
     @untested
     def SetDisableUnrollLoops(self, boo):
         assert isinstance(boo, bool)
         _pmb.PassManagerBuilderSetDisableUnrollLoops(self._raw, boo)
+        self._settings['DisableUnrollLoops'] = boo
 
     @untested
     def SetDisableSimplifyLibCalls(self, boo):
         assert isinstance(boo, bool)
         _pmb.PassManagerBuilderSetDisableSimplifyLibCalls(self._raw, boo)
+        self._settings['DisableSimplifyLibCalls'] = boo
 
     @untested
     def UseInlinerWithThreshold(self, level):
         assert is_int(level)
         _pmb.PassManagerBuilderUseInlinerWithThreshold(self._raw, level)
+        self._settings['UseInlinerWithThreshold'] = level
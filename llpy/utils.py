@@ -19,7 +19,10 @@
 ''' General utility methods used by this LLVM wrapper.
 '''
 
+import ast
 import functools
+import inspect
+import types
 import warnings
 
 import llpy
@@ -32,6 +35,28 @@ def u2b(u):
     assert isinstance(u, unicode)
     return u.encode('utf-8', 'surrogateescape')
 
+_names = {'': b''}
+_names_limit = 4096
+
+def name2b(name):
+    ''' Convert the name of a value, type, or block to bytes.
+
+        Like u2b, but bytes are passed through unchanged, and results
+        are interned, since generated code reuses a handful of names.
+    '''
+    try:
+        return _names[name]
+    except KeyError:
+        pass
+    if isinstance(name, bytes):
+        return name
+    rv = u2b(name)
+    if len(_names) >= _names_limit:
+        _names.clear()
+        _names[''] = b''
+    _names[name] = rv
+    return rv
+
 def b2u(b):
     ''' Convert a byte string to unicode, without exception.
     '''
@@ -94,6 +119,95 @@ def dangerous(f):
         return f(*args, **kwargs) # unreachable
     return inner
 
+def strip_asserts(module):
+    ''' Replace the code of every function and method defined in module
+        with a copy compiled without assert statements.
+
+        The source is compiled twice, with and without asserts, and a
+        function is only replaced if its current code is identical to the
+        code compiled with asserts; functions whose source has changed
+        since the module was loaded are left alone.
+
+        If the source can't be found (e.g. only .pyc files are installed),
+        this warns and does nothing. Returns whether the source was used.
+    '''
+    if not __debug__:
+        return True
+    try:
+        filename = inspect.getsourcefile(module)
+        if filename is None:
+            raise IOError('no source file')
+        with open(filename, 'rb') as f:
+            source = f.read()
+    except (TypeError, IOError, OSError) as e:
+        warnings.warn('Not stripping asserts from %s: %s' % (module.__name__, e), RuntimeWarning)
+        return False
+    # compile(optimize=1) would do, but is not available in Python 2
+    checked = _code_table(compile(source, filename, 'exec', dont_inherit=True))
+    tree = _StripAsserts().visit(ast.parse(source, filename))
+    table = _code_table(compile(tree, filename, 'exec', dont_inherit=True))
+
+    def fix_function(fn):
+        while True:
+            old = fn.__code__
+            key = (old.co_name, old.co_firstlineno)
+            if key in table and checked.get(key) == old:
+                fn.__code__ = table[key]
+            # look through decorators like untested()
+            fn = _wrapped(fn)
+            if fn is None:
+                return
+
+    def fix(obj, seen):
+        if isinstance(obj, (staticmethod, classmethod)):
+            obj = obj.__func__
+        if isinstance(obj, types.FunctionType):
+            fix_function(obj)
+        elif isinstance(obj, property):
+            for fn in (obj.fget, obj.fset, obj.fdel):
+                if fn is not None:
+                    fix(fn, seen)
+        elif isinstance(obj, type) and obj.__module__ == module.__name__:
+            if obj in seen:
+                return
+            seen.add(obj)
+            for v in list(vars(obj).values()):
+                fix(v, seen)
+
+    seen = set()
+    for v in list(vars(module).values()):
+        fix(v, seen)
+    return True
+
+def _code_table(code):
+    ''' Map (name, first line) to every code object nested inside code.
+    '''
+    table = {}
+    todo = [code]
+    while todo:
+        code = todo.pop()
+        for c in code.co_consts:
+            if isinstance(c, types.CodeType):
+                table[(c.co_name, c.co_firstlineno)] = c
+                todo.append(c)
+    return table
+
+class _StripAsserts(ast.NodeTransformer):
+    def visit_Assert(self, node):
+        # not removed outright, in case it is the whole body
+        return ast.copy_location(ast.Pass(), node)
+
+def _wrapped(fn):
+    ''' The function a decorator wrapped, or None.
+    '''
+    rv = getattr(fn, '__wrapped__', None)
+    if rv is None and fn.__closure__:
+        # Python 2's functools.wraps does not set __wrapped__
+        for cell in fn.__closure__:
+            if isinstance(cell.cell_contents, types.FunctionType):
+                return cell.cell_contents
+    return rv
+
 del llpy.check_deprecation
 del llpy.allow_untested
 del llpy.ignore_danger